@@ -0,0 +1,38 @@
+"""Add auth_sessions table for the database session backend
+
+Revision ID: b7c1d9e2f3a4
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d9e2f3a4'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'auth_sessions',
+        sa.Column('token_hash', sa.String(64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('user_type', sa.String(20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_activity', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('data', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('token_hash'),
+    )
+    op.create_index('ix_auth_sessions_expires_at', 'auth_sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auth_sessions_expires_at', table_name='auth_sessions')
+    op.drop_table('auth_sessions')
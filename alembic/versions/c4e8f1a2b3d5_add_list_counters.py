@@ -0,0 +1,44 @@
+"""Add adjective counters and content version to lists
+
+Revision ID: c4e8f1a2b3d5
+Revises: b7c1d9e2f3a4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f1a2b3d5'
+down_revision: Union[str, None] = 'b7c1d9e2f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('lists', sa.Column('adjective_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('lists', sa.Column('active_adjective_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('lists', sa.Column('content_version', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the adjectives table; afterwards the API keeps them in sync
+    op.execute(
+        """
+        UPDATE lists SET
+            adjective_count = (
+                SELECT COUNT(*) FROM adjectives WHERE adjectives.list_id = lists.id
+            ),
+            active_adjective_count = (
+                SELECT COUNT(*) FROM adjectives WHERE adjectives.list_id = lists.id AND adjectives.active = true
+            ),
+            content_version = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('lists', 'content_version')
+    op.drop_column('lists', 'active_adjective_count')
+    op.drop_column('lists', 'adjective_count')
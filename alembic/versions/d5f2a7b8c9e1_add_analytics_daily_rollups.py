@@ -0,0 +1,81 @@
+"""Add daily analytics rollup tables
+
+Revision ID: d5f2a7b8c9e1
+Revises: c4e8f1a2b3d5
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f2a7b8c9e1'
+down_revision: Union[str, None] = 'c4e8f1a2b3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_daily_list_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('list_id', sa.Integer(), nullable=False),
+        sa.Column('theme_id', sa.Integer(), nullable=False),
+        sa.Column('sessions_started', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sessions_finished', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pdf_exports', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_seconds_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'list_id', 'theme_id'),
+    )
+    op.create_table(
+        'analytics_daily_adjective_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('adjective_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.String(20), nullable=False),
+        sa.Column('assignments', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'adjective_id', 'bucket'),
+    )
+    op.create_index(
+        'ix_analytics_daily_adjective_stats_adjective_id', 'analytics_daily_adjective_stats', ['adjective_id']
+    )
+
+    # Backfill from the raw tables (SQLite date functions); afterwards the
+    # analytics writers keep them in sync. On other databases run
+    # ``python -m app.services.analytics_rollup`` instead.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        """
+        INSERT INTO analytics_daily_list_stats (
+            day, list_id, theme_id, sessions_started, sessions_finished, pdf_exports, duration_seconds_sum
+        )
+        SELECT
+            date(started_at),
+            COALESCE(list_id, 0),
+            COALESCE(theme_id, 0),
+            COUNT(*),
+            COUNT(finished_at),
+            COUNT(pdf_exported_at),
+            COALESCE(SUM(ROUND((julianday(finished_at) - julianday(started_at)) * 86400.0, 3)), 0)
+        FROM analytics_sessions
+        GROUP BY date(started_at), COALESCE(list_id, 0), COALESCE(theme_id, 0)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO analytics_daily_adjective_stats (day, adjective_id, bucket, assignments)
+        SELECT date(s.started_at), a.adjective_id, a.bucket, COUNT(*)
+        FROM analytics_assignments a
+        JOIN analytics_sessions s ON s.id = a.session_id
+        GROUP BY date(s.started_at), a.adjective_id, a.bucket
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analytics_daily_adjective_stats_adjective_id', table_name='analytics_daily_adjective_stats')
+    op.drop_table('analytics_daily_adjective_stats')
+    op.drop_table('analytics_daily_list_stats')
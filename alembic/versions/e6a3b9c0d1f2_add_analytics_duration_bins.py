@@ -0,0 +1,62 @@
+"""Add daily session duration histogram
+
+Revision ID: e6a3b9c0d1f2
+Revises: d5f2a7b8c9e1
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a3b9c0d1f2'
+down_revision: Union[str, None] = 'd5f2a7b8c9e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.services.analytics_rollup.DURATION_BIN_EDGES at the time of this migration
+BIN_EDGES = (
+    0, 10, 20, 30, 45, 60, 90, 120, 150, 180, 240, 300, 360, 420, 480, 600, 720, 900,
+    1200, 1500, 1800, 2400, 3600, 5400, 7200, 10800, 21600,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_daily_duration_bins',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('bin', sa.Integer(), nullable=False),
+        sa.Column('sessions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_seconds_min', sa.Float(), nullable=False),
+        sa.Column('duration_seconds_max', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'bin'),
+    )
+
+    # Backfill from the raw sessions (SQLite date functions); on other
+    # databases run ``python -m app.services.analytics_rollup`` instead.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    bin_case = " ".join(
+        f"WHEN duration < {edge} THEN {index}" for index, edge in enumerate(BIN_EDGES[1:])
+    )
+    op.execute(
+        f"""
+        INSERT INTO analytics_daily_duration_bins (day, bin, sessions, duration_seconds_min, duration_seconds_max)
+        SELECT day, CASE {bin_case} ELSE {len(BIN_EDGES) - 1} END AS bin, COUNT(*), MIN(duration), MAX(duration)
+        FROM (
+            SELECT
+                date(started_at) AS day,
+                ROUND((julianday(finished_at) - julianday(started_at)) * 86400.0, 3) AS duration
+            FROM analytics_sessions
+            WHERE finished_at IS NOT NULL
+        )
+        GROUP BY day, bin
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_daily_duration_bins')
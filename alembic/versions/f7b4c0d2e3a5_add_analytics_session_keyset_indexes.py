@@ -0,0 +1,29 @@
+"""Add composite indexes for keyset pagination of analytics sessions
+
+Revision ID: f7b4c0d2e3a5
+Revises: e6a3b9c0d1f2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b4c0d2e3a5'
+down_revision: Union[str, None] = 'e6a3b9c0d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_analytics_sessions_started_at_id', 'analytics_sessions', ['started_at', 'id'])
+    op.create_index(
+        'ix_analytics_sessions_list_id_started_at_id', 'analytics_sessions', ['list_id', 'started_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_analytics_sessions_list_id_started_at_id', table_name='analytics_sessions')
+    op.drop_index('ix_analytics_sessions_started_at_id', table_name='analytics_sessions')
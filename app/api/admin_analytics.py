@@ -1,28 +1,46 @@
 """Admin analytics dashboard and aggregations."""
-from datetime import datetime
-from typing import Dict, List
-from statistics import mean, StatisticsError
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import case, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.models.admin import Admin
-from app.models.analytics import AnalyticsSession, AnalyticsAssignment
+from app.models.analytics import (
+    AnalyticsAssignment,
+    AnalyticsDailyAdjectiveStats,
+    AnalyticsDailyDurationBin,
+    AnalyticsDailyListStats,
+    AnalyticsSession,
+)
 from app.models.adjective import Adjective
 from app.api.deps import require_admin
+from app.services.analytics_export import EXPORT_MEDIA_TYPES, stream_csv, stream_ndjson
+from app.services.analytics_rollup import DURATION_BIN_EDGES, DurationBin, duration_bin_bounds, duration_quantile
 
 
 router = APIRouter(prefix="/admin/analytics", tags=["admin-analytics"])
 
 
+class BucketCounts(BaseModel):
+    selten: int = 0
+    manchmal: int = 0
+    oft: int = 0
+
+
 class AdjectiveStats(BaseModel):
     adjective_id: int
     word: str
     count: int
     percentage: float
+    buckets: BucketCounts
 
 
 class ThemeStats(BaseModel):
@@ -52,85 +70,68 @@ async def get_analytics_summary(
     """
     Get comprehensive analytics summary for admin dashboard.
     
-    Aggregates session data, adjective assignments, and PDF exports.
+    Aggregates session data, adjective assignments, and PDF exports from the
+    daily rollup tables, so the cost does not grow with the raw history.
+
+    The rollups are append-only history: deleting a list, adjective or
+    session does not decrement them. Assignment figures only cover
+    adjectives that still exist, so ``total_assignments`` matches the top
+    adjectives; session figures keep counting sessions of deleted lists.
     """
-    # Count total sessions
-    sessions_result = await db.execute(
-        select(func.count(AnalyticsSession.id))
-    )
-    total_sessions = sessions_result.scalar() or 0
-    
-    # Count completed sessions (with finished_at)
-    completed_result = await db.execute(
-        select(func.count(AnalyticsSession.id))
-        .where(AnalyticsSession.finished_at != None)
-    )
-    completed_sessions = completed_result.scalar() or 0
-    
-    # Calculate average duration
-    durations = []
-    duration_result = await db.execute(
-        select(AnalyticsSession.started_at, AnalyticsSession.finished_at)
-        .where(AnalyticsSession.finished_at != None)
-    )
-    
-    for started, finished in duration_result.all():
-        if started and finished:
-            duration = (finished - started).total_seconds()
-            durations.append(duration)
-    
-    avg_duration_seconds = 0.0
-    if durations:
-        try:
-            avg_duration_seconds = mean(durations)
-        except StatisticsError:
-            avg_duration_seconds = 0.0
-    
-    # Count PDF exports
-    pdf_result = await db.execute(
-        select(func.count(AnalyticsSession.id))
-        .where(AnalyticsSession.pdf_exported_at != None)
+    totals_result = await db.execute(
+        select(
+            func.coalesce(func.sum(AnalyticsDailyListStats.sessions_started), 0),
+            func.coalesce(func.sum(AnalyticsDailyListStats.sessions_finished), 0),
+            func.coalesce(func.sum(AnalyticsDailyListStats.pdf_exports), 0),
+            func.coalesce(func.sum(AnalyticsDailyListStats.duration_seconds_sum), 0.0),
+        )
     )
-    total_pdf_exports = pdf_result.scalar() or 0
+    total_sessions, completed_sessions, total_pdf_exports, duration_sum = totals_result.one()
+
+    avg_duration_seconds = duration_sum / completed_sessions if completed_sessions else 0.0
     
-    # Get top adjectives in assignments
+    # Get top adjectives in assignments, with how often each landed in every bucket
+    adjective_count = func.sum(AnalyticsDailyAdjectiveStats.assignments)
+    bucket_counts = [
+        func.sum(
+            case((AnalyticsDailyAdjectiveStats.bucket == bucket, AnalyticsDailyAdjectiveStats.assignments), else_=0)
+        ).label(bucket)
+        for bucket in BucketCounts.model_fields
+    ]
     top_adj_result = await db.execute(
         select(
-            AnalyticsAssignment.adjective_id,
-            func.count(AnalyticsAssignment.id).label('count')
+            AnalyticsDailyAdjectiveStats.adjective_id,
+            Adjective.word,
+            adjective_count.label('count'),
+            *bucket_counts,
         )
-        .group_by(AnalyticsAssignment.adjective_id)
-        .order_by(func.count(AnalyticsAssignment.id).desc())
+        .join(Adjective, Adjective.id == AnalyticsDailyAdjectiveStats.adjective_id)
+        .group_by(AnalyticsDailyAdjectiveStats.adjective_id, Adjective.word)
+        .having(adjective_count > 0)
+        .order_by(adjective_count.desc())
         .limit(10)
     )
     
     top_adjectives = []
-    for adjective_id, count in top_adj_result.all():
-        # Get adjective word
-        adj_result = await db.execute(
-            select(Adjective).where(Adjective.id == adjective_id)
-        )
-        adj = adj_result.scalar_one_or_none()
-        
-        if adj:
-            percentage = (count / total_sessions * 100) if total_sessions > 0 else 0
-            top_adjectives.append(
-                AdjectiveStats(
-                    adjective_id=adjective_id,
-                    word=adj.word,
-                    count=count,
-                    percentage=round(percentage, 2)
-                )
+    for row in top_adj_result.all():
+        percentage = (row.count / total_sessions * 100) if total_sessions > 0 else 0
+        top_adjectives.append(
+            AdjectiveStats(
+                adjective_id=row.adjective_id,
+                word=row.word,
+                count=row.count,
+                percentage=round(percentage, 2),
+                buckets=BucketCounts(**{bucket: getattr(row, bucket) for bucket in BucketCounts.model_fields})
             )
+        )
     
-    # Get theme distribution
+    # Get theme distribution (theme_id 0 stands for sessions without a theme)
+    theme_count = func.sum(AnalyticsDailyListStats.sessions_started)
     theme_result = await db.execute(
-        select(
-            AnalyticsSession.theme_id,
-            func.count(AnalyticsSession.id).label('count')
-        )
-        .group_by(AnalyticsSession.theme_id)
-        .order_by(func.count(AnalyticsSession.id).desc())
+        select(AnalyticsDailyListStats.theme_id, theme_count.label('count'))
+        .group_by(AnalyticsDailyListStats.theme_id)
+        .having(theme_count > 0)
+        .order_by(theme_count.desc())
     )
     
     theme_distribution = []
@@ -138,17 +139,18 @@ async def get_analytics_summary(
         percentage = (count / total_sessions * 100) if total_sessions > 0 else 0
         theme_distribution.append(
             ThemeStats(
-                theme_id=theme_id or 0,  # Handle NULL theme_id
+                theme_id=theme_id,
                 session_count=count,
                 percentage=round(percentage, 2)
             )
         )
     
-    # Count total assignments
+    # Count total assignments, over the same existing adjectives as the top list
     assignments_result = await db.execute(
-        select(func.count(AnalyticsAssignment.id))
+        select(func.coalesce(func.sum(AnalyticsDailyAdjectiveStats.assignments), 0))
+        .join(Adjective, Adjective.id == AnalyticsDailyAdjectiveStats.adjective_id)
     )
-    total_assignments = assignments_result.scalar() or 0
+    total_assignments = assignments_result.scalar()
     
     return AnalyticsResponse(
         total_sessions=total_sessions,
@@ -163,7 +165,7 @@ async def get_analytics_summary(
 
 class SessionListResponse(BaseModel):
     id: str
-    list_id: int
+    list_id: int | None
     is_standard_list: bool
     started_at: datetime
     finished_at: datetime | None
@@ -175,36 +177,102 @@ class SessionListResponse(BaseModel):
         from_attributes = True
 
 
-@router.get("/sessions", response_model=List[SessionListResponse])
+class SessionPageResponse(BaseModel):
+    items: List[SessionListResponse]
+    next_cursor: Optional[str]
+
+
+def _encode_cursor(session: AnalyticsSession) -> str:
+    """Opaque position after ``session`` in (started_at, id) descending order."""
+    payload = json.dumps([session.started_at.isoformat(), session.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        started_at, session_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(started_at), str(session_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def session_filters(
+    list_id: Optional[int] = None,
+    started_from: Optional[datetime] = None,
+    started_until: Optional[datetime] = None,
+    is_standard_list: Optional[bool] = None,
+    completed: Optional[bool] = None,
+) -> list:
+    """WHERE clauses for the admin session filters; ``started_until`` is exclusive."""
+    filters = []
+    if list_id is not None:
+        filters.append(AnalyticsSession.list_id == list_id)
+    if started_from is not None:
+        filters.append(AnalyticsSession.started_at >= _naive_utc(started_from))
+    if started_until is not None:
+        filters.append(AnalyticsSession.started_at < _naive_utc(started_until))
+    if is_standard_list is not None:
+        filters.append(AnalyticsSession.is_standard_list == is_standard_list)
+    if completed is not None:
+        filters.append(
+            AnalyticsSession.finished_at.is_not(None) if completed else AnalyticsSession.finished_at.is_(None)
+        )
+    return filters
+
+
+@router.get("/sessions", response_model=SessionPageResponse)
 async def list_analytics_sessions(
     admin: Admin = Depends(require_admin),
     db: AsyncSession = Depends(get_session),
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    list_id: Optional[int] = None,
+    started_from: Optional[datetime] = None,
+    started_until: Optional[datetime] = None,
+    is_standard_list: Optional[bool] = None,
+    completed: Optional[bool] = None
 ):
     """
-    List all analytics sessions with pagination.
+    List analytics sessions, newest first, with keyset pagination.
     
-    Admin endpoint for viewing all student sorting sessions.
+    Pass ``next_cursor`` from the previous page as ``cursor`` to continue.
+    Pages seek on the (started_at, id) index instead of skipping rows, so
+    every page costs the same however deep it is.
     """
-    # Get sessions with limit/offset
+    filters = session_filters(list_id, started_from, started_until, is_standard_list, completed)
+    if cursor:
+        filters.append(tuple_(AnalyticsSession.started_at, AnalyticsSession.id) < tuple_(*_decode_cursor(cursor)))
+
+    # Correlated count: only evaluated for the sessions on the page
+    assignment_count = (
+        select(func.count(AnalyticsAssignment.id))
+        .where(AnalyticsAssignment.session_id == AnalyticsSession.id)
+        .correlate(AnalyticsSession)
+        .scalar_subquery()
+    )
+    
+    # One extra row tells whether there is a next page
     sessions_result = await db.execute(
-        select(AnalyticsSession)
-        .order_by(AnalyticsSession.started_at.desc())
-        .limit(limit)
-        .offset(offset)
+        select(AnalyticsSession, assignment_count)
+        .where(*filters)
+        .order_by(AnalyticsSession.started_at.desc(), AnalyticsSession.id.desc())
+        .limit(limit + 1)
     )
-    sessions = sessions_result.scalars().all()
+    rows = sessions_result.all()
+    next_cursor = _encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
     
     response = []
-    for session in sessions:
-        # Count assignments
-        assignments_result = await db.execute(
-            select(func.count(AnalyticsAssignment.id))
-            .where(AnalyticsAssignment.session_id == session.id)
-        )
-        assignment_count = assignments_result.scalar() or 0
-        
+    for session, assignment_count in rows[:limit]:
         # Calculate duration
         duration_seconds = None
         if session.finished_at:
@@ -223,7 +291,7 @@ async def list_analytics_sessions(
             )
         )
     
-    return response
+    return SessionPageResponse(items=response, next_cursor=next_cursor)
 
 
 @router.get("/sessions/{sessionId}")
@@ -249,31 +317,30 @@ async def get_session_details(
             detail="Session not found"
         )
     
-    # Get assignments
+    # Get assignments with their adjective details
     assignments_result = await db.execute(
-        select(AnalyticsAssignment)
+        select(
+            AnalyticsAssignment.adjective_id,
+            AnalyticsAssignment.bucket,
+            AnalyticsAssignment.assigned_at,
+            Adjective.word,
+            Adjective.explanation,
+        )
+        .join(Adjective, Adjective.id == AnalyticsAssignment.adjective_id)
         .where(AnalyticsAssignment.session_id == sessionId)
         .order_by(AnalyticsAssignment.bucket)
     )
-    assignments = assignments_result.scalars().all()
     
-    # Build response with adjective details
-    assignment_details = []
-    for assignment in assignments:
-        # Get adjective
-        adj_result = await db.execute(
-            select(Adjective).where(Adjective.id == assignment.adjective_id)
-        )
-        adj = adj_result.scalar_one_or_none()
-        
-        if adj:
-            assignment_details.append({
-                "adjective_id": adj.id,
-                "word": adj.word,
-                "explanation": adj.explanation,
-                "bucket": assignment.bucket,
-                "assigned_at": assignment.assigned_at
-            })
+    assignment_details = [
+        {
+            "adjective_id": row.adjective_id,
+            "word": row.word,
+            "explanation": row.explanation,
+            "bucket": row.bucket,
+            "assigned_at": row.assigned_at
+        }
+        for row in assignments_result.all()
+    ]
     
     # Calculate duration
     duration_seconds = None
@@ -289,7 +356,7 @@ async def get_session_details(
         "finished_at": session.finished_at,
         "duration_seconds": duration_seconds,
         "pdf_exported_at": session.pdf_exported_at,
-        "assignment_count": len(assignments),
+        "assignment_count": len(assignment_details),
         "assignments": assignment_details
     }
 
@@ -318,8 +385,6 @@ async def get_analytics_timeseries(
     Returns daily session counts, completions, and PDF exports
     for the specified number of days (default 30).
     """
-    from datetime import timedelta
-    
     # Limit to reasonable range
     days = min(max(days, 7), 365)
     
@@ -327,13 +392,18 @@ async def get_analytics_timeseries(
     end_date = datetime.utcnow().replace(hour=23, minute=59, second=59)
     start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0)
     
-    # Get all sessions in range
-    sessions_result = await db.execute(
-        select(AnalyticsSession)
-        .where(AnalyticsSession.started_at >= start_date)
-        .where(AnalyticsSession.started_at <= end_date)
+    # Sum the daily rollups in range
+    daily_result = await db.execute(
+        select(
+            AnalyticsDailyListStats.day,
+            func.sum(AnalyticsDailyListStats.sessions_started),
+            func.sum(AnalyticsDailyListStats.sessions_finished),
+            func.sum(AnalyticsDailyListStats.pdf_exports),
+        )
+        .where(AnalyticsDailyListStats.day >= start_date.date())
+        .where(AnalyticsDailyListStats.day <= end_date.date())
+        .group_by(AnalyticsDailyListStats.day)
     )
-    sessions = sessions_result.scalars().all()
     
     # Group by date
     daily_data = {}
@@ -341,14 +411,10 @@ async def get_analytics_timeseries(
         date_key = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
         daily_data[date_key] = {"sessions": 0, "completed": 0, "pdf_exports": 0}
     
-    for session in sessions:
-        date_key = session.started_at.strftime("%Y-%m-%d")
+    for day, started, finished, pdf_exports in daily_result.all():
+        date_key = day.strftime("%Y-%m-%d")
         if date_key in daily_data:
-            daily_data[date_key]["sessions"] += 1
-            if session.finished_at:
-                daily_data[date_key]["completed"] += 1
-            if session.pdf_exported_at:
-                daily_data[date_key]["pdf_exports"] += 1
+            daily_data[date_key] = {"sessions": started, "completed": finished, "pdf_exports": pdf_exports}
     
     # Convert to list
     data = [
@@ -360,3 +426,122 @@ async def get_analytics_timeseries(
         period=f"{days} days",
         data=data
     )
+
+
+class DurationBucket(BaseModel):
+    lower_seconds: float
+    upper_seconds: Optional[float]
+    count: int
+
+
+class DurationDistributionResponse(BaseModel):
+    period: str
+    count: int
+    mean_seconds: Optional[float]
+    median_seconds: Optional[float]
+    p90_seconds: Optional[float]
+    p99_seconds: Optional[float]
+    min_seconds: Optional[float]
+    max_seconds: Optional[float]
+    histogram: List[DurationBucket]
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+@router.get("/durations", response_model=DurationDistributionResponse)
+async def get_duration_distribution(
+    admin: Admin = Depends(require_admin),
+    db: AsyncSession = Depends(get_session),
+    days: Optional[int] = None
+):
+    """
+    Get the distribution of completed session durations.
+    
+    Reads the daily duration histogram, so the cost does not grow with the
+    number of sessions. The mean, minimum and maximum are exact; the median
+    and percentiles are interpolated within histogram bins. Sessions count
+    on the day they started; without ``days`` all history is included.
+    """
+    bin_filters = []
+    list_filters = []
+    if days is not None:
+        days = min(max(days, 1), 365)
+        start_day = (datetime.utcnow() - timedelta(days=days)).date()
+        bin_filters.append(AnalyticsDailyDurationBin.day >= start_day)
+        list_filters.append(AnalyticsDailyListStats.day >= start_day)
+
+    bins_result = await db.execute(
+        select(
+            AnalyticsDailyDurationBin.bin,
+            func.sum(AnalyticsDailyDurationBin.sessions),
+            func.min(AnalyticsDailyDurationBin.duration_seconds_min),
+            func.max(AnalyticsDailyDurationBin.duration_seconds_max),
+        )
+        .where(*bin_filters)
+        .group_by(AnalyticsDailyDurationBin.bin)
+        .order_by(AnalyticsDailyDurationBin.bin)
+    )
+    bins = [
+        DurationBin(*duration_bin_bounds(index), sessions=sessions, min_seconds=low, max_seconds=high)
+        for index, sessions, low, high in bins_result.all()
+        if sessions
+    ]
+
+    totals_result = await db.execute(
+        select(
+            func.coalesce(func.sum(AnalyticsDailyListStats.sessions_finished), 0),
+            func.coalesce(func.sum(AnalyticsDailyListStats.duration_seconds_sum), 0.0),
+        ).where(*list_filters)
+    )
+    completed_sessions, duration_sum = totals_result.one()
+
+    counts = {item.lower_seconds: item.sessions for item in bins}
+    histogram = []
+    for index in range(len(DURATION_BIN_EDGES)):
+        lower, upper = duration_bin_bounds(index)
+        histogram.append(DurationBucket(lower_seconds=lower, upper_seconds=upper, count=counts.get(lower, 0)))
+
+    return DurationDistributionResponse(
+        period=f"{days} days" if days is not None else "all",
+        count=completed_sessions,
+        mean_seconds=_round(duration_sum / completed_sessions) if completed_sessions else None,
+        median_seconds=_round(duration_quantile(bins, 0.5)),
+        p90_seconds=_round(duration_quantile(bins, 0.9)),
+        p99_seconds=_round(duration_quantile(bins, 0.99)),
+        min_seconds=_round(bins[0].min_seconds) if bins else None,
+        max_seconds=_round(bins[-1].max_seconds) if bins else None,
+        histogram=histogram
+    )
+
+
+@router.get("/export")
+async def export_analytics(
+    admin: Admin = Depends(require_admin),
+    db: AsyncSession = Depends(get_session),
+    format: Literal["csv", "ndjson"] = "csv",
+    list_id: Optional[int] = None,
+    started_from: Optional[datetime] = None,
+    started_until: Optional[datetime] = None,
+    is_standard_list: Optional[bool] = None,
+    completed: Optional[bool] = None
+):
+    """
+    Download the raw sessions with their assignments and adjective words.
+    
+    CSV has one line per assignment, NDJSON one object per session. Rows are
+    read in fixed-size keyset-paged batches, each in its own short
+    transaction, and written to the response as they arrive, so memory stays
+    flat and a slow download never pins the WAL. Filters match the session
+    listing.
+    """
+    filters = session_filters(list_id, started_from, started_until, is_standard_list, completed)
+    stream = stream_csv if format == "csv" else stream_ndjson
+    
+    filename = f"vielseitig-analytics-{datetime.utcnow():%Y-%m-%d}.{format}"
+    return StreamingResponse(
+        stream(db.bind, filters),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=\"{filename}\""},
+    )
@@ -7,7 +7,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
-from app.core.security import verify_password
+from app.core.security import hash_password_async, password_needs_rehash, verify_password_async
 from app.core.sessions import session_store
 from app.models.admin import Admin
 from app.api.deps import get_optional_session_token, require_admin
@@ -118,14 +118,19 @@ async def admin_login(
     )
     admin = result.scalar_one_or_none()
     
-    if not admin or not verify_password(credentials.password, admin.password_hash):
+    if not admin or not await verify_password_async(credentials.password, admin.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
+    # Upgrade hashes made with outdated Argon2 parameters
+    login_values = {"last_login_at": datetime.utcnow()}
+    if password_needs_rehash(admin.password_hash):
+        login_values["password_hash"] = await hash_password_async(credentials.password)
+    
     # Create session
-    session_token = session_store.create_session(
+    session_token = await session_store.create_session_async(
         user_id=admin.id,
         user_type="admin"
     )
@@ -134,7 +139,7 @@ async def admin_login(
     await db.execute(
         update(Admin)
         .where(Admin.id == admin.id)
-        .values(last_login_at=datetime.utcnow())
+        .values(**login_values)
     )
     await db.commit()
     
@@ -162,7 +167,7 @@ async def admin_logout(
 ):
     """Admin logout endpoint."""
     if session_token:
-        session_store.delete_session(session_token)
+        await session_store.delete_session_async(session_token)
     
     # Clear cookie
     response.delete_cookie(key="vielseitig_session")
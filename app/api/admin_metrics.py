@@ -0,0 +1,33 @@
+"""Admin runtime metrics for in-process caches and background workers."""
+from fastapi import APIRouter, Depends
+
+from app.models.admin import Admin
+from app.api.deps import require_admin
+from app.core.principal_cache import principal_cache
+from app.core.security import password_pool
+from app.core.sessions import session_store
+from app.services.analytics_writer import analytics_writer
+from app.services.artifact_cache import artifact_cache
+from app.services.pdf_jobs import pdf_jobs
+from app.services.premium_catalog import premium_catalog
+from app.services.qr_render import qr_matrix_stats
+from app.services.share_cache import share_cache
+
+
+router = APIRouter(prefix="/admin/metrics", tags=["admin-metrics"])
+
+
+@router.get("")
+async def get_metrics(admin: Admin = Depends(require_admin)):
+    """Get counters for the in-process caches and background workers."""
+    return {
+        "share_cache": share_cache.stats(),
+        "analytics_writer": analytics_writer.stats(),
+        "sessions": session_store.stats(),
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": password_pool.stats(),
+        "pdf_jobs": pdf_jobs.stats(),
+        "artifact_cache": artifact_cache.stats(),
+        "qr_matrices": qr_matrix_stats(),
+        "premium_catalog": premium_catalog.stats(),
+    }
@@ -10,6 +10,8 @@ from app.models.admin import Admin
 from app.models.list import List as ListModel
 from app.models.adjective import Adjective
 from app.api.deps import require_admin
+from app.services.list_counters import bump_content_version, record_adjective_change
+from app.services.share_cache import share_cache
 
 
 router = APIRouter(prefix="/admin/standard-list", tags=["admin-standard-list"])
@@ -123,8 +125,10 @@ async def update_standard_adjective(
     adj.order_index = request.order_index
     
     db.add(adj)
+    await bump_content_version(db, list_obj.id)
     await db.commit()
     await db.refresh(adj)
+    share_cache.invalidate_list(list_obj.id)
     
     return AdjectiveResponse(
         id=adj.id,
@@ -163,6 +167,8 @@ async def delete_standard_adjective(
         )
     
     await db.delete(adj)
+    await record_adjective_change(db, list_obj.id, added=-1, active_added=-1 if adj.active else 0)
     await db.commit()
+    share_cache.invalidate_list(list_obj.id)
     
     return {"message": "Adjective deleted from standard list", "id": adjectiveId}
@@ -7,12 +7,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
-from app.core.security import get_password_hash
+from app.core.principal_cache import principal_cache
+from app.core.security import hash_password_async
 from app.models.user import User
 from app.models.school import School
 from app.models.admin import Admin
 from app.api.deps import require_admin
 from app.services.admin_utils import reset_user_password, generate_temporary_password
+from app.services.share_cache import share_cache
 
 
 router = APIRouter(prefix="/admin", tags=["admin-users"])
@@ -141,6 +143,8 @@ async def approve_user(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    share_cache.invalidate_user(user.id)
+    principal_cache.invalidate_user(user.id)
     
     return {"message": "User approved", "email": user.email, "status": user.status}
 
@@ -162,6 +166,8 @@ async def reject_user(
     user.status = "passive"
     db.add(user)
     await db.commit()
+    share_cache.invalidate_user(user.id)
+    principal_cache.invalidate_user(user.id)
     
     return {"message": "User rejected", "email": user.email}
 
@@ -215,6 +221,8 @@ async def approve_school(
     school.status = "active"
     db.add(school)
     await db.commit()
+    share_cache.invalidate_school(school.id)
+    principal_cache.invalidate_school(school.id)
     
     return {"message": "School approved", "name": school.name, "status": school.status}
 
@@ -236,6 +244,8 @@ async def reject_school(
     school.status = "passive"
     db.add(school)
     await db.commit()
+    share_cache.invalidate_school(school.id)
+    principal_cache.invalidate_school(school.id)
     
     return {"message": "School rejected", "name": school.name}
 
@@ -332,7 +342,7 @@ async def create_user(
             detail="School not found"
         )
     
-    password_hash = get_password_hash(user_req.password)
+    password_hash = await hash_password_async(user_req.password)
     
     new_user = User(
         email=user_req.email,
@@ -404,6 +414,8 @@ async def update_user(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    share_cache.invalidate_user(user.id)
+    principal_cache.invalidate_user(user.id)
     
     return {"message": "User updated", "id": user.id, "email": user.email}
 
@@ -423,6 +435,8 @@ async def delete_user(
     
     await db.delete(user)
     await db.commit()
+    share_cache.invalidate_user(userId)
+    principal_cache.invalidate_user(userId)
     
     return {"message": "User deleted", "id": userId}
 
@@ -447,6 +461,8 @@ async def set_user_activation(
     
     db.add(user)
     await db.commit()
+    share_cache.invalidate_user(user.id)
+    principal_cache.invalidate_user(user.id)
     
     return {
         "message": "User activation updated",
@@ -465,6 +481,7 @@ async def reset_password(
     """Reset a user's password to a temporary one."""
     temp_password = await generate_temporary_password()
     email = await reset_user_password(db, userId, temp_password)
+    principal_cache.invalidate_user(userId)
     
     return {
         "message": "Password reset",
@@ -573,6 +590,8 @@ async def update_school(
     db.add(school)
     await db.commit()
     await db.refresh(school)
+    share_cache.invalidate_school(school.id)
+    principal_cache.invalidate_school(school.id)
     
     return {"message": "School updated", "id": school.id, "name": school.name}
 
@@ -592,5 +611,7 @@ async def delete_school(
     
     await db.delete(school)
     await db.commit()
+    share_cache.invalidate_school(schoolId)
+    principal_cache.invalidate_school(schoolId)
     
     return {"message": "School deleted", "id": schoolId}
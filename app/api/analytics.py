@@ -1,16 +1,18 @@
 """Public analytics endpoints for student sorting sessions."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.services.analytics import (
+    AssignmentEvent,
     finish_analytics_session,
     mark_pdf_export,
     record_assignment,
+    record_assignments_batch,
     start_analytics_session,
 )
 
@@ -45,6 +47,22 @@ class AssignmentResponse(BaseModel):
     bucket: str
 
 
+class BatchAssignmentItem(BaseModel):
+    adjective_id: int
+    bucket: str
+    client_timestamp: Optional[datetime] = None
+
+
+class BatchAssignmentRequest(BaseModel):
+    analytics_session_id: str
+    assignments: List[BatchAssignmentItem] = Field(..., max_length=500)
+
+
+class BatchAssignmentResponse(BaseModel):
+    message: str
+    recorded: int
+
+
 class SessionFinishRequest(BaseModel):
     analytics_session_id: str
 
@@ -96,6 +114,23 @@ async def submit_assignment(
     )
 
 
+@router.post("/assignments/batch", response_model=BatchAssignmentResponse)
+async def submit_assignments_batch(
+    payload: BatchAssignmentRequest,
+    db: AsyncSession = Depends(get_session),
+):
+    """Record an ordered batch of sorted cards in a single transaction."""
+    recorded = await record_assignments_batch(
+        db,
+        session_id=payload.analytics_session_id,
+        assignments=[
+            AssignmentEvent(item.adjective_id, item.bucket, item.client_timestamp)
+            for item in payload.assignments
+        ],
+    )
+    return BatchAssignmentResponse(message="Assignments recorded", recorded=len(recorded))
+
+
 @router.post("/session/finish", response_model=SessionFinishResponse)
 async def finish_session(
     payload: SessionFinishRequest,
@@ -1,10 +1,11 @@
 """List management for users (Lehrkraft)."""
 import secrets
 from datetime import datetime, timedelta
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-from sqlalchemy import select, and_
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
+from sqlalchemy import and_, func, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
@@ -12,6 +13,12 @@ from app.models.user import User
 from app.models.list import List as ListModel
 from app.models.adjective import Adjective
 from app.api.deps import require_active_user
+from app.services.hexagon import THEME_COLORS
+from app.services.pdf_batch import MAX_BATCH_SESSIONS, load_session_boards, render_boards_pdf, stream_boards_zip
+from app.services.artifact_cache import etag_matches
+from app.services.list_counters import bump_content_version, list_content_etag, record_adjective_change
+from app.services.premium_catalog import premium_catalog
+from app.services.share_cache import share_cache
 
 
 router = APIRouter(prefix="/user/lists", tags=["user-lists"])
@@ -92,6 +99,28 @@ class AdjectiveUpdateRequest(BaseModel):
 # ============ PREMIUM LISTS (for registered users) ============
 
 
+_premium_catalog_adapter = TypeAdapter(List[ListSummaryResponse])
+
+
+async def _build_premium_catalog(db: AsyncSession) -> bytes:
+    """Serialize all premium lists with their active adjective counts, using one query."""
+    result = await db.execute(
+        select(
+            ListModel.id,
+            ListModel.name,
+            ListModel.slug,
+            ListModel.description,
+            ListModel.is_default,
+            ListModel.is_premium,
+            ListModel.active_adjective_count.label("adjective_count"),
+        )
+        .where(ListModel.is_premium == True)  # noqa: E712
+        .order_by(ListModel.name)
+    )
+    summaries = [ListSummaryResponse.model_validate(row, from_attributes=True) for row in result.all()]
+    return _premium_catalog_adapter.dump_json(summaries)
+
+
 @router.get("/premium", response_model=List[ListSummaryResponse])
 async def get_premium_lists(
     user: User = Depends(require_active_user),
@@ -101,38 +130,15 @@ async def get_premium_lists(
     Get all available premium lists.
     
     Premium lists are only accessible to registered users.
-    Returns a summary without adjectives for overview.
+    Returns a summary without adjectives for overview. The serialized
+    catalog is cached until premium lists are seeded again.
     """
-    from sqlalchemy import func
-    
-    # Get premium lists with adjective count
-    result = await db.execute(
-        select(ListModel)
-        .where(ListModel.is_premium == True)  # noqa: E712
-        .order_by(ListModel.name)
-    )
-    lists = result.scalars().all()
-    
-    response = []
-    for lst in lists:
-        # Count adjectives
-        count_result = await db.execute(
-            select(func.count(Adjective.id))
-            .where(Adjective.list_id == lst.id, Adjective.active == True)  # noqa: E712
-        )
-        adj_count = count_result.scalar() or 0
-        
-        response.append(ListSummaryResponse(
-            id=lst.id,
-            name=lst.name,
-            slug=lst.slug,
-            description=lst.description,
-            is_default=lst.is_default,
-            is_premium=lst.is_premium,
-            adjective_count=adj_count
-        ))
-    
-    return response
+    body = premium_catalog.get()
+    if body is None:
+        version = premium_catalog.version
+        body = await _build_premium_catalog(db)
+        premium_catalog.set(body, version=version)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/premium/{slug}", response_model=ListResponse)
@@ -328,8 +334,10 @@ async def update_list(
     
     list_obj.updated_at = datetime.utcnow()
     db.add(list_obj)
+    await bump_content_version(db, list_obj.id)
     await db.commit()
     await db.refresh(list_obj)
+    share_cache.invalidate_list(list_obj.id)
     
     # Load adjectives
     adj_result = await db.execute(
@@ -388,6 +396,7 @@ async def delete_list(
     
     await db.delete(list_obj)
     await db.commit()
+    share_cache.invalidate_list(listId)
     
     return {"message": "List deleted", "id": listId}
 
@@ -421,6 +430,7 @@ async def regenerate_share_token(
     db.add(list_obj)
     await db.commit()
     await db.refresh(list_obj)
+    share_cache.invalidate_list(list_obj.id)
     
     return {
         "message": "Share token regenerated",
@@ -435,10 +445,17 @@ async def regenerate_share_token(
 @router.get("/{listId}/adjectives", response_model=List[AdjectiveResponse])
 async def get_adjectives(
     listId: int,
+    request: Request,
+    response: Response,
     user: User = Depends(require_active_user),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get all adjectives for a list."""
+    """
+    Get all adjectives for a list.
+    
+    The ETag is derived from the list's content version, so a matching
+    If-None-Match gets 304 without loading the adjectives.
+    """
     # Check list exists and user has access
     result = await db.execute(select(ListModel).where(ListModel.id == listId))
     list_obj = result.scalar_one_or_none()
@@ -449,6 +466,12 @@ async def get_adjectives(
     if not list_obj.is_default and list_obj.owner_user_id != user.id and not list_obj.share_with_school:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
+    etag = list_content_etag(list_obj)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
     adj_result = await db.execute(
         select(Adjective)
         .where(Adjective.list_id == listId)
@@ -489,11 +512,7 @@ async def create_adjective(
     
     # Determine order_index
     if request.order_index is None:
-        max_order_result = await db.execute(
-            select(Adjective).where(Adjective.list_id == listId)
-        )
-        adjectives = max_order_result.scalars().all()
-        order_index = len(adjectives) + 1
+        order_index = list_obj.adjective_count + 1
     else:
         order_index = request.order_index
     
@@ -507,8 +526,10 @@ async def create_adjective(
     )
     
     db.add(new_adj)
+    await record_adjective_change(db, listId, added=1, active_added=1)
     await db.commit()
     await db.refresh(new_adj)
+    share_cache.invalidate_list(listId)
     
     return AdjectiveResponse(
         id=new_adj.id,
@@ -561,8 +582,10 @@ async def update_adjective(
         adj.order_index = request.order_index
     
     db.add(adj)
+    await bump_content_version(db, listId)
     await db.commit()
     await db.refresh(adj)
+    share_cache.invalidate_list(listId)
     
     return AdjectiveResponse(
         id=adj.id,
@@ -604,7 +627,9 @@ async def delete_adjective(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adjective not found")
     
     await db.delete(adj)
+    await record_adjective_change(db, listId, added=-1, active_added=-1 if adj.active else 0)
     await db.commit()
+    share_cache.invalidate_list(listId)
     
     return {"message": "Adjective deleted", "id": adjectiveId}
 
@@ -663,9 +688,10 @@ async def fork_list(
     
     # Generate new share token and expiry
     share_token = secrets.token_urlsafe(32)
-    share_expires_at = datetime.utcnow() + timedelta(days=365)
+    now = datetime.utcnow()
+    share_expires_at = now + timedelta(days=365)
     
-    # Create the forked list
+    # Create the forked list; counters are set from the copied adjectives below
     forked_list = ListModel(
         name=f"{source_list.name} (Kopie)",
         description=source_list.description,
@@ -676,32 +702,38 @@ async def fork_list(
         share_expires_at=share_expires_at,
         share_enabled=True,
         share_with_school=True,  # Share with school by default
-        source_list_id=source_list.id
+        source_list_id=source_list.id,
+        content_version=1,
     )
-    
     db.add(forked_list)
-    await db.commit()
-    await db.refresh(forked_list)
-    
-    # Copy all adjectives from source list
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == listId)
-        .order_by(Adjective.order_index)
-    )
-    source_adjectives = adj_result.scalars().all()
-    
-    for src_adj in source_adjectives:
-        new_adj = Adjective(
-            list_id=forked_list.id,
-            word=src_adj.word,
-            explanation=src_adj.explanation,
-            example=src_adj.example,
-            order_index=src_adj.order_index,
-            active=src_adj.active
+    await db.flush()
+    
+    # Copy all adjectives server-side in the same transaction: one statement however long the list is
+    await db.execute(
+        insert(Adjective).from_select(
+            ["list_id", "word", "explanation", "example", "order_index", "active", "created_at", "updated_at"],
+            select(
+                literal(forked_list.id),
+                Adjective.word,
+                Adjective.explanation,
+                Adjective.example,
+                Adjective.order_index,
+                Adjective.active,
+                literal(now),
+                literal(now),
+            )
+            .where(Adjective.list_id == listId)
+            .order_by(Adjective.order_index, Adjective.id),
         )
-        db.add(new_adj)
-    
+    )
+    # Count the rows actually copied: the source's denormalized counters may have drifted
+    counts = await db.execute(
+        select(
+            func.count(Adjective.id),
+            func.count(Adjective.id).filter(Adjective.active == True),  # noqa: E712
+        ).where(Adjective.list_id == forked_list.id)
+    )
+    forked_list.adjective_count, forked_list.active_adjective_count = counts.one()
     await db.commit()
     
     return ForkListResponse(
@@ -713,3 +745,73 @@ async def fork_list(
         message=f"Liste erfolgreich kopiert. Du kannst sie jetzt bearbeiten."
     )
 
+
+# ============ CLASS PDF EXPORT ============
+
+
+class ClassPdfExportRequest(BaseModel):
+    session_ids: Optional[List[str]] = Field(None, max_length=MAX_BATCH_SESSIONS)
+    started_from: Optional[datetime] = None
+    started_until: Optional[datetime] = None
+    theme: str = "blue"
+    format: Literal["pdf", "zip"] = "pdf"
+
+
+@router.post("/{listId}/sessions/pdf")
+async def export_class_pdf(
+    listId: int,
+    payload: ClassPdfExportRequest,
+    user: User = Depends(require_active_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Export the results of a whole class in one download (only owner).
+    
+    Exports the given ``session_ids`` or, without them, every finished
+    session of the list started within the optional time window. Returns
+    one multi-page PDF, or a ZIP with one PDF per student that is streamed
+    while the files are rendered. The PDF (and the ZIP's first file) is
+    rendered before the response starts, so render failures get a status
+    code instead of a truncated download.
+    """
+    result = await db.execute(select(ListModel).where(ListModel.id == listId))
+    list_obj = result.scalar_one_or_none()
+    
+    if not list_obj:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="List not found")
+    
+    # Permission: only owner can export student results
+    if list_obj.owner_user_id != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only owner can export results")
+    
+    if payload.theme not in THEME_COLORS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Theme must be one of: {', '.join(THEME_COLORS)}",
+        )
+    
+    # Everything needed for rendering is loaded up front; the stream itself never touches the database
+    boards = await load_session_boards(
+        db,
+        list_id=listId,
+        session_ids=payload.session_ids,
+        started_from=payload.started_from,
+        started_until=payload.started_until,
+    )
+    
+    filename = f"klasse-{datetime.utcnow():%Y-%m-%d}.{payload.format}"
+    headers = {
+        "Content-Disposition": f"attachment; filename=\"{filename}\"",
+        "X-Session-Count": str(len(boards)),
+    }
+    if payload.format == "zip":
+        return StreamingResponse(
+            await stream_boards_zip(boards, payload.theme),
+            media_type="application/zip",
+            headers=headers,
+        )
+    return Response(
+        content=await render_boards_pdf(boards, payload.theme),
+        media_type="application/pdf",
+        headers=headers,
+    )
@@ -1,47 +1,58 @@
-"""PDF export of student sorting assignments using front-end snapshot (WYSIWYG)."""
+"""PDF export of student sorting assignments (vector board or front-end snapshot)."""
 import base64
 import io
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from PIL import Image, UnidentifiedImageError
 from pydantic import BaseModel
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfgen import canvas
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.db.session import get_session
-from app.models.analytics import AnalyticsSession
+from app.models.adjective import Adjective
+from app.models.analytics import AnalyticsAssignment, AnalyticsSession
 from app.models.list import List as ListModel
 from app.services.analytics import mark_pdf_export, record_assignment as record_assignment_service
+from app.services.analytics_writer import analytics_writer
+from app.services.artifact_cache import Artifact, artifact_cache, artifact_key, artifact_response
+from app.services.pdf_jobs import FAILED, PdfJob, pdf_jobs
+from app.services.hexagon import THEME_COLORS
+from app.services.pdf_render import check_image_pixels, render_hexagon_pdf, render_snapshot_pdf
+from app.services.uploads import SpooledFile, check_declared_length, limit_stream, spool_to_file
 
 
 router = APIRouter(prefix="/api/sessions", tags=["pdf"])
 
+_settings = get_settings()
+
+SNAPSHOT_CONTENT_TYPES = {"image/png", "image/webp", "application/octet-stream"}
+UPLOAD_READ_CHUNK_BYTES = 64 * 1024
+
 
 class PDFSnapshotRequest(BaseModel):
     image_data_url: str
 
 
+class VectorPDFRequest(BaseModel):
+    theme: str = "blue"
+    seed: Optional[int] = None  # layout seed of the results page, random if omitted
+
+
 class AssignmentRecordRequest(BaseModel):
     adjective_id: int
     bucket: str
 
 
-@router.post("/{sessionId}/pdf")
-async def export_session_pdf(
-    sessionId: str,
-    payload: PDFSnapshotRequest,
-    db: AsyncSession = Depends(get_session),
-):
-    """Export the current session using a front-end snapshot (WYSIWYG)."""
-
-    # Session and list lookup
+async def _check_session_and_list(db: AsyncSession, session_id: str) -> None:
+    """Raise 404 unless the session exists and still has its list."""
     session_result = await db.execute(
-        select(AnalyticsSession).where(AnalyticsSession.id == sessionId)
+        select(AnalyticsSession).where(AnalyticsSession.id == session_id)
     )
     session = session_result.scalar_one_or_none()
     if not session:
@@ -60,6 +71,11 @@ async def export_session_pdf(
             detail="List not found",
         )
 
+
+async def _decode_snapshot(db: AsyncSession, session_id: str, payload: PDFSnapshotRequest) -> bytes:
+    """Validate the session and return the decoded snapshot image."""
+    await _check_session_and_list(db, session_id)
+
     if not payload.image_data_url or not payload.image_data_url.startswith("data:image/"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -75,61 +91,321 @@ async def export_session_pdf(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="image_data_url could not be decoded",
         ) from exc
+    _check_snapshot_image(io.BytesIO(image_bytes))
+    return image_bytes
+
+
+async def _submit_snapshot_job(db: AsyncSession, session_id: str, payload: PDFSnapshotRequest) -> PdfJob:
+    """Validate the session and snapshot, then queue the PDF render."""
+    image_bytes = await _decode_snapshot(db, session_id, payload)
+    return await pdf_jobs.submit(
+        render_snapshot_pdf,
+        image_bytes,
+        datetime.utcnow().strftime("%d.%m.%Y"),
+        _settings.pdf_snapshot_max_dpi,
+        _settings.pdf_snapshot_max_pixels,
+        session_id=session_id,
+    )
+
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def _check_snapshot_image(source) -> None:
+    """Reject snapshots that are no image or exceed the pixel limit, reading only the header."""
+    try:
+        with Image.open(source) as image:
+            check_image_pixels(image, _settings.pdf_snapshot_max_pixels)
+    except (ValueError, Image.DecompressionBombError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc),
+        ) from exc
+    except UnidentifiedImageError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Snapshot must be a PNG or WebP image",
+        ) from exc
+
+
+async def _upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_READ_CHUNK_BYTES):
+        yield chunk
+
 
-    # Prepare PDF (landscape per WYSIWYG request)
-    pdf_buffer = io.BytesIO()
-    page_width, page_height = landscape(A4)
-    margin = 1.5 * cm
-    footer_space = 1.0 * cm
-    content_width = page_width - 2 * margin
-    content_height = page_height - 2 * margin - footer_space
+async def _spool_multipart(request: Request, max_bytes: int) -> SpooledFile:
+    """
+    Parse a multipart body whose size is capped while it streams in.
+
+    ``request.form()`` would spool a part without Content-Length to any size
+    before it could be checked, so the parser reads a limited stream instead.
+    """
+    parser = MultiPartParser(
+        request.headers,
+        limit_stream(request.stream(), max_bytes=max_bytes),
+        max_files=1,
+        max_fields=1,
+    )
+    try:
+        form = await parser.parse()
+    except MultiPartException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message) from exc
+    try:
+        upload = form.get("image")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Multipart upload needs an 'image' file field",
+            )
+        return await spool_to_file(_upload_chunks(upload), max_bytes=max_bytes)
+    finally:
+        await form.close()
 
-    c = canvas.Canvas(pdf_buffer, pagesize=landscape(A4))
 
-    image = ImageReader(io.BytesIO(image_bytes))
-    img_width, img_height = image.getSize()
-    img_ratio = img_width / img_height
-    box_ratio = content_width / content_height
+async def _read_snapshot_upload(request: Request) -> SpooledFile:
+    """
+    Spool a PNG/WebP snapshot sent as a raw body or as the ``image`` field of a multipart form.
 
-    if img_ratio >= box_ratio:
-        draw_width = content_width
-        draw_height = content_width / img_ratio
+    Both are cut off at the size limit while they stream in and end up in a
+    named temp file, so the render worker opens the image by path instead of
+    receiving a pickled copy. The caller removes the file.
+    """
+    max_bytes = _settings.pdf_snapshot_max_bytes
+    check_declared_length(request.headers.get("content-length"), max_bytes)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "multipart/form-data":
+        spooled = await _spool_multipart(request, max_bytes)
+    elif content_type in SNAPSHOT_CONTENT_TYPES:
+        spooled = await spool_to_file(request.stream(), max_bytes=max_bytes)
     else:
-        draw_height = content_height
-        draw_width = content_height * img_ratio
-
-    x = (page_width - draw_width) / 2
-    y = (page_height - footer_space - draw_height) / 2 + footer_space / 2
-
-    c.drawImage(
-        image,
-        x,
-        y,
-        width=draw_width,
-        height=draw_height,
-        preserveAspectRatio=True,
-        mask="auto",
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send the snapshot as image/png, image/webp or multipart/form-data",
+        )
+
+    try:
+        if not _sniff_image_type(spooled.head()):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Snapshot must be a PNG or WebP image",
+            )
+        _check_snapshot_image(spooled.path)
+    except BaseException:
+        spooled.remove()
+        raise
+    return spooled
+
+
+def _raise_for_job(job: PdfJob) -> None:
+    """Raise for jobs that failed or are still running."""
+    if job.status == FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"PDF rendering failed: {job.error}",
+        )
+    if not job.finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="PDF is not ready yet",
+        )
+
+
+def _pdf_response(request: Request, artifact: Artifact, filename: str = "ich-bin-vielseitig.pdf") -> Response:
+    return artifact_response(
+        request,
+        artifact,
+        "application/pdf",
+        {"Content-Disposition": f"attachment; filename=\"{filename}\""},
     )
 
-    # Footer date (spec: DD.MM.YYYY)
-    c.setFont("Helvetica", 9)
-    c.drawCentredString(
-        page_width / 2,
-        margin / 2,
-        datetime.utcnow().strftime("%d.%m.%Y"),
+
+async def _render_pdf(key: Optional[str], func, *args, session_id: str) -> Artifact:
+    """
+    Return the PDF for ``key`` from the artifact cache or render it on the job pool.
+
+    Renders whose output is not determined by their inputs pass ``key=None``
+    and are never cached. Student PDFs are only kept in the memory tier.
+    """
+    async def render() -> bytes:
+        job = await pdf_jobs.submit(func, *args, session_id=session_id)
+        # Rendering happens in a worker process; this request only waits for it
+        await pdf_jobs.wait(job)
+        _raise_for_job(job)
+        return job.result
+
+    if key is None:
+        return Artifact.from_bytes(await render())
+    return await artifact_cache.get_or_create(key, render, persist=False)
+
+
+def _get_job_or_404(job_id: str) -> PdfJob:
+    job = pdf_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="PDF job not found",
+        )
+    return job
+
+
+@router.post("/{sessionId}/pdf")
+async def export_session_pdf(
+    sessionId: str,
+    payload: PDFSnapshotRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+):
+    """Export the current session using a front-end snapshot (WYSIWYG)."""
+    image_bytes = await _decode_snapshot(db, sessionId, payload)
+    footer_text = datetime.utcnow().strftime("%d.%m.%Y")
+    dpi = _settings.pdf_snapshot_max_dpi
+
+    artifact = await _render_pdf(
+        artifact_key("snapshot-pdf", image_bytes, footer_text, dpi),
+        render_snapshot_pdf,
+        image_bytes,
+        footer_text,
+        dpi,
+        _settings.pdf_snapshot_max_pixels,
+        session_id=sessionId,
     )
+    response = _pdf_response(request, artifact)
+
+    await mark_pdf_export(db, session_id=sessionId)
+    return response
 
-    c.showPage()
-    c.save()
-    pdf_buffer.seek(0)
+
+@router.post("/{sessionId}/pdf/snapshot")
+async def export_session_snapshot_pdf(
+    sessionId: str,
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Export a snapshot uploaded as binary instead of a base64 data URL.
+
+    Accepts ``image/png``, ``image/webp`` or ``application/octet-stream``
+    bodies, or a multipart form with an ``image`` file. The image is
+    downscaled to the printable resolution before it is embedded.
+    """
+    await _check_session_and_list(db, sessionId)
+    spooled = await _read_snapshot_upload(request)
+    footer_text = datetime.utcnow().strftime("%d.%m.%Y")
+    dpi = _settings.pdf_snapshot_max_dpi
+    max_pixels = _settings.pdf_snapshot_max_pixels
+
+    try:
+        # Same key as for the image bytes, so a data URL export of the same image is a cache hit
+        key = artifact_key("snapshot-pdf", {"sha256": spooled.sha256}, footer_text, dpi)
+        artifact = await _render_pdf(
+            key, render_snapshot_pdf, spooled.path, footer_text, dpi, max_pixels, session_id=sessionId
+        )
+    finally:
+        spooled.remove()
+    response = _pdf_response(request, artifact)
 
     await mark_pdf_export(db, session_id=sessionId)
+    return response
 
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=\"ich-bin-vielseitig.pdf\""},
+
+@router.post("/{sessionId}/pdf/vector")
+async def export_session_vector_pdf(
+    sessionId: str,
+    payload: VectorPDFRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Export the session's hexagon board as vector shapes.
+
+    Uses the same layout algorithm and seed as the results page, so no
+    snapshot upload is needed and the PDF stays a few kilobytes. The board
+    is drawn from the stored assignments only; assignments still queued by
+    the analytics writer are written first.
+    """
+    if payload.theme not in THEME_COLORS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Theme must be one of: {', '.join(THEME_COLORS)}",
+        )
+
+    await analytics_writer.flush()
+    await _check_session_and_list(db, sessionId)
+
+    # Sorting order: the results page places cards in the order they were assigned
+    cards_result = await db.execute(
+        select(Adjective.word, AnalyticsAssignment.bucket)
+        .join(Adjective, Adjective.id == AnalyticsAssignment.adjective_id)
+        .where(
+            AnalyticsAssignment.session_id == sessionId,
+            AnalyticsAssignment.bucket.in_(("oft", "manchmal")),
+        )
+        .order_by(AnalyticsAssignment.assigned_at, AnalyticsAssignment.id)
     )
+    cards = [(word, bucket) for word, bucket in cards_result.all()]
+
+    footer_text = datetime.utcnow().strftime("%d.%m.%Y")
+
+    # Without a seed the layout is random, so the render cannot be reused
+    key = None
+    if payload.seed is not None:
+        key = artifact_key("hexagon-pdf", cards, payload.theme, payload.seed, footer_text)
+    artifact = await _render_pdf(
+        key,
+        render_hexagon_pdf,
+        cards,
+        payload.theme,
+        payload.seed,
+        footer_text,
+        session_id=sessionId,
+    )
+    response = _pdf_response(request, artifact)
+
+    await mark_pdf_export(db, session_id=sessionId)
+    return response
+
+
+@router.post("/{sessionId}/pdf/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_session_pdf_job(
+    sessionId: str,
+    payload: PDFSnapshotRequest,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Queue a PDF export and return its job id right away.
+
+    Poll ``GET /api/sessions/pdf-jobs/{job_id}`` for the status and fetch
+    the file from ``/api/sessions/pdf-jobs/{job_id}/result``.
+    """
+    job = await _submit_snapshot_job(db, sessionId, payload)
+    await mark_pdf_export(db, session_id=sessionId)
+    return job.to_dict()
+
+
+@router.get("/pdf-jobs/{job_id}")
+async def get_pdf_job(job_id: str):
+    """Get the status and timings of a PDF job."""
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.get("/pdf-jobs/{job_id}/result")
+async def get_pdf_job_result(
+    job_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish"),
+):
+    """Download the PDF of a finished job, optionally waiting for it."""
+    job = _get_job_or_404(job_id)
+    if wait:
+        await pdf_jobs.wait(job, timeout=wait)
+    _raise_for_job(job)
+    return _pdf_response(request, Artifact.from_bytes(job.result), job.filename)
 
 
 @router.post("/{sessionId}/record-assignment")
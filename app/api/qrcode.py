@@ -1,9 +1,9 @@
 """QR code generation for list share links."""
-from io import BytesIO
+from typing import List, Literal, Optional
 
-import qrcode
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,23 +11,41 @@ from app.db.session import get_session
 from app.models.list import List as ListModel
 from app.models.user import User
 from app.api.deps import require_user
+from app.services.artifact_cache import artifact_cache, artifact_key, artifact_response
+from app.services.qr_render import QR_BORDER, QR_FORMATS, box_size_for, qr_matrix, render_qr_png, render_qr_svg
+from app.services.qr_sheet import MAX_QR_SHEET_LISTS, load_sheet_lists, render_qr_sheet
 
 
 router = APIRouter(prefix="/user", tags=["qr"])
 
 
+class QrSheetRequest(BaseModel):
+    list_ids: Optional[List[int]] = Field(None, max_length=MAX_QR_SHEET_LISTS)
+
+
+def _base_url(request: Request) -> str:
+    # Get base URL from request (e.g., http://localhost:3000 or https://vielseitig.zumgugger.ch)
+    return f"{request.url.scheme}://{request.url.netloc}"
+
+
 @router.get("/lists/{listId}/qr")
 async def get_list_qr_code(
     listId: int,
     request: Request,
+    format: Literal["png", "svg"] = Query("png", description="Image format"),
+    size: Optional[int] = Query(None, ge=64, le=4096, description="Approximate edge length in pixels"),
     user: User = Depends(require_user),
     db: AsyncSession = Depends(get_session)
 ):
     """
-    Generate QR code for list share link (PNG format).
+    Generate QR code for list share link as PNG or SVG.
     
     User endpoint - only owner can generate QR code.
-    Generates QR code pointing to /l/{token}.
+    Generates QR code pointing to /l/{token}. ``size`` picks the largest
+    whole module size that fits, 10px per module by default. The module
+    matrix is computed once per share URL and each format and size is drawn
+    from it; images are cached by their inputs and served with an ETag, so
+    revalidations get 304 Not Modified.
     """
     # Get list
     result = await db.execute(
@@ -56,28 +74,54 @@ async def get_list_qr_code(
         )
     
     # Generate QR code with dynamic URL from request
-    # Get base URL from request (e.g., http://localhost:3000 or https://vielseitig.zumgugger.ch)
-    base_url = f"{request.url.scheme}://{request.url.netloc}"
-    qr_url = f"{base_url}/l/{list_obj.share_token}"
-    
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=2,
+    qr_url = f"{_base_url(request)}/l/{list_obj.share_token}"
+
+    matrix = qr_matrix(qr_url)
+    box_size = box_size_for(matrix, size)
+    renderer = render_qr_svg if format == "svg" else render_qr_png
+
+    async def render() -> bytes:
+        return renderer(matrix, box_size, QR_BORDER)
+
+    key = artifact_key("qr", format, qr_url, box_size, QR_BORDER)
+    artifact = await artifact_cache.get_or_create(key, render)
+
+    return artifact_response(
+        request,
+        artifact,
+        QR_FORMATS[format],
+        {
+            "Content-Disposition": f"attachment; filename=list_{listId}_qr.{format}",
+            # Regenerating the share token changes the image, so always revalidate
+            "Cache-Control": "private, no-cache",
+        },
     )
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
+
+
+@router.post("/lists/qr-sheet")
+async def export_qr_sheet(
+    payload: QrSheetRequest,
+    request: Request,
+    user: User = Depends(require_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Printable PDF with the QR codes and names of the user's shared lists.
     
-    # Convert to bytes
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="PNG")
-    img_bytes.seek(0)
+    Prints the given ``list_ids`` in that order, or every shared list owned
+    by the user sorted by name; twelve codes per A4 page. Render timings are
+    returned in the ``Server-Timing`` header.
+    """
+    lists = await load_sheet_lists(db, owner_user_id=user.id, list_ids=payload.list_ids)
+    sheet = await render_qr_sheet(lists, _base_url(request))
     
     return StreamingResponse(
-        img_bytes,
-        media_type="image/png",
-        headers={"Content-Disposition": f"attachment; filename=list_{listId}_qr.png"}
+        sheet.chunks(),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=\"qr-codes.pdf\"",
+            "ETag": sheet.artifact.etag,
+            "Server-Timing": sheet.server_timing,
+            "X-List-Count": str(sheet.list_count),
+        },
     )
@@ -14,6 +14,7 @@ from app.api import (
     pdf,
     admin_analytics,
     analytics,
+    admin_metrics,
 )
 
 api_router = APIRouter()
@@ -30,3 +31,4 @@ api_router.include_router(student.router)
 api_router.include_router(pdf.router)
 api_router.include_router(admin_analytics.router)
 api_router.include_router(analytics.router)
+api_router.include_router(admin_metrics.router)
@@ -1,16 +1,15 @@
 """Share links and public access to adjective lists."""
-from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
 from app.models.list import List as ListModel
-from app.models.user import User
 from app.models.adjective import Adjective
+from app.services.share_access import AccessVerdict, resolve_list_access
+from app.services.share_cache import SharePayload, share_cache
 
 
 router = APIRouter(prefix="/api/l", tags=["share"])
@@ -38,78 +37,7 @@ class ListShareResponse(BaseModel):
         from_attributes = True
 
 
-@router.get("/{token}")
-async def get_share_link(
-    token: str,
-    db: AsyncSession = Depends(get_session)
-):
-    """
-    Get adjectives for a shared list (for student sorting view via QR code).
-    
-    Public endpoint - validates token, list ownership, and expiry.
-    Returns list data directly (no redirect).
-    """
-    # Find list by share token
-    result = await db.execute(
-        select(ListModel).where(ListModel.share_token == token)
-    )
-    list_obj = result.scalar_one_or_none()
-    
-    if not list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Share link not found"
-        )
-    
-    # Verify share is enabled
-    if not list_obj.share_enabled:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This list is no longer shared"
-        )
-    
-    # Verify share token hasn't expired
-    if list_obj.share_expires_at and datetime.utcnow() > list_obj.share_expires_at:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Share link has expired"
-        )
-    
-    # Verify owner is active (if not standard list)
-    if not list_obj.is_default and list_obj.owner_user_id:
-        user_result = await db.execute(
-            select(User).where(User.id == list_obj.owner_user_id)
-        )
-        owner = user_result.scalar_one_or_none()
-        
-        if not owner or owner.status != "active":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Owner account is not active"
-            )
-        
-        # Verify owner's school is licensed/active
-        if owner.school_id:
-            from app.models.school import School
-            school_result = await db.execute(
-                select(School).where(School.id == owner.school_id)
-            )
-            school = school_result.scalar_one_or_none()
-            
-            if not school or school.status != "active":
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Owner's school is not active"
-                )
-    
-    # Load adjectives
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == list_obj.id, Adjective.active == True)
-        .order_by(Adjective.order_index)
-    )
-    adjectives_data = adj_result.scalars().all()
-    
+def _build_list_response(list_obj: ListModel, adjectives_data: List[Adjective]) -> ListShareResponse:
     adjectives = [
         AdjectiveResponse(
             id=adj.id,
@@ -130,6 +58,54 @@ async def get_share_link(
     )
 
 
+async def _build_share_payload(db: AsyncSession, token: str) -> SharePayload:
+    """Resolve a share token into a cacheable access verdict and serialized payload."""
+    access = await resolve_list_access(db, share_token=token)
+    
+    if access.verdict == AccessVerdict.NOT_FOUND:
+        access.raise_for_verdict()
+    
+    list_obj = access.list_obj
+    payload = SharePayload(
+        status_code=access.status_code,
+        detail=access.detail,
+        list_id=list_obj.id,
+        owner_user_id=list_obj.owner_user_id,
+        school_id=access.owner.school_id if access.owner else None,
+        share_expires_at=list_obj.share_expires_at,
+    )
+    
+    if access.allowed:
+        payload.body = _build_list_response(list_obj, access.adjectives).model_dump_json().encode("utf-8")
+    return payload
+
+
+async def _get_cached_share_payload(db: AsyncSession, token: str) -> SharePayload:
+    """Return the share payload for a token, serving repeat scans from the cache."""
+    payload = share_cache.get(token)
+    if payload is None:
+        generation = share_cache.generation
+        payload = await _build_share_payload(db, token)
+        share_cache.set(token, payload, generation=generation)
+    return payload
+
+
+@router.get("/{token}", response_model=ListShareResponse)
+async def get_share_link(
+    token: str,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get adjectives for a shared list (for student sorting view via QR code).
+    
+    Public endpoint - validates token, list ownership, and expiry.
+    Returns list data directly (no redirect). Serialized payloads are cached
+    per token and invalidated by every list, user and school write path.
+    """
+    payload = await _get_cached_share_payload(db, token)
+    return payload.to_response()
+
+
 @router.get("/{token}/data", response_model=ListShareResponse)
 async def get_share_link_data(
     token: str,
@@ -140,85 +116,8 @@ async def get_share_link_data(
     
     Public endpoint - returns list data for sorting interface.
     """
-    # Find list by share token
-    result = await db.execute(
-        select(ListModel).where(ListModel.share_token == token)
-    )
-    list_obj = result.scalar_one_or_none()
-    
-    if not list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Share link not found"
-        )
-    
-    # Verify share is enabled
-    if not list_obj.share_enabled:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This list is no longer shared"
-        )
-    
-    # Verify share token hasn't expired
-    if list_obj.share_expires_at and datetime.utcnow() > list_obj.share_expires_at:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Share link has expired"
-        )
-    
-    # Verify owner is active (if not standard list)
-    if not list_obj.is_default and list_obj.owner_user_id:
-        user_result = await db.execute(
-            select(User).where(User.id == list_obj.owner_user_id)
-        )
-        owner = user_result.scalar_one_or_none()
-        
-        if not owner or owner.status != "active":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Owner account is not active"
-            )
-        
-        # Verify owner's school is licensed/active
-        if owner.school_id:
-            from app.models.school import School
-            school_result = await db.execute(
-                select(School).where(School.id == owner.school_id)
-            )
-            school = school_result.scalar_one_or_none()
-            
-            if not school or school.status != "active":
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Owner's school is not active"
-                )
-    
-    # Load adjectives
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == list_obj.id, Adjective.active == True)
-        .order_by(Adjective.order_index)
-    )
-    adjectives_data = adj_result.scalars().all()
-    
-    adjectives = [
-        AdjectiveResponse(
-            id=adj.id,
-            word=adj.word,
-            explanation=adj.explanation,
-            example=adj.example,
-            order_index=adj.order_index,
-            active=adj.active
-        )
-        for adj in adjectives_data
-    ]
-    
-    return ListShareResponse(
-        id=list_obj.id,
-        name=list_obj.name,
-        description=list_obj.description,
-        adjectives=adjectives
-    )
+    payload = await _get_cached_share_payload(db, token)
+    return payload.to_response()
 
 
 @router.get("", response_model=ListShareResponse)
@@ -230,41 +129,12 @@ async def get_default_list(
     
     Public endpoint for accessing standard list without share token.
     """
-    # Get default list
-    result = await db.execute(
-        select(ListModel).where(ListModel.is_default == True)
-    )
-    list_obj = result.scalar_one_or_none()
+    access = await resolve_list_access(db)
     
-    if not list_obj:
+    if access.verdict == AccessVerdict.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Standard list not found"
         )
     
-    # Load adjectives
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == list_obj.id, Adjective.active == True)
-        .order_by(Adjective.order_index)
-    )
-    adjectives_data = adj_result.scalars().all()
-    
-    adjectives = [
-        AdjectiveResponse(
-            id=adj.id,
-            word=adj.word,
-            explanation=adj.explanation,
-            example=adj.example,
-            order_index=adj.order_index,
-            active=adj.active
-        )
-        for adj in adjectives_data
-    ]
-    
-    return ListShareResponse(
-        id=list_obj.id,
-        name=list_obj.name,
-        description=list_obj.description,
-        adjectives=adjectives
-    )
+    return _build_list_response(access.list_obj, access.adjectives)
@@ -4,16 +4,14 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
-from app.models.list import List as ListModel
-from app.models.adjective import Adjective
 from app.services.analytics import (
     finish_analytics_session as finish_session_service,
     start_analytics_session as start_session_service,
 )
+from app.services.share_access import ListAccess, resolve_list_access
 
 
 router = APIRouter(prefix="/api/lists", tags=["student"])
@@ -49,34 +47,8 @@ class AnalyticsSessionResponse(BaseModel):
         from_attributes = True
 
 
-@router.get("/default/adjectives", response_model=AdjectiveListResponse)
-async def get_default_list_adjectives(
-    db: AsyncSession = Depends(get_session)
-):
-    """
-    Get all adjectives from the standard/default list.
-    
-    Public endpoint for student sorting view with default list.
-    """
-    # Get default list
-    result = await db.execute(
-        select(ListModel).where(ListModel.is_default == True)
-    )
-    list_obj = result.scalar_one_or_none()
-    
-    if not list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Default list not found"
-        )
-    
-    # Load adjectives
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == list_obj.id, Adjective.active == True)
-        .order_by(Adjective.order_index)
-    )
-    adjectives_data = adj_result.scalars().all()
+def _build_adjective_list_response(access: ListAccess) -> AdjectiveListResponse:
+    list_obj = access.raise_for_verdict()
     
     adjectives = [
         AdjectiveResponse(
@@ -85,7 +57,7 @@ async def get_default_list_adjectives(
             explanation=adj.explanation,
             example=adj.example
         )
-        for adj in adjectives_data
+        for adj in access.adjectives
     ]
     
     return AdjectiveListResponse(
@@ -96,6 +68,19 @@ async def get_default_list_adjectives(
     )
 
 
+@router.get("/default/adjectives", response_model=AdjectiveListResponse)
+async def get_default_list_adjectives(
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Get all adjectives from the standard/default list.
+    
+    Public endpoint for student sorting view with default list.
+    """
+    access = await resolve_list_access(db)
+    return _build_adjective_list_response(access)
+
+
 @router.get("/{listId}/adjectives", response_model=AdjectiveListResponse)
 async def get_list_adjectives(
     listId: int,
@@ -105,73 +90,11 @@ async def get_list_adjectives(
     Get all adjectives for a specific list (public access).
     
     Used by student sorting view to retrieve adjectives.
-    Validates that list exists and is shared (for non-default lists).
+    Validates that list exists and is shared (for non-default lists),
+    and that the owner and the owner's school are active.
     """
-    # Get list
-    result = await db.execute(
-        select(ListModel).where(ListModel.id == listId)
-    )
-    list_obj = result.scalar_one_or_none()
-    
-    if not list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="List not found"
-        )
-    
-    # If not default list, verify it's shared
-    if not list_obj.is_default:
-        if not list_obj.share_enabled:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="This list is not shared"
-            )
-        
-        # Verify share token hasn't expired
-        if list_obj.share_expires_at and datetime.utcnow() > list_obj.share_expires_at:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Share link has expired"
-            )
-        
-        # Verify owner is active
-        if list_obj.owner_user_id:
-            from app.models.user import User
-            user_result = await db.execute(
-                select(User).where(User.id == list_obj.owner_user_id)
-            )
-            owner = user_result.scalar_one_or_none()
-            
-            if not owner or owner.status != "active":
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Owner account is not active"
-                )
-    
-    # Load adjectives
-    adj_result = await db.execute(
-        select(Adjective)
-        .where(Adjective.list_id == list_obj.id, Adjective.active == True)
-        .order_by(Adjective.order_index)
-    )
-    adjectives_data = adj_result.scalars().all()
-    
-    adjectives = [
-        AdjectiveResponse(
-            id=adj.id,
-            word=adj.word,
-            explanation=adj.explanation,
-            example=adj.example
-        )
-        for adj in adjectives_data
-    ]
-    
-    return AdjectiveListResponse(
-        list_id=list_obj.id,
-        list_name=list_obj.name,
-        list_description=list_obj.description,
-        adjectives=adjectives
-    )
+    access = await resolve_list_access(db, list_id=listId)
+    return _build_adjective_list_response(access)
 
 
 @router.post("/{listId}/session", response_model=AnalyticsSessionResponse)
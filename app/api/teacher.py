@@ -1,15 +1,18 @@
 """Teacher (Lehrkraft) user management endpoints."""
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, false, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.db.session import get_session
 from app.models.user import User
 from app.models.school import School
 from app.models.list import List as ListModel
 from app.api.deps import require_user
+from app.core.principal_cache import principal_cache
 
 
 router = APIRouter(prefix="/user", tags=["teacher"])
@@ -68,10 +71,7 @@ async def get_profile(
 ):
     """Get current user profile."""
     # Load school info
-    school_result = await db.execute(
-        select(School).where(School.id == user.school_id)
-    )
-    school = school_result.scalar_one_or_none()
+    school = await db.get(School, user.school_id)
     
     school_info = SchoolInfo(
         id=school.id,
@@ -96,19 +96,20 @@ async def update_profile(
     db: AsyncSession = Depends(get_session)
 ):
     """Update user profile (password change)."""
-    from app.core.security import verify_password, get_password_hash
+    from app.core.security import verify_password_async, hash_password_async
     
     # Verify current password
-    if not verify_password(request.current_password, user.password_hash):
+    if not await verify_password_async(request.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Update password
-    user.password_hash = get_password_hash(request.new_password)
+    user.password_hash = await hash_password_async(request.new_password)
     db.add(user)
     await db.commit()
+    principal_cache.invalidate_user(user.id)
     
     return {"message": "Password updated successfully"}
 
@@ -119,10 +120,7 @@ async def get_user_schools(
     db: AsyncSession = Depends(get_session)
 ):
     """Get user's school information."""
-    school_result = await db.execute(
-        select(School).where(School.id == user.school_id)
-    )
-    school = school_result.scalar_one_or_none()
+    school = await db.get(School, user.school_id)
     
     if not school:
         raise HTTPException(
@@ -148,131 +146,86 @@ async def get_user_lists(
     """
     Get all lists for the user:
     - Standard list (always included)
+    - Premium lists
     - User's own custom lists
-    - Lists shared with user's school
+    - Lists shared with user's school (by teachers of the same school)
+
+    Everything is loaded with one query: adjective counts are maintained
+    on the list rows and owner emails come from a join.
     """
-    lists = []
-    
-    # 1. Add standard list
-    standard_result = await db.execute(
-        select(ListModel).where(ListModel.is_default == True)
-    )
-    standard_list = standard_result.scalar_one_or_none()
-    
-    from app.models.adjective import Adjective
-    
-    if standard_list:
-        adj_count_result = await db.execute(
-            select(Adjective).where(Adjective.list_id == standard_list.id)
+    owner = aliased(User)
+
+    shared_with_school = and_(
+        ListModel.share_with_school == True,  # noqa: E712
+        ListModel.owner_user_id != user.id,  # Don't include own lists again
+        ListModel.is_default == False,  # noqa: E712
+        ListModel.is_premium == False,  # noqa: E712  # Don't include premium lists again
+        owner.school_id == user.school_id,
+    ) if user.school_id is not None else false()
+
+    result = await db.execute(
+        select(ListModel, ListModel.adjective_count, owner.email)
+        .outerjoin(owner, owner.id == ListModel.owner_user_id)
+        .where(
+            or_(
+                ListModel.is_default == True,  # noqa: E712
+                ListModel.is_premium == True,  # noqa: E712
+                and_(ListModel.owner_user_id == user.id, ListModel.is_default == False),  # noqa: E712
+                shared_with_school,
+            )
         )
-        adj_count = len(adj_count_result.scalars().all())
-        
-        lists.append(ListSummary(
-            id=standard_list.id,
-            name=standard_list.name,
-            slug=standard_list.slug,
-            description=standard_list.description,
-            is_default=True,
-            is_premium=False,
+    )
+    rows = result.all()
+
+    def summary(list_obj: ListModel, adj_count: int, **fields) -> ListSummary:
+        return ListSummary(
+            id=list_obj.id,
+            name=list_obj.name,
+            slug=list_obj.slug,
+            description=list_obj.description,
             adjective_count=adj_count,
-            owner_email=None,
-            share_token=None,
-            share_with_school=False,
-            created_at=standard_list.created_at.isoformat() if standard_list.created_at else ""
+            created_at=list_obj.created_at.isoformat() if list_obj.created_at else "",
+            **fields,
+        )
+
+    def newest_first(row) -> tuple:
+        return (row[0].created_at is not None, row[0].created_at or datetime.min)
+
+    lists = []
+
+    # 1. Add standard list
+    standard = next((row for row in rows if row[0].is_default), None)
+    if standard:
+        lists.append(summary(
+            standard[0], standard[1], is_default=True, is_premium=False,
+            owner_email=None, share_token=None, share_with_school=False,
         ))
-    
+
     # 2. Add premium lists (available to all registered users)
-    premium_lists_result = await db.execute(
-        select(ListModel).where(ListModel.is_premium == True)  # noqa: E712
-        .order_by(ListModel.name)
-    )
-    premium_lists = premium_lists_result.scalars().all()
-    
-    for premium_list in premium_lists:
-        adj_count_result = await db.execute(
-            select(Adjective).where(Adjective.list_id == premium_list.id)
-        )
-        adj_count = len(adj_count_result.scalars().all())
-        
-        lists.append(ListSummary(
-            id=premium_list.id,
-            name=premium_list.name,
-            slug=premium_list.slug,
-            description=premium_list.description,
-            is_default=False,
-            is_premium=True,
-            adjective_count=adj_count,
-            owner_email=None,
-            share_token=premium_list.share_token,
-            share_with_school=False,
-            created_at=premium_list.created_at.isoformat() if premium_list.created_at else ""
+    for list_obj, adj_count, _ in sorted((row for row in rows if row[0].is_premium), key=lambda row: row[0].name):
+        lists.append(summary(
+            list_obj, adj_count, is_default=False, is_premium=True,
+            owner_email=None, share_token=list_obj.share_token, share_with_school=False,
         ))
-    
+
     # 3. Add user's own custom lists
-    own_lists_result = await db.execute(
-        select(ListModel).where(
-            and_(ListModel.owner_user_id == user.id, ListModel.is_default == False)  # noqa: E712
-        ).order_by(ListModel.created_at.desc())
-    )
-    own_lists = own_lists_result.scalars().all()
-    
-    for own_list in own_lists:
-        adj_count_result = await db.execute(
-            select(Adjective).where(Adjective.list_id == own_list.id)
-        )
-        adj_count = len(adj_count_result.scalars().all())
-        
-        lists.append(ListSummary(
-            id=own_list.id,
-            name=own_list.name,
-            slug=own_list.slug,
-            description=own_list.description,
-            is_default=False,
-            is_premium=False,
-            adjective_count=adj_count,
-            owner_email=user.email,
-            share_token=own_list.share_token,
-            share_with_school=own_list.share_with_school,
-            created_at=own_list.created_at.isoformat() if own_list.created_at else ""
+    own_rows = [row for row in rows if row[0].owner_user_id == user.id and not row[0].is_default]
+    for list_obj, adj_count, _ in sorted(own_rows, key=newest_first, reverse=True):
+        lists.append(summary(
+            list_obj, adj_count, is_default=False, is_premium=False,
+            owner_email=user.email, share_token=list_obj.share_token, share_with_school=list_obj.share_with_school,
         ))
-    
+
     # 4. Add lists shared with user's school
-    shared_lists_result = await db.execute(
-        select(ListModel).where(
-            and_(
-                ListModel.share_with_school == True,  # noqa: E712
-                ListModel.owner_user_id != user.id,  # Don't include own lists again
-                ListModel.is_default == False,  # noqa: E712
-                ListModel.is_premium == False  # noqa: E712  # Don't include premium lists again
-            )
-        ).order_by(ListModel.created_at.desc())
-    )
-    shared_lists = shared_lists_result.scalars().all()
-    
-    for shared_list in shared_lists:
-        # Get owner info
-        owner_result = await db.execute(
-            select(User).where(User.id == shared_list.owner_user_id)
-        )
-        owner = owner_result.scalar_one_or_none()
-        
-        adj_count_result = await db.execute(
-            select(Adjective).where(Adjective.list_id == shared_list.id)
-        )
-        adj_count = len(adj_count_result.scalars().all())
-        
-        lists.append(ListSummary(
-            id=shared_list.id,
-            name=shared_list.name,
-            slug=shared_list.slug,
-            description=shared_list.description,
-            is_default=False,
-            is_premium=False,
-            adjective_count=adj_count,
-            owner_email=owner.email if owner else None,
-            share_token=shared_list.share_token,
-            share_with_school=shared_list.share_with_school,
-            created_at=shared_list.created_at.isoformat() if shared_list.created_at else ""
+    shared_rows = [
+        row for row in rows
+        if row[0].share_with_school and row[0].owner_user_id != user.id
+        and not row[0].is_default and not row[0].is_premium
+    ]
+    for list_obj, adj_count, owner_email in sorted(shared_rows, key=newest_first, reverse=True):
+        lists.append(summary(
+            list_obj, adj_count, is_default=False, is_premium=False,
+            owner_email=owner_email, share_token=list_obj.share_token, share_with_school=list_obj.share_with_school,
         ))
-    
+
     return lists
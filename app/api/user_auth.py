@@ -7,7 +7,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
-from app.core.security import get_password_hash, verify_password
+from app.core.security import hash_password_async, password_needs_rehash, verify_password_async
 from app.core.sessions import session_store
 from app.models.user import User
 from app.models.school import School
@@ -89,7 +89,7 @@ async def user_register(
             school_id = new_school.id
     
     # Create new user with pending status
-    password_hash = get_password_hash(registration.password)
+    password_hash = await hash_password_async(registration.password)
     
     new_user = User(
         email=registration.email,
@@ -132,14 +132,19 @@ async def user_login(
     )
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Upgrade hashes made with outdated Argon2 parameters
+    login_values = {"last_login_at": datetime.utcnow()}
+    if password_needs_rehash(user.password_hash):
+        login_values["password_hash"] = await hash_password_async(credentials.password)
+    
     # Create session
-    session_token = session_store.create_session(
+    session_token = await session_store.create_session_async(
         user_id=user.id,
         user_type="user"
     )
@@ -148,7 +153,7 @@ async def user_login(
     await db.execute(
         update(User)
         .where(User.id == user.id)
-        .values(last_login_at=datetime.utcnow())
+        .values(**login_values)
     )
     await db.commit()
     
@@ -177,7 +182,7 @@ async def user_logout(
 ):
     """User logout endpoint."""
     if session_token:
-        session_store.delete_session(session_token)
+        await session_store.delete_session_async(session_token)
     
     # Clear cookie
     response.delete_cookie(key="vielseitig_session")
@@ -192,10 +197,7 @@ async def get_user_profile(
 ):
     """Get current user profile."""
     # Load school information
-    result = await db.execute(
-        select(School).where(School.id == user.school_id)
-    )
-    school = result.scalar_one_or_none()
+    school = await db.get(School, user.school_id)
     
     return {
         "id": user.id,
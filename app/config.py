@@ -10,8 +10,65 @@ class Settings(BaseSettings):
     environment: str = "development"
     debug: bool = True
     database_url: str = "sqlite+aiosqlite:///./data/vielseitig.db"
+
+    # SQLite performance profile, applied to every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size: int = -20000  # negative = KiB, i.e. ~20 MB page cache
+    sqlite_mmap_size: int = 268435456  # 256 MB
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_wal_checkpoint_interval_seconds: int = 300  # 0 disables the periodic checkpoint
     secret_key: str = "change-me"
+
+    # Argon2 password hashing; hashes made with other parameters are upgraded on login
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 4
+    password_hash_workers: int = 2  # concurrent hashes, further logins queue
     session_expiry_days: int = 2
+
+    # Session storage: "memory" (single worker) or "database" (shared across workers)
+    session_backend: str = "memory"
+    session_cache_size: int = 10000
+    session_cache_ttl_seconds: int = 5  # database backend; logouts reach other workers after at most this long
+    session_activity_flush_seconds: int = 60
+    session_max_sessions: int = 50000  # memory backend; least recently used sessions are evicted
+    session_sweep_interval_seconds: int = 60  # 0 disables the expired-session sweeper
+
+    # Authenticated principal cache (user + school snapshot per session token)
+    principal_cache_max_entries: int = 10000
+    principal_cache_ttl_seconds: int = 30
+
+    # Share-link payload cache (public /api/l/{token} endpoints)
+    share_cache_max_entries: int = 1024
+    share_cache_ttl_seconds: int = 300
+
+    # Premium catalog body cache; invalidated when premium lists are seeded
+    premium_catalog_ttl_seconds: int = 300
+
+    # Analytics write-behind (opt-in): events are queued and written in bulk by one task
+    analytics_write_behind: bool = False
+    analytics_queue_max_size: int = 10000
+    analytics_flush_interval_seconds: float = 1.0
+    analytics_flush_max_batch: int = 500
+    analytics_enqueue_timeout_seconds: float = 2.0
+
+    # PDF rendering: "process" renders on a worker pool, "inline" in the request (tests)
+    pdf_render_mode: str = "process"
+    pdf_render_workers: int = 2
+    pdf_max_pending_jobs: int = 32
+    pdf_render_timeout_seconds: float = 30.0
+    pdf_job_result_ttl_seconds: int = 300
+    pdf_snapshot_max_bytes: int = 10 * 1024 * 1024
+    pdf_snapshot_max_dpi: int = 150  # snapshots are downscaled to this resolution on the page
+    pdf_snapshot_max_pixels: int = 25_000_000  # checked from the image header, before decoding
+
+    # Rendered QR/PDF artifacts, keyed by a hash of their inputs ("" disables the disk tier)
+    artifact_cache_dir: str = "./data/artifacts"
+    artifact_cache_memory_bytes: int = 32 * 1024 * 1024
+    artifact_cache_disk_bytes: int = 512 * 1024 * 1024
+    artifact_cache_disk_max_age_seconds: int = 7 * 24 * 3600  # unused files are removed; 0 keeps them
     
     # Twilio SMS configuration (optional)
     twilio_account_sid: str = ""
@@ -0,0 +1,149 @@
+"""Short-lived cache of authenticated principals keyed by session token."""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.models.base import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def snapshot(obj: Optional[Base]) -> Optional[Dict[str, Any]]:
+    """Copy the column values of a loaded ORM object."""
+    if obj is None:
+        return None
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+async def attach(db: AsyncSession, model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """
+    Rebuild an ORM object from a snapshot and attach it to ``db`` without a query.
+
+    The object enters the session's identity map as if it had just been loaded,
+    so ``db.get`` and many-to-one lazy loads for it are answered locally and
+    changes made to it are flushed normally.
+    """
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return await db.merge(obj, load=False)
+
+
+@dataclass
+class Principal:
+    """Column snapshot of a logged-in user (with their school) or admin."""
+
+    user_type: str
+    principal_id: int
+    values: Dict[str, Any]
+    school_id: Optional[int] = None
+    school_values: Optional[Dict[str, Any]] = None
+    cached_at: float = 0.0
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of principals keyed by session token.
+
+    Entries expire after a short TTL and are dropped explicitly when an admin
+    changes a user's status, school or password, or a school's status.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Principal]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation; guards against caching stale reads."""
+        return self._generation
+
+    def get(self, token: str, user_type: str) -> Optional[Principal]:
+        """Return the cached principal for a token, or None on a miss."""
+        principal = self._entries.get(token)
+        if principal is None or time.monotonic() - principal.cached_at > self.ttl_seconds:
+            if principal is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+        if principal.user_type != user_type:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return principal
+
+    def set(self, token: str, principal: Principal, generation: Optional[int] = None) -> None:
+        """Store a principal unless an invalidation happened since ``generation`` was read."""
+        if generation is not None and generation != self._generation:
+            return
+
+        principal.cached_at = time.monotonic()
+        self._entries[token] = principal
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _invalidate_where(self, predicate) -> int:
+        self._generation += 1
+        self.invalidations += 1
+        stale = [token for token, principal in self._entries.items() if predicate(principal)]
+        for token in stale:
+            del self._entries[token]
+        return len(stale)
+
+    def invalidate_token(self, token: Optional[str]) -> None:
+        """Drop the entry for a single session token."""
+        self._generation += 1
+        self.invalidations += 1
+        if token:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: Optional[int]) -> int:
+        """Drop every session of a user (status, school or password changed)."""
+        return self._invalidate_where(lambda p: p.user_type == "user" and p.principal_id == user_id)
+
+    def invalidate_school(self, school_id: Optional[int]) -> int:
+        """Drop every session of users in a school (school changed)."""
+        return self._invalidate_where(lambda p: p.school_id is not None and p.school_id == school_id)
+
+    def invalidate_admin(self, admin_id: Optional[int]) -> int:
+        """Drop every session of an admin."""
+        return self._invalidate_where(lambda p: p.user_type == "admin" and p.principal_id == admin_id)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_settings = get_settings()
+principal_cache = PrincipalCache(
+    max_entries=_settings.principal_cache_max_entries,
+    ttl_seconds=_settings.principal_cache_ttl_seconds,
+)
@@ -1,7 +1,19 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+
+from app.config import get_settings
 
-ph = PasswordHasher()
+_settings = get_settings()
+ph = PasswordHasher(
+    time_cost=_settings.argon2_time_cost,
+    memory_cost=_settings.argon2_memory_cost_kib,
+    parallelism=_settings.argon2_parallelism,
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -16,3 +28,91 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return True
     except VerifyMismatchError:
         return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if a hash was made with different Argon2 parameters than configured."""
+    try:
+        return ph.check_needs_rehash(hashed_password)
+    except (InvalidHashError, VerificationError):
+        return False
+
+
+class PasswordHashingPool:
+    """
+    Dedicated thread pool for Argon2 work.
+
+    argon2-cffi releases the GIL while hashing, so a few threads keep the
+    event loop free for other requests. ``max_workers`` caps how many hashes
+    run at once; further calls wait in the pool's queue.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self._total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._total_run_ms = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="argon2")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool and record queue wait and run time."""
+        def timed() -> Tuple[Any, float, float]:
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        submitted = time.perf_counter()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self.executor, timed)
+        finally:
+            self.in_flight -= 1
+
+        wait_ms = (started - submitted) * 1000
+        self.completed += 1
+        self._total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self._total_run_ms += (finished - started) * 1000
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return concurrency and queueing metrics."""
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.max_workers, 0),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "avg_wait_ms": round(self._total_wait_ms / self.completed, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "avg_run_ms": round(self._total_run_ms / self.completed, 2) if self.completed else 0.0,
+        }
+
+
+password_pool = PasswordHashingPool(max_workers=_settings.password_hash_workers)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the Argon2 worker pool."""
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the Argon2 worker pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
@@ -1,81 +1,544 @@
 """Session management for admin and user authentication."""
+import asyncio
+import hashlib
+import heapq
+import json
+import logging
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from sqlalchemy import select
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List as ListType
+from typing import Optional, Dict, Any, Tuple
+from sqlalchemy import bindparam, create_engine, delete, event, select, update
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.config import get_settings
+from app.db.session import apply_sqlite_pragmas
+from app.core.principal_cache import Principal, attach, principal_cache, snapshot
 from app.models.admin import Admin
+from app.models.auth_session import AuthSession
+from app.models.school import School
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
+
+class SessionRecord:
+    """
+    Compact session record.
+
+    Timestamps are kept as UTC epoch seconds so the sliding expiry is two
+    float assignments per request. Item access (``session["user_id"]``) is
+    supported for callers written against the old dict records.
+    """
+
+    __slots__ = ("user_id", "user_type", "created_ts", "last_activity_ts", "expires_ts", "_data")
+
+    def __init__(
+        self,
+        user_id: int,
+        user_type: str,
+        created_ts: float,
+        last_activity_ts: float,
+        expires_ts: float,
+        data: Optional[Dict[str, Any]] = None,
+    ):
+        self.user_id = user_id
+        self.user_type = user_type
+        self.created_ts = created_ts
+        self.last_activity_ts = last_activity_ts
+        self.expires_ts = expires_ts
+        self._data = data or None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = {}
+        return self._data
+
+    @property
+    def created_at(self) -> datetime:
+        return _to_datetime(self.created_ts)
+
+    @property
+    def last_activity(self) -> datetime:
+        return _to_datetime(self.last_activity_ts)
+
+    @property
+    def expires_at(self) -> datetime:
+        return _to_datetime(self.expires_ts)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def _to_datetime(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class SessionBackend(ABC):
+    """Storage for session records keyed by session token."""
+
+    # Persistent backends are fronted by a local read-through cache
+    persistent = False
+
+    @abstractmethod
+    def load(self, token: str) -> Optional[SessionRecord]:
+        """Return the stored session record or None."""
+
+    @abstractmethod
+    def save(self, token: str, session: SessionRecord) -> None:
+        """Store a new session record."""
+
+    @abstractmethod
+    def delete(self, token: str) -> bool:
+        """Delete a session. Returns True if it existed."""
+
+    @abstractmethod
+    def touch_many(self, sessions: Dict[str, SessionRecord]) -> None:
+        """Persist last activity and expiry for many sessions at once."""
+
+    @abstractmethod
+    def delete_expired(self, now: float) -> int:
+        """Remove sessions expired at ``now`` (epoch seconds) and return how many."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemorySessionBackend(SessionBackend):
+    """
+    Process-local session storage (single worker, lost on restart).
+
+    Sessions are kept in LRU order and capped at ``max_sessions``. Expiry is
+    tracked in a min-heap with one entry per session; since the sliding window
+    only ever moves expiry later, stale heap entries are re-pushed with the
+    current expiry when they surface instead of being updated on every request.
+    """
+
+    def __init__(self, max_sessions: int = 50000):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._expiry_heap: ListType[Tuple[float, str]] = []
+        self.evicted = 0
+
+    def load(self, token: str) -> Optional[SessionRecord]:
+        session = self._sessions.get(token)
+        if session is not None:
+            self._sessions.move_to_end(token)
+        return session
+
+    def save(self, token: str, session: SessionRecord) -> None:
+        self._sessions[token] = session
+        heapq.heappush(self._expiry_heap, (session.expires_ts, token))
+        while len(self._sessions) > self.max_sessions:
+            # Evict the least recently used session; its heap entry goes stale
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def delete(self, token: str) -> bool:
+        return self._sessions.pop(token, None) is not None
+
+    def touch_many(self, sessions: Dict[str, SessionRecord]) -> None:
+        # Records are shared with the store, so activity is already up to date
+        pass
+
+    def delete_expired(self, now: float) -> int:
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, token = heapq.heappop(heap)
+            session = self._sessions.get(token)
+            if session is None:
+                continue  # deleted or evicted
+            if session.expires_ts <= now:
+                del self._sessions[token]
+                removed += 1
+            else:
+                heapq.heappush(heap, (session.expires_ts, token))
+
+        # Drop stale entries of deleted sessions once they dominate the heap
+        if len(heap) > 2 * len(self._sessions) + 1024:
+            self._expiry_heap = [(session.expires_ts, token) for token, session in self._sessions.items()]
+            heapq.heapify(self._expiry_heap)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        sessions = len(self._sessions)
+        approx_bytes = sys.getsizeof(self._sessions) + sys.getsizeof(self._expiry_heap)
+        if sessions:
+            token, session = next(iter(self._sessions.items()))
+            per_session = sys.getsizeof(token) + sys.getsizeof(session) + sys.getsizeof((0.0, token)) + 8
+            approx_bytes += sessions * per_session
+        return {
+            "sessions": sessions,
+            "max_sessions": self.max_sessions,
+            "heap_entries": len(self._expiry_heap),
+            "evicted": self.evicted,
+            "approx_memory_bytes": approx_bytes,
+        }
+
+
+class DatabaseSessionBackend(SessionBackend):
+    """
+    Session storage in the ``auth_sessions`` table, shared by all workers.
+
+    Uses a small synchronous engine with the same SQLite pragmas as the app
+    engine. ``SessionStore``'s async methods call it in a worker thread, so a
+    busy database never blocks the event loop. Tokens are stored as SHA-256
+    hashes.
+    """
+
+    persistent = True
+
+    def __init__(self, database_url: str):
+        self.database_url = database_url.replace("+aiosqlite", "")
+        self._engine: Optional[Engine] = None
+
+    @property
+    def engine(self) -> Engine:
+        # Created lazily so every worker process opens its own connections
+        if self._engine is None:
+            self._engine = create_engine(self.database_url, future=True)
+            if self._engine.url.get_backend_name() == "sqlite":
+                event.listen(self._engine, "connect", apply_sqlite_pragmas)
+        return self._engine
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def load(self, token: str) -> Optional[SessionRecord]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(AuthSession.__table__).where(AuthSession.token_hash == self._hash(token))
+            ).mappings().one_or_none()
+        if row is None:
+            return None
+        return SessionRecord(
+            user_id=row["user_id"],
+            user_type=row["user_type"],
+            created_ts=_to_timestamp(row["created_at"]),
+            last_activity_ts=_to_timestamp(row["last_activity"]),
+            expires_ts=_to_timestamp(row["expires_at"]),
+            data=json.loads(row["data"]) if row["data"] else None,
+        )
+
+    def save(self, token: str, session: SessionRecord) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                AuthSession.__table__.insert().values(
+                    token_hash=self._hash(token),
+                    user_id=session.user_id,
+                    user_type=session.user_type,
+                    created_at=session.created_at,
+                    last_activity=session.last_activity,
+                    expires_at=session.expires_at,
+                    data=json.dumps(session.data) if session.data else None,
+                )
+            )
+
+    def delete(self, token: str) -> bool:
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(AuthSession).where(AuthSession.token_hash == self._hash(token)))
+        return result.rowcount > 0
+
+    def touch_many(self, sessions: Dict[str, SessionRecord]) -> None:
+        if not sessions:
+            return
+        table = AuthSession.__table__
+        stmt = (
+            update(table)
+            .where(table.c.token_hash == bindparam("b_token_hash"))
+            .values(last_activity=bindparam("b_last_activity"), expires_at=bindparam("b_expires_at"))
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                stmt,
+                [
+                    {
+                        "b_token_hash": self._hash(token),
+                        "b_last_activity": session.last_activity,
+                        "b_expires_at": session.expires_at,
+                    }
+                    for token, session in sessions.items()
+                ],
+            )
+
+    def delete_expired(self, now: float) -> int:
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(AuthSession).where(AuthSession.expires_at < _to_datetime(now)))
+        return result.rowcount
+
 
 class SessionStore:
-    """In-memory session store with expiration handling."""
-    
-    def __init__(self):
-        self._sessions: Dict[str, Dict[str, Any]] = {}
-    
+    """
+    Session store with expiration handling on top of a pluggable backend.
+
+    Persistent backends get a local read-through LRU and batched
+    ``last_activity`` writes instead of one write per request. A logout on one
+    worker reaches the other workers' caches only once their entry is older
+    than ``cache_ttl_seconds``, so keep that short.
+
+    The ``*_async`` methods are what the app uses: they run persistent backend
+    calls in a thread. The synchronous methods call the backend directly.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SessionBackend] = None,
+        *,
+        expiry: timedelta = timedelta(days=2),
+        cache_size: int = 10000,
+        cache_ttl_seconds: float = 5,
+    ):
+        self.backend = backend or InMemorySessionBackend()
+        self.expiry = expiry
+        self.expiry_seconds = expiry.total_seconds()
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cache: "OrderedDict[str, Tuple[SessionRecord, float]]" = OrderedDict()
+        self._dirty: Dict[str, SessionRecord] = {}
+
+        self.sweeps = 0
+        self.expired_removed = 0
+        self.last_sweep_ms = 0.0
+        self.max_sweep_ms = 0.0
+
+    def _cache_put(self, token: str, session: SessionRecord) -> None:
+        if not self.backend.persistent:
+            return
+        self._cache[token] = (session, time.monotonic())
+        self._cache.move_to_end(token)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_get(self, token: str) -> Optional[SessionRecord]:
+        entry = self._cache.get(token)
+        if entry is None:
+            return None
+        session, cached_at = entry
+        if time.monotonic() - cached_at > self.cache_ttl_seconds:
+            del self._cache[token]
+            return None
+        self._cache.move_to_end(token)
+        return session
+
+    async def _call(self, method, *args):
+        """Run a backend method, in a thread when it does database I/O."""
+        if self.backend.persistent:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    def _new_session(
+        self, user_id: int, user_type: str, session_data: Optional[Dict[str, Any]]
+    ) -> Tuple[str, SessionRecord]:
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+
+        # Session timeout: sliding window of inactivity
+        session = SessionRecord(
+            user_id=user_id,
+            user_type=user_type,
+            created_ts=now,
+            last_activity_ts=now,
+            expires_ts=now + self.expiry_seconds,
+            data=session_data,
+        )
+        return token, session
+
+    def _touch(self, token: str, session: SessionRecord) -> SessionRecord:
+        # Update last activity (sliding window)
+        now = time.time()
+        session.last_activity_ts = now
+        session.expires_ts = now + self.expiry_seconds
+        if self.backend.persistent:
+            self._dirty[token] = session
+        return session
+
+    def _forget(self, token: str) -> None:
+        principal_cache.invalidate_token(token)
+        self._cache.pop(token, None)
+        self._dirty.pop(token, None)
+
+    def _evict_expired_cache(self, now: float) -> None:
+        for token in [token for token, (session, _) in self._cache.items() if now > session.expires_ts]:
+            del self._cache[token]
+
+    def _record_sweep(self, started: float, removed: int) -> int:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.sweeps += 1
+        self.expired_removed += removed
+        self.last_sweep_ms = elapsed_ms
+        self.max_sweep_ms = max(self.max_sweep_ms, elapsed_ms)
+        return removed
+
     def create_session(
-        self, 
-        user_id: int, 
+        self,
+        user_id: int,
         user_type: str,  # 'admin' or 'user'
         session_data: Optional[Dict[str, Any]] = None
     ) -> str:
         """Create a new session and return session token."""
-        token = secrets.token_urlsafe(32)
-        
-        # Session timeout: 2 days of inactivity (sliding window)
-        expires_at = datetime.utcnow() + timedelta(days=2)
-        
-        self._sessions[token] = {
-            "user_id": user_id,
-            "user_type": user_type,
-            "created_at": datetime.utcnow(),
-            "last_activity": datetime.utcnow(),
-            "expires_at": expires_at,
-            "data": session_data or {}
-        }
-        
+        token, session = self._new_session(user_id, user_type, session_data)
+        self.backend.save(token, session)
+        self._cache_put(token, session)
+        return token
+
+    async def create_session_async(
+        self,
+        user_id: int,
+        user_type: str,
+        session_data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Create a new session without blocking the event loop."""
+        token, session = self._new_session(user_id, user_type, session_data)
+        await self._call(self.backend.save, token, session)
+        self._cache_put(token, session)
         return token
-    
-    def get_session(self, token: str) -> Optional[Dict[str, Any]]:
+
+    def get_session(self, token: str) -> Optional[SessionRecord]:
         """Get session data if valid and not expired."""
-        if token not in self._sessions:
-            return None
-        
-        session = self._sessions[token]
-        
+        session = self._cache_get(token)
+        if session is None:
+            session = self.backend.load(token)
+            if session is None:
+                return None
+            self._cache_put(token, session)
+
         # Check expiration
-        if datetime.utcnow() > session["expires_at"]:
-            del self._sessions[token]
+        if time.time() > session.expires_ts:
+            self.delete_session(token)
             return None
-        
-        # Update last activity (sliding window)
-        session["last_activity"] = datetime.utcnow()
-        session["expires_at"] = datetime.utcnow() + timedelta(days=2)
-        
-        return session
-    
+        return self._touch(token, session)
+
+    async def get_session_async(self, token: str) -> Optional[SessionRecord]:
+        """Get session data if valid; only cache misses reach the backend."""
+        session = self._cache_get(token)
+        if session is None:
+            session = await self._call(self.backend.load, token)
+            if session is None:
+                return None
+            self._cache_put(token, session)
+
+        if time.time() > session.expires_ts:
+            await self.delete_session_async(token)
+            return None
+        return self._touch(token, session)
+
     def delete_session(self, token: str) -> bool:
         """Delete a session. Returns True if session existed."""
-        if token in self._sessions:
-            del self._sessions[token]
-            return True
-        return False
-    
-    def cleanup_expired(self):
+        self._forget(token)
+        return self.backend.delete(token)
+
+    async def delete_session_async(self, token: str) -> bool:
+        """Delete a session without blocking the event loop."""
+        self._forget(token)
+        return await self._call(self.backend.delete, token)
+
+    def flush_activity(self) -> int:
+        """Write batched last_activity updates to the backend."""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, {}
+        self.backend.touch_many(dirty)
+        return len(dirty)
+
+    async def flush_activity_async(self) -> int:
+        """Write batched last_activity updates without blocking the event loop."""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, {}
+        await self._call(self.backend.touch_many, dirty)
+        return len(dirty)
+
+    def cleanup_expired(self) -> int:
         """Remove expired sessions."""
-        now = datetime.utcnow()
-        expired = [
-            token for token, session in self._sessions.items()
-            if now > session["expires_at"]
-        ]
-        for token in expired:
-            del self._sessions[token]
+        started = time.perf_counter()
+        now = time.time()
+        self._evict_expired_cache(now)
+        return self._record_sweep(started, self.backend.delete_expired(now))
+
+    async def cleanup_expired_async(self) -> int:
+        """Remove expired sessions without blocking the event loop."""
+        started = time.perf_counter()
+        now = time.time()
+        self._evict_expired_cache(now)
+        return self._record_sweep(started, await self._call(self.backend.delete_expired, now))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return session counts, memory estimate and sweep timings."""
+        return {
+            "backend": type(self.backend).__name__,
+            **self.backend.stats(),
+            "cached": len(self._cache),
+            "pending_activity": len(self._dirty),
+            "sweeps": self.sweeps,
+            "expired_removed": self.expired_removed,
+            "last_sweep_ms": round(self.last_sweep_ms, 3),
+            "max_sweep_ms": round(self.max_sweep_ms, 3),
+        }
+
+
+def _build_session_store() -> SessionStore:
+    settings = get_settings()
+    backend_name = settings.session_backend.lower()
+    if backend_name == "database":
+        backend: SessionBackend = DatabaseSessionBackend(settings.database_url)
+    elif backend_name == "memory":
+        backend = InMemorySessionBackend(max_sessions=settings.session_max_sessions)
+    else:
+        raise ValueError(f"Unknown session backend {settings.session_backend!r}, expected 'memory' or 'database'")
+
+    return SessionStore(
+        backend,
+        expiry=timedelta(days=settings.session_expiry_days),
+        cache_size=settings.session_cache_size,
+        cache_ttl_seconds=settings.session_cache_ttl_seconds,
+    )
 
 
 # Global session store instance
-session_store = SessionStore()
+session_store = _build_session_store()
+
+
+async def run_session_activity_flush(interval_seconds: float) -> None:
+    """Periodically persist batched session activity (database backend)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await session_store.flush_activity_async()
+        except Exception:
+            logger.exception("Failed to flush session activity")
+
+
+async def run_session_sweeper(interval_seconds: float) -> None:
+    """Periodically remove expired sessions."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = await session_store.cleanup_expired_async()
+        except Exception:
+            logger.exception("Failed to sweep expired sessions")
+        else:
+            if removed:
+                logger.info("Removed %s expired sessions", removed)
 
 
 async def get_current_admin(
@@ -85,16 +548,27 @@ async def get_current_admin(
     """Get current admin from session token."""
     if not session_token:
         return None
-    
-    session = session_store.get_session(session_token)
+
+    session = await session_store.get_session_async(session_token)
     if not session or session["user_type"] != "admin":
         return None
-    
+
+    cached = principal_cache.get(session_token, "admin")
+    if cached:
+        return await attach(db, Admin, cached.values)
+
+    generation = principal_cache.generation
     result = await db.execute(
         select(Admin).where(Admin.id == session["user_id"])
     )
     admin = result.scalar_one_or_none()
-    
+
+    if admin:
+        principal_cache.set(
+            session_token,
+            Principal(user_type="admin", principal_id=admin.id, values=snapshot(admin)),
+            generation,
+        )
     return admin
 
 
@@ -102,17 +576,43 @@ async def get_current_user(
     session_token: Optional[str],
     db: AsyncSession
 ) -> Optional[User]:
-    """Get current user from session token."""
+    """
+    Get current user from session token.
+
+    The user's school is loaded alongside and cached with it, so
+    ``db.get(School, user.school_id)`` needs no query afterwards.
+    """
     if not session_token:
         return None
-    
-    session = session_store.get_session(session_token)
+
+    session = await session_store.get_session_async(session_token)
     if not session or session["user_type"] != "user":
         return None
-    
+
+    cached = principal_cache.get(session_token, "user")
+    if cached:
+        user = await attach(db, User, cached.values)
+        if cached.school_values:
+            # Also keeps the school referenced, the identity map itself is weak
+            set_committed_value(user, "school", await attach(db, School, cached.school_values))
+        return user
+
+    generation = principal_cache.generation
     result = await db.execute(
-        select(User).where(User.id == session["user_id"])
+        select(User).options(joinedload(User.school)).where(User.id == session["user_id"])
     )
     user = result.scalar_one_or_none()
-    
+
+    if user:
+        principal_cache.set(
+            session_token,
+            Principal(
+                user_type="user",
+                principal_id=user.id,
+                values=snapshot(user),
+                school_id=user.school_id,
+                school_values=snapshot(user.school),
+            ),
+            generation,
+        )
     return user
@@ -9,6 +9,8 @@ from app.db.session import SessionLocal
 from app.db.seeds.adjectives_data import DEFAULT_ADJECTIVES
 from app.db.seeds.premium_lists_data import PREMIUM_LISTS
 from app.models import Admin, Adjective, List
+from app.services.list_counters import recount_lists
+from app.services.premium_catalog import premium_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ async def seed_default_list(session: AsyncSession) -> None:
         )
         session.add(adjective)
 
+    default_list.adjective_count = default_list.active_adjective_count = len(DEFAULT_ADJECTIVES)
     await session.commit()
     logger.info(f"Created default list with {len(DEFAULT_ADJECTIVES)} adjectives")
 
@@ -106,9 +109,16 @@ async def seed_premium_lists(session: AsyncSession) -> None:
             )
             session.add(adjective)
 
+        premium_list.adjective_count = premium_list.active_adjective_count = len(list_data["adjectives"])
         await session.commit()
         logger.info(f"Created premium list '{list_data['name']}' with {len(list_data['adjectives'])} adjectives")
 
+    # Premium data is also edited directly in the database; repair drifted counters
+    premium_ids = (await session.execute(select(List.id).where(List.is_premium == True))).scalars().all()  # noqa: E712
+    if await recount_lists(session, premium_ids):
+        await session.commit()
+    premium_catalog.invalidate()
+
 
 async def seed_default_admin(session: AsyncSession) -> None:
     """Seed the default admin account."""
@@ -1,5 +1,7 @@
+import asyncio
+import logging
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
@@ -8,6 +10,11 @@ from app.config import get_settings
 
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
 
 
 def _ensure_sqlite_path(db_url: str) -> None:
@@ -17,6 +24,26 @@ def _ensure_sqlite_path(db_url: str) -> None:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
 
+def _choice(value: str, allowed: set, name: str) -> str:
+    normalized = value.upper()
+    if normalized not in allowed:
+        raise ValueError(f"Invalid {name} {value!r}, expected one of: {', '.join(sorted(allowed))}")
+    return normalized
+
+
+def sqlite_pragma_statements() -> list:
+    """Return the PRAGMA statements of the configured SQLite performance profile."""
+    return [
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA journal_mode={_choice(settings.sqlite_journal_mode, _JOURNAL_MODES, 'journal mode')}",
+        f"PRAGMA synchronous={_choice(settings.sqlite_synchronous, _SYNCHRONOUS_MODES, 'synchronous mode')}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA temp_store={_choice(settings.sqlite_temp_store, _TEMP_STORES, 'temp store')}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+    ]
+
+
 _ensure_sqlite_path(settings.database_url)
 
 engine: AsyncEngine = create_async_engine(
@@ -27,13 +54,51 @@ engine: AsyncEngine = create_async_engine(
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect listener applying the SQLite profile; also used by the sync session engine."""
+    cursor = dbapi_connection.cursor()
+    for statement in sqlite_pragma_statements():
+        cursor.execute(statement)
+    cursor.close()
+
+
 @event.listens_for(engine.sync_engine, "connect")
 def _set_sqlite_pragma(dbapi_connection, connection_record) -> None:  # type: ignore[override]
     if engine.url.get_backend_name() != "sqlite":
         return
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+    apply_sqlite_pragmas(dbapi_connection, connection_record)
+
+
+async def log_sqlite_pragmas() -> Dict[str, str]:
+    """Log and return the pragmas actually in effect (e.g. WAL may be refused)."""
+    if engine.url.get_backend_name() != "sqlite":
+        return {}
+
+    effective = {}
+    async with engine.connect() as conn:
+        for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout"):
+            result = await conn.exec_driver_sql(f"PRAGMA {pragma}")
+            effective[pragma] = str(result.scalar())
+
+    logger.info("SQLite pragmas in effect: %s", ", ".join(f"{k}={v}" for k, v in effective.items()))
+    if effective["journal_mode"].upper() != settings.sqlite_journal_mode.upper():
+        logger.warning(
+            "SQLite journal_mode is %s, configured %s", effective["journal_mode"], settings.sqlite_journal_mode
+        )
+    return effective
+
+
+async def run_wal_checkpoints(interval_seconds: float) -> None:
+    """Periodically fold the WAL back into the database file so it cannot grow unbounded."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+                busy, wal_pages, checkpointed = result.one()
+            logger.debug("WAL checkpoint: busy=%s wal_pages=%s checkpointed=%s", busy, wal_pages, checkpointed)
+        except Exception:
+            logger.exception("WAL checkpoint failed")
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
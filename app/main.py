@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
@@ -8,13 +10,53 @@ from fastapi.staticfiles import StaticFiles
 from app.api.routes import api_router
 from app.config import get_settings
 from app.core.logging import setup_logging
+from app.core.security import password_pool
+from app.core.sessions import run_session_activity_flush, run_session_sweeper, session_store
+from app.db.session import engine, log_sqlite_pragmas, run_wal_checkpoints
+from app.services.analytics_writer import analytics_writer
+from app.services.pdf_jobs import pdf_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup and flush them on shutdown."""
+    settings = get_settings()
+    background_tasks = []
+
+    if engine.url.get_backend_name() == "sqlite":
+        effective = await log_sqlite_pragmas()
+        if effective.get("journal_mode", "").lower() == "wal" and settings.sqlite_wal_checkpoint_interval_seconds > 0:
+            background_tasks.append(
+                asyncio.create_task(run_wal_checkpoints(settings.sqlite_wal_checkpoint_interval_seconds))
+            )
+
+    if settings.session_sweep_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(run_session_sweeper(settings.session_sweep_interval_seconds)))
+    if session_store.backend.persistent and settings.session_activity_flush_seconds > 0:
+        background_tasks.append(
+            asyncio.create_task(run_session_activity_flush(settings.session_activity_flush_seconds))
+        )
+
+    if settings.analytics_write_behind:
+        await analytics_writer.start()
+    try:
+        yield
+    finally:
+        await analytics_writer.stop()
+        for task in background_tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await session_store.flush_activity_async()
+        password_pool.shutdown()
+        await pdf_jobs.shutdown()
 
 
 def create_application() -> FastAPI:
     settings = get_settings()
     setup_logging()
 
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
     project_root = Path(__file__).resolve().parents[1]
     frontend_dist = project_root / "frontend" / "dist"
     dist_index = frontend_dist / "index.html"
@@ -4,7 +4,14 @@ from app.models.user import User
 from app.models.admin import Admin
 from app.models.list import List
 from app.models.adjective import Adjective
-from app.models.analytics import AnalyticsAssignment, AnalyticsSession
+from app.models.analytics import (
+    AnalyticsAssignment,
+    AnalyticsDailyAdjectiveStats,
+    AnalyticsDailyDurationBin,
+    AnalyticsDailyListStats,
+    AnalyticsSession,
+)
+from app.models.auth_session import AuthSession
 
 __all__ = [
     "Base",
@@ -15,4 +22,8 @@ __all__ = [
     "Adjective",
     "AnalyticsSession",
     "AnalyticsAssignment",
+    "AnalyticsDailyListStats",
+    "AnalyticsDailyAdjectiveStats",
+    "AnalyticsDailyDurationBin",
+    "AuthSession",
 ]
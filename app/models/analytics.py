@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 from uuid import uuid4
 
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, String
+from sqlalchemy import CheckConstraint, Date, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, utc_now
@@ -10,6 +10,11 @@ from app.models.base import Base, utc_now
 
 class AnalyticsSession(Base):
     __tablename__ = "analytics_sessions"
+    # Keyset pagination of the admin session listing, overall and per list
+    __table_args__ = (
+        Index("ix_analytics_sessions_started_at_id", "started_at", "id"),
+        Index("ix_analytics_sessions_list_id_started_at_id", "list_id", "started_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     list_id: Mapped[Optional[int]] = mapped_column(ForeignKey("lists.id", ondelete="SET NULL"), nullable=True)
@@ -45,3 +50,70 @@ class AnalyticsAssignment(Base):
 
     def __repr__(self) -> str:
         return f"<AnalyticsAssignment(id={self.id}, adjective_id={self.adjective_id}, bucket={self.bucket!r})>"
+
+
+class AnalyticsDailyListStats(Base):
+    """
+    Per day, list and theme session counters, maintained by app.services.analytics_rollup.
+
+    Sessions are counted on the day they started, also when they finish or are
+    exported later. ``list_id`` and ``theme_id`` are 0 when unknown; there is no
+    foreign key so the history survives deleted lists.
+    """
+
+    __tablename__ = "analytics_daily_list_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    list_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    theme_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sessions_started: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    sessions_finished: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    pdf_exports: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Sum over finished sessions; sessions_finished is the matching count
+    duration_seconds_sum: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsDailyListStats(day={self.day}, list_id={self.list_id}, theme_id={self.theme_id})>"
+
+
+class AnalyticsDailyAdjectiveStats(Base):
+    """
+    Per day, adjective and bucket assignment counters (day of the session start).
+
+    Like the list stats there is no foreign key: rows of deleted adjectives
+    stay as history, the dashboard joins ``adjectives`` to report only
+    existing ones.
+    """
+
+    __tablename__ = "analytics_daily_adjective_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    adjective_id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    bucket: Mapped[str] = mapped_column(String(20), primary_key=True)
+    assignments: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return (
+            f"<AnalyticsDailyAdjectiveStats(day={self.day}, adjective_id={self.adjective_id}, "
+            f"bucket={self.bucket!r})>"
+        )
+
+
+class AnalyticsDailyDurationBin(Base):
+    """
+    Per day histogram of finished session durations, maintained by app.services.analytics_rollup.
+
+    ``bin`` indexes ``DURATION_BIN_EDGES``; the smallest and largest duration
+    seen in the bin are kept so quantiles can be interpolated within it.
+    """
+
+    __tablename__ = "analytics_daily_duration_bins"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    bin: Mapped[int] = mapped_column(Integer, primary_key=True)
+    sessions: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    duration_seconds_min: Mapped[float] = mapped_column(Float)
+    duration_seconds_max: Mapped[float] = mapped_column(Float)
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsDailyDurationBin(day={self.day}, bin={self.bin}, sessions={self.sessions})>"
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, utc_now
+
+
+class AuthSession(Base):
+    """Persisted login session (used by the database session backend)."""
+
+    __tablename__ = "auth_sessions"
+
+    token_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer)
+    user_type: Mapped[str] = mapped_column(String(20))  # admin, user
+    created_at: Mapped[datetime] = mapped_column(default=utc_now)
+    last_activity: Mapped[datetime] = mapped_column(default=utc_now)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+
+    def __repr__(self) -> str:
+        return f"<AuthSession(user_id={self.user_id}, user_type={self.user_type!r})>"
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import List as ListType
 from typing import Optional
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
+from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, utc_now
@@ -23,6 +23,10 @@ class List(Base):
     share_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
     share_with_school: Mapped[bool] = mapped_column(Boolean, default=False)
     source_list_id: Mapped[Optional[int]] = mapped_column(ForeignKey("lists.id"), nullable=True)
+    # Maintained by app.services.list_counters on every adjective write
+    adjective_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    active_adjective_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    content_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(default=utc_now)
     updated_at: Mapped[datetime] = mapped_column(default=utc_now, onupdate=utc_now)
 
@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.core.security import get_password_hash
+from app.core.security import hash_password_async
 from app.models.user import User
 
 
@@ -23,7 +23,7 @@ async def reset_user_password(db: AsyncSession, user_id: int, new_password: str)
             detail="User not found"
         )
     
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = await hash_password_async(new_password)
     db.add(user)
     await db.commit()
     
@@ -1,6 +1,8 @@
 """Shared analytics helpers for session lifecycle and assignments."""
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List as ListType
+from typing import NamedTuple, Optional, Sequence
+from uuid import uuid4
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
@@ -9,48 +11,52 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.analytics import AnalyticsAssignment, AnalyticsSession
 from app.models.adjective import Adjective
 from app.models.list import List
-from app.models.school import School
-from app.models.user import User
+from app.services.analytics_rollup import RollupDelta
+from app.services.analytics_writer import (
+    ASSIGNMENT,
+    PDF_EXPORT,
+    SESSION_FINISH,
+    SESSION_START,
+    AnalyticsEvent,
+    analytics_writer,
+)
+from app.services.share_access import resolve_list_access
 
 
 ALLOWED_BUCKETS = {"selten", "manchmal", "oft"}
 
 
-async def _get_accessible_list(db: AsyncSession, list_id: Optional[int]) -> List:
-    """Return a list that can be accessed publicly or raise HTTP errors."""
-    if list_id is None:
-        result = await db.execute(select(List).where(List.is_default == True))  # noqa: E712
-        list_obj = result.scalar_one_or_none()
-        if not list_obj:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Default list not found")
-    else:
-        result = await db.execute(select(List).where(List.id == list_id))
-        list_obj = result.scalar_one_or_none()
-        if not list_obj:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="List not found")
+class AssignmentEvent(NamedTuple):
+    """One sorted card as reported by the client."""
 
-    if list_obj.is_default:
-        return list_obj
+    adjective_id: int
+    bucket: str
+    client_timestamp: Optional[datetime] = None
 
-    if not list_obj.share_enabled:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="This list is not shared")
 
-    if list_obj.share_expires_at and datetime.utcnow() > list_obj.share_expires_at:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Share link has expired")
+def _normalize_bucket(bucket: str) -> str:
+    normalized_bucket = bucket.lower()
+    if normalized_bucket not in ALLOWED_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bucket must be one of: {', '.join(sorted(ALLOWED_BUCKETS))}",
+        )
+    return normalized_bucket
+
 
-    if list_obj.owner_user_id:
-        owner_result = await db.execute(select(User).where(User.id == list_obj.owner_user_id))
-        owner = owner_result.scalar_one_or_none()
-        if not owner or owner.status != "active":
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Owner account is not active")
+def _normalize_client_timestamp(client_timestamp: Optional[datetime], now: datetime) -> datetime:
+    """Convert a client timestamp to naive UTC, falling back to ``now`` if missing or in the future."""
+    if client_timestamp is None:
+        return now
+    if client_timestamp.tzinfo is not None:
+        client_timestamp = client_timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(client_timestamp, now)
 
-        if owner.school_id:
-            school_result = await db.execute(select(School).where(School.id == owner.school_id))
-            school = school_result.scalar_one_or_none()
-            if not school or school.status != "active":
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Owner's school is not active")
 
-    return list_obj
+async def _get_accessible_list(db: AsyncSession, list_id: Optional[int]) -> List:
+    """Return a list that can be accessed publicly or raise HTTP errors."""
+    access = await resolve_list_access(db, list_id=list_id, include_adjectives=False)
+    return access.raise_for_verdict()
 
 
 async def _get_session_or_404(db: AsyncSession, session_id: str) -> AnalyticsSession:
@@ -61,6 +67,35 @@ async def _get_session_or_404(db: AsyncSession, session_id: str) -> AnalyticsSes
     return session
 
 
+async def _get_buffered_session_or_404(db: AsyncSession, session_id: str) -> AnalyticsSession:
+    """
+    Return a session for write-behind mode.
+
+    Sessions still waiting in the writer queue are rebuilt from their start
+    event; stored sessions are detached so local changes are never flushed
+    by the request's database session.
+    """
+    pending = analytics_writer.pending_session(session_id)
+    if pending:
+        return AnalyticsSession(
+            id=pending.session_id,
+            list_id=pending.list_id,
+            is_standard_list=pending.is_standard_list,
+            theme_id=pending.theme_id,
+            started_at=pending.timestamp,
+        )
+
+    session = await _get_session_or_404(db, session_id)
+    db.expunge(session)
+    return session
+
+
+async def _lookup_session_or_404(db: AsyncSession, session_id: str) -> AnalyticsSession:
+    if analytics_writer.running:
+        return await _get_buffered_session_or_404(db, session_id)
+    return await _get_session_or_404(db, session_id)
+
+
 async def start_analytics_session(
     db: AsyncSession,
     *,
@@ -77,7 +112,24 @@ async def start_analytics_session(
         started_at=datetime.utcnow(),
     )
 
+    if analytics_writer.running:
+        session.id = str(uuid4())
+        await analytics_writer.enqueue(
+            AnalyticsEvent(
+                kind=SESSION_START,
+                session_id=session.id,
+                timestamp=session.started_at,
+                list_id=session.list_id,
+                is_standard_list=session.is_standard_list,
+                theme_id=session.theme_id,
+            )
+        )
+        return session
+
     db.add(session)
+    rollup = RollupDelta()
+    rollup.session_started(session)
+    await rollup.apply(db)
     await db.commit()
     await db.refresh(session)
     return session
@@ -85,10 +137,22 @@ async def start_analytics_session(
 
 async def finish_analytics_session(db: AsyncSession, *, session_id: str) -> AnalyticsSession:
     """Mark an analytics session as finished."""
+    if analytics_writer.running:
+        session = await _get_buffered_session_or_404(db, session_id)
+        if not session.finished_at:
+            session.finished_at = datetime.utcnow()
+            await analytics_writer.enqueue(
+                AnalyticsEvent(kind=SESSION_FINISH, session_id=session_id, timestamp=session.finished_at)
+            )
+        return session
+
     session = await _get_session_or_404(db, session_id)
     if not session.finished_at:
         session.finished_at = datetime.utcnow()
         db.add(session)
+        rollup = RollupDelta()
+        rollup.session_finished(session, session.finished_at)
+        await rollup.apply(db)
         await db.commit()
         await db.refresh(session)
     return session
@@ -96,7 +160,19 @@ async def finish_analytics_session(db: AsyncSession, *, session_id: str) -> Anal
 
 async def mark_pdf_export(db: AsyncSession, *, session_id: str) -> AnalyticsSession:
     """Mark that a PDF export has been triggered for the session."""
+    if analytics_writer.running:
+        session = await _get_buffered_session_or_404(db, session_id)
+        session.pdf_exported_at = datetime.utcnow()
+        await analytics_writer.enqueue(
+            AnalyticsEvent(kind=PDF_EXPORT, session_id=session_id, timestamp=session.pdf_exported_at)
+        )
+        return session
+
     session = await _get_session_or_404(db, session_id)
+    if not session.pdf_exported_at:
+        rollup = RollupDelta()
+        rollup.pdf_exported(session)
+        await rollup.apply(db)
     session.pdf_exported_at = datetime.utcnow()
     db.add(session)
     await db.commit()
@@ -112,14 +188,9 @@ async def record_assignment(
     bucket: str,
 ) -> AnalyticsAssignment:
     """Insert or update an analytics assignment for a session."""
-    normalized_bucket = bucket.lower()
-    if normalized_bucket not in ALLOWED_BUCKETS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Bucket must be one of: {', '.join(sorted(ALLOWED_BUCKETS))}",
-        )
+    normalized_bucket = _normalize_bucket(bucket)
 
-    session = await _get_session_or_404(db, session_id)
+    session = await _lookup_session_or_404(db, session_id)
 
     if not session.list_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session has no associated list")
@@ -131,6 +202,24 @@ async def record_assignment(
     if not adjective:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adjective not found in this list")
 
+    if analytics_writer.running:
+        assignment = AnalyticsAssignment(
+            session_id=session_id,
+            adjective_id=adjective_id,
+            bucket=normalized_bucket,
+            assigned_at=datetime.utcnow(),
+        )
+        await analytics_writer.enqueue(
+            AnalyticsEvent(
+                kind=ASSIGNMENT,
+                session_id=session_id,
+                timestamp=assignment.assigned_at,
+                adjective_id=adjective_id,
+                bucket=normalized_bucket,
+            )
+        )
+        return assignment
+
     existing_result = await db.execute(
         select(AnalyticsAssignment).where(
             AnalyticsAssignment.session_id == session_id,
@@ -139,6 +228,10 @@ async def record_assignment(
     )
     existing = existing_result.scalar_one_or_none()
 
+    rollup = RollupDelta()
+    rollup.assignment_changed(session, adjective_id, existing.bucket if existing else None, normalized_bucket)
+    await rollup.apply(db)
+
     if existing:
         existing.bucket = normalized_bucket
         existing.assigned_at = datetime.utcnow()
@@ -157,3 +250,95 @@ async def record_assignment(
     await db.commit()
     await db.refresh(assignment)
     return assignment
+
+
+async def record_assignments_batch(
+    db: AsyncSession,
+    *,
+    session_id: str,
+    assignments: Sequence[AssignmentEvent],
+) -> ListType[AnalyticsAssignment]:
+    """
+    Upsert an ordered batch of assignments for a session in one transaction.
+
+    Later events for the same adjective win. All adjective ids are validated
+    against the session's list with a single query.
+    """
+    now = datetime.utcnow()
+    latest = {}
+    for event in assignments:
+        latest[event.adjective_id] = (
+            _normalize_bucket(event.bucket),
+            _normalize_client_timestamp(event.client_timestamp, now),
+        )
+
+    session = await _lookup_session_or_404(db, session_id)
+
+    if not session.list_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Session has no associated list")
+
+    if not latest:
+        return []
+
+    adjective_ids = list(latest)
+    valid_result = await db.execute(
+        select(Adjective.id).where(Adjective.list_id == session.list_id, Adjective.id.in_(adjective_ids))
+    )
+    unknown_ids = set(adjective_ids) - set(valid_result.scalars().all())
+    if unknown_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Adjectives not found in this list: {', '.join(str(i) for i in sorted(unknown_ids))}",
+        )
+
+    if analytics_writer.running:
+        recorded = []
+        for adjective_id, (bucket, assigned_at) in latest.items():
+            await analytics_writer.enqueue(
+                AnalyticsEvent(
+                    kind=ASSIGNMENT,
+                    session_id=session_id,
+                    timestamp=assigned_at,
+                    adjective_id=adjective_id,
+                    bucket=bucket,
+                )
+            )
+            recorded.append(
+                AnalyticsAssignment(
+                    session_id=session_id,
+                    adjective_id=adjective_id,
+                    bucket=bucket,
+                    assigned_at=assigned_at,
+                )
+            )
+        return recorded
+
+    existing_result = await db.execute(
+        select(AnalyticsAssignment).where(
+            AnalyticsAssignment.session_id == session_id,
+            AnalyticsAssignment.adjective_id.in_(adjective_ids),
+        )
+    )
+    existing = {assignment.adjective_id: assignment for assignment in existing_result.scalars().all()}
+
+    recorded = []
+    rollup = RollupDelta()
+    for adjective_id, (bucket, assigned_at) in latest.items():
+        assignment = existing.get(adjective_id)
+        rollup.assignment_changed(session, adjective_id, assignment.bucket if assignment else None, bucket)
+        if assignment:
+            assignment.bucket = bucket
+            assignment.assigned_at = assigned_at
+        else:
+            assignment = AnalyticsAssignment(
+                session_id=session_id,
+                adjective_id=adjective_id,
+                bucket=bucket,
+                assigned_at=assigned_at,
+            )
+        db.add(assignment)
+        recorded.append(assignment)
+
+    await rollup.apply(db)
+    await db.commit()
+    return recorded
@@ -0,0 +1,171 @@
+"""Streaming export of raw analytics sessions with their assignments."""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.adjective import Adjective
+from app.models.analytics import AnalyticsAssignment, AnalyticsSession
+
+# Rows fetched per round trip; each batch becomes one chunk of the response
+EXPORT_BATCH_SIZE = 1000
+
+# Leading characters that make spreadsheet apps evaluate a CSV cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+SESSION_COLUMNS = (
+    "session_id",
+    "list_id",
+    "is_standard_list",
+    "theme_id",
+    "started_at",
+    "finished_at",
+    "pdf_exported_at",
+)
+ASSIGNMENT_COLUMNS = ("adjective_id", "word", "bucket", "assigned_at")
+CSV_COLUMNS = SESSION_COLUMNS + ASSIGNMENT_COLUMNS
+
+
+def _export_query(filters: Sequence[Any], last: Optional[Any] = None):
+    """
+    One row per assignment, plus one row for every session without assignments.
+
+    With ``last`` the query resumes after that row in export order, so every
+    batch is a fresh seek on the (started_at, id) index.
+    """
+    conditions = list(filters)
+    if last is not None:
+        position = tuple_(AnalyticsSession.started_at, AnalyticsSession.id)
+        last_position = tuple_(last.started_at, last.session_id)
+        after = position > last_position
+        if last.assignment_id is not None:
+            after = or_(after, and_(position == last_position, AnalyticsAssignment.id > last.assignment_id))
+        conditions.append(after)
+    return (
+        select(
+            AnalyticsSession.id.label("session_id"),
+            AnalyticsSession.list_id,
+            AnalyticsSession.is_standard_list,
+            AnalyticsSession.theme_id,
+            AnalyticsSession.started_at,
+            AnalyticsSession.finished_at,
+            AnalyticsSession.pdf_exported_at,
+            AnalyticsAssignment.id.label("assignment_id"),
+            AnalyticsAssignment.adjective_id,
+            Adjective.word,
+            AnalyticsAssignment.bucket,
+            AnalyticsAssignment.assigned_at,
+        )
+        .select_from(AnalyticsSession)
+        .outerjoin(AnalyticsAssignment, AnalyticsAssignment.session_id == AnalyticsSession.id)
+        .outerjoin(Adjective, Adjective.id == AnalyticsAssignment.adjective_id)
+        .where(*conditions)
+        .order_by(AnalyticsSession.started_at, AnalyticsSession.id, AnalyticsAssignment.id)
+        .limit(EXPORT_BATCH_SIZE)
+    )
+
+
+async def _partitions(bind: AsyncEngine, filters: Sequence[Any]) -> AsyncIterator[Sequence[Any]]:
+    """
+    Read the export rows in keyset-paged batches, each in its own short transaction.
+
+    A single cursor over the whole export would keep one read transaction
+    open for as long as the client takes to download it, and on WAL that
+    stops the checkpoint task from truncating the log. Rows committed while
+    the export runs may therefore show up in later batches. The response
+    body is sent after the request's database session has been closed, so
+    the stream opens its own sessions on the same engine.
+    """
+    last = None
+    while True:
+        async with AsyncSession(bind) as db:
+            rows = (await db.execute(_export_query(filters, last))).all()
+        if rows:
+            yield rows
+        if len(rows) < EXPORT_BATCH_SIZE:
+            return
+        last = rows[-1]
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _session_record(row: Any) -> Dict[str, Any]:
+    record = {column: getattr(row, column) for column in SESSION_COLUMNS}
+    for column in ("started_at", "finished_at", "pdf_exported_at"):
+        record[column] = _isoformat(record[column])
+    return record
+
+
+def _assignment_record(row: Any) -> Dict[str, Any]:
+    return {
+        "adjective_id": row.adjective_id,
+        "word": row.word,
+        "bucket": row.bucket,
+        "assigned_at": _isoformat(row.assigned_at),
+    }
+
+
+def _csv_cell(value: Any) -> Any:
+    """Empty for NULL; text that a spreadsheet would run as a formula is prefixed with a quote."""
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def stream_csv(bind: AsyncEngine, filters: Sequence[Any]) -> AsyncIterator[bytes]:
+    """
+    Flat CSV with one line per assignment; assignment columns are empty for sessions without any.
+
+    Cells starting with ``=``, ``+``, ``-``, ``@``, tab or carriage return get
+    a leading ``'`` so adjective words cannot inject spreadsheet formulas.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    async for partition in _partitions(bind, filters):
+        for row in partition:
+            record = _session_record(row)
+            if row.adjective_id is not None:
+                record.update(_assignment_record(row))
+            writer.writerow([_csv_cell(record.get(column)) for column in CSV_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_ndjson(bind: AsyncEngine, filters: Sequence[Any]) -> AsyncIterator[bytes]:
+    """
+    One JSON object per session with its assignments nested.
+
+    Rows arrive ordered by session, so only the session being assembled is
+    held in memory, also when its rows span two batches.
+    """
+    current: Optional[Dict[str, Any]] = None
+    async for partition in _partitions(bind, filters):
+        lines = []
+        for row in partition:
+            if current is None or current["session_id"] != row.session_id:
+                if current is not None:
+                    lines.append(json.dumps(current, ensure_ascii=False))
+                current = {**_session_record(row), "assignments": []}
+            if row.adjective_id is not None:
+                current["assignments"].append(_assignment_record(row))
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    if current is not None:
+        yield (json.dumps(current, ensure_ascii=False) + "\n").encode("utf-8")
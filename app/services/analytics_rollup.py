@@ -0,0 +1,298 @@
+"""Daily analytics rollups maintained alongside the raw analytics tables.
+
+The admin dashboard reads only ``analytics_daily_list_stats``,
+``analytics_daily_adjective_stats`` and ``analytics_daily_duration_bins``, so
+its cost depends on the number of days, lists and adjectives rather than on
+the raw session history. Writers
+collect their changes in a ``RollupDelta`` and apply it in the same
+transaction as the raw write; ``rebuild_rollups`` recomputes both tables from
+the raw data.
+
+The rollups are append-only history. Deleting lists, adjectives or sessions
+(including the raw assignments removed by cascading deletes) never applies
+negative deltas, so a rebuild drops the history of whatever was deleted.
+
+Run ``python -m app.services.analytics_rollup`` to rebuild the rollups.
+"""
+import asyncio
+import logging
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, DefaultDict, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import (
+    AnalyticsAssignment,
+    AnalyticsDailyAdjectiveStats,
+    AnalyticsDailyDurationBin,
+    AnalyticsDailyListStats,
+    AnalyticsSession,
+)
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 5000
+
+_LIST_KEY = ("day", "list_id", "theme_id")
+_LIST_COUNTERS = ("sessions_started", "sessions_finished", "pdf_exports", "duration_seconds_sum")
+_ADJECTIVE_KEY = ("day", "adjective_id", "bucket")
+_DURATION_KEY = ("day", "bin")
+
+# Lower edges (seconds) of the session duration histogram bins; the last bin is open-ended.
+# Changing them requires a rebuild.
+DURATION_BIN_EDGES: Tuple[float, ...] = (
+    0, 10, 20, 30, 45, 60, 90, 120, 150, 180, 240, 300, 360, 420, 480, 600, 720, 900,
+    1200, 1500, 1800, 2400, 3600, 5400, 7200, 10800, 21600,
+)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def rollup_day(started_at: datetime) -> date:
+    """Day (UTC) a session and all of its events are counted on."""
+    return _naive_utc(started_at).date()
+
+
+def duration_bin(duration_seconds: float) -> int:
+    """Index of the histogram bin a duration falls into (negative durations go to the first bin)."""
+    return max(bisect_right(DURATION_BIN_EDGES, duration_seconds) - 1, 0)
+
+
+def duration_bin_bounds(index: int) -> Tuple[float, Optional[float]]:
+    """Lower and upper edge of a histogram bin (upper is None for the last bin)."""
+    upper = DURATION_BIN_EDGES[index + 1] if index + 1 < len(DURATION_BIN_EDGES) else None
+    return DURATION_BIN_EDGES[index], upper
+
+
+def _list_key(session: Any) -> Tuple[date, int, int]:
+    return rollup_day(session.started_at), session.list_id or 0, session.theme_id or 0
+
+
+class RollupDelta:
+    """
+    Counter changes collected by one write and applied with one upsert per table.
+
+    The ``session`` arguments only need ``started_at``, ``list_id`` and
+    ``theme_id`` attributes, so ORM objects and result rows both work.
+    """
+
+    def __init__(self) -> None:
+        self.list_stats: DefaultDict[Tuple[date, int, int], List[float]] = defaultdict(lambda: [0, 0, 0, 0.0])
+        self.adjective_stats: DefaultDict[Tuple[date, int, str], int] = defaultdict(int)
+        # (day, bin) -> [sessions, min duration, max duration]
+        self.duration_bins: Dict[Tuple[date, int], List[float]] = {}
+
+    def session_started(self, session: Any) -> None:
+        self.list_stats[_list_key(session)][0] += 1
+
+    def session_finished(self, session: Any, finished_at: datetime) -> None:
+        key = _list_key(session)
+        duration = (_naive_utc(finished_at) - _naive_utc(session.started_at)).total_seconds()
+        counters = self.list_stats[key]
+        counters[1] += 1
+        counters[3] += duration
+
+        bin_key = (key[0], duration_bin(duration))
+        bin_stats = self.duration_bins.get(bin_key)
+        if bin_stats is None:
+            self.duration_bins[bin_key] = [1, duration, duration]
+        else:
+            bin_stats[0] += 1
+            bin_stats[1] = min(bin_stats[1], duration)
+            bin_stats[2] = max(bin_stats[2], duration)
+
+    def pdf_exported(self, session: Any) -> None:
+        self.list_stats[_list_key(session)][2] += 1
+
+    def assignment_changed(
+        self,
+        session: Any,
+        adjective_id: int,
+        old_bucket: Optional[str],
+        new_bucket: str,
+    ) -> None:
+        """Move one assignment from ``old_bucket`` (None for a new assignment) to ``new_bucket``."""
+        if old_bucket == new_bucket:
+            return
+        day = rollup_day(session.started_at)
+        if old_bucket:
+            self.adjective_stats[(day, adjective_id, old_bucket)] -= 1
+        self.adjective_stats[(day, adjective_id, new_bucket)] += 1
+
+    async def apply(self, db: AsyncSession) -> None:
+        """Add the collected changes to the rollup tables on ``db`` (no commit)."""
+        list_rows = [
+            dict(zip(_LIST_KEY + _LIST_COUNTERS, key + tuple(counters)))
+            for key, counters in self.list_stats.items()
+            if any(counters)
+        ]
+        adjective_rows = [
+            dict(zip(_ADJECTIVE_KEY + ("assignments",), key + (count,)))
+            for key, count in self.adjective_stats.items()
+            if count
+        ]
+        duration_rows = [
+            {"day": day, "bin": index, "sessions": count, "duration_seconds_min": low, "duration_seconds_max": high}
+            for (day, index), (count, low, high) in self.duration_bins.items()
+        ]
+        if list_rows:
+            await db.execute(_increment(db, AnalyticsDailyListStats, _LIST_KEY, _LIST_COUNTERS), list_rows)
+        if adjective_rows:
+            await db.execute(
+                _increment(db, AnalyticsDailyAdjectiveStats, _ADJECTIVE_KEY, ("assignments",)), adjective_rows
+            )
+        if duration_rows:
+            await db.execute(
+                _increment(
+                    db,
+                    AnalyticsDailyDurationBin,
+                    _DURATION_KEY,
+                    ("sessions",),
+                    minimums=("duration_seconds_min",),
+                    maximums=("duration_seconds_max",),
+                ),
+                duration_rows,
+            )
+        self.list_stats.clear()
+        self.adjective_stats.clear()
+        self.duration_bins.clear()
+
+
+def _increment(
+    db: AsyncSession,
+    model: Any,
+    key: Tuple[str, ...],
+    counters: Tuple[str, ...],
+    *,
+    minimums: Tuple[str, ...] = (),
+    maximums: Tuple[str, ...] = (),
+) -> Any:
+    """
+    ``INSERT ... ON CONFLICT DO UPDATE`` merging the inserted row into an existing one.
+
+    ``counters`` are added, ``minimums`` and ``maximums`` keep the smaller or
+    larger value.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        insert, smaller, larger = postgresql.insert, func.least, func.greatest
+    else:
+        insert, smaller, larger = sqlite.insert, func.min, func.max
+    stmt = insert(model)
+    table = model.__table__
+    values = {name: table.c[name] + stmt.excluded[name] for name in counters}
+    values.update({name: smaller(table.c[name], stmt.excluded[name]) for name in minimums})
+    values.update({name: larger(table.c[name], stmt.excluded[name]) for name in maximums})
+    return stmt.on_conflict_do_update(index_elements=list(key), set_=values)
+
+
+class DurationBin(NamedTuple):
+    """Histogram bin summed over a range of days."""
+
+    lower_seconds: float
+    upper_seconds: Optional[float]
+    sessions: int
+    min_seconds: float
+    max_seconds: float
+
+
+def duration_quantile(bins: Sequence[DurationBin], quantile: float) -> Optional[float]:
+    """
+    Estimate a duration quantile from histogram bins sorted by ``lower_seconds``.
+
+    The value is interpolated linearly inside the bin that holds the requested
+    rank, between the smallest and largest duration actually seen in that bin,
+    so it is exact for single-session bins and never leaves the observed range.
+    """
+    total = sum(item.sessions for item in bins)
+    if not total:
+        return None
+    rank = quantile * (total - 1)
+    seen = 0
+    for item in bins:
+        if rank < seen + item.sessions:
+            if item.sessions == 1:
+                return item.min_seconds
+            position = (rank - seen) / (item.sessions - 1)
+            return item.min_seconds + position * (item.max_seconds - item.min_seconds)
+        seen += item.sessions
+    return bins[-1].max_seconds
+
+
+async def rebuild_rollups(db: AsyncSession) -> Dict[str, int]:
+    """
+    Recompute both rollup tables from the raw analytics tables (no commit).
+
+    Raw rows are streamed in batches, so memory is bounded by the number of
+    rollup rows. Returns the number of rollup rows written per table.
+    """
+    await db.execute(delete(AnalyticsDailyListStats))
+    await db.execute(delete(AnalyticsDailyAdjectiveStats))
+    await db.execute(delete(AnalyticsDailyDurationBin))
+
+    delta = RollupDelta()
+    sessions = await db.stream(
+        select(
+            AnalyticsSession.started_at,
+            AnalyticsSession.list_id,
+            AnalyticsSession.theme_id,
+            AnalyticsSession.finished_at,
+            AnalyticsSession.pdf_exported_at,
+        ).execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    async for session in sessions:
+        delta.session_started(session)
+        if session.finished_at:
+            delta.session_finished(session, session.finished_at)
+        if session.pdf_exported_at:
+            delta.pdf_exported(session)
+
+    assignments = await db.stream(
+        select(
+            AnalyticsSession.started_at,
+            AnalyticsSession.list_id,
+            AnalyticsSession.theme_id,
+            AnalyticsAssignment.adjective_id,
+            AnalyticsAssignment.bucket,
+        )
+        .select_from(AnalyticsAssignment)
+        .join(AnalyticsSession, AnalyticsSession.id == AnalyticsAssignment.session_id)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    async for row in assignments:
+        delta.assignment_changed(row, row.adjective_id, None, row.bucket)
+
+    written = {
+        "list_stats": len(delta.list_stats),
+        "adjective_stats": len(delta.adjective_stats),
+        "duration_bins": len(delta.duration_bins),
+    }
+    await delta.apply(db)
+    return written
+
+
+async def run_rebuild() -> None:
+    """Rebuild the rollups from scratch and report their size."""
+    from app.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    async with SessionLocal() as session:
+        written = await rebuild_rollups(session)
+        await session.commit()
+    logger.info(
+        "Rebuilt analytics rollups: %d list rows, %d adjective rows, %d duration bins",
+        written["list_stats"],
+        written["adjective_stats"],
+        written["duration_bins"],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_rebuild())
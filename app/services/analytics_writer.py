@@ -0,0 +1,394 @@
+"""Write-behind buffer for analytics events drained by a single writer task."""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import SessionLocal
+from app.models.analytics import AnalyticsAssignment, AnalyticsSession
+from app.services.analytics_rollup import RollupDelta
+
+logger = logging.getLogger(__name__)
+
+
+SESSION_START = "session_start"
+ASSIGNMENT = "assignment"
+SESSION_FINISH = "session_finish"
+PDF_EXPORT = "pdf_export"
+
+
+@dataclass
+class AnalyticsEvent:
+    """A single buffered analytics write."""
+
+    kind: str
+    session_id: str
+    timestamp: datetime
+    list_id: Optional[int] = None
+    is_standard_list: bool = False
+    theme_id: Optional[int] = None
+    adjective_id: Optional[int] = None
+    bucket: Optional[str] = None
+
+
+class AnalyticsWriter:
+    """
+    Bounded asyncio queue of analytics events with one background writer.
+
+    The writer coalesces queued events into one transaction per flush, so
+    request handlers never wait on a SQLite commit. Sessions that were started
+    but not yet committed are tracked so follow-up events can be validated.
+
+    Transient database errors (``OperationalError``, e.g. "database is
+    locked") are retried with backoff; if they persist the batch is kept and
+    written on the next flush. Any other error (e.g. an event for a session
+    that was never written) is isolated: the batch is retried per session and
+    then per event, and only the events that still fail are dropped.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        *,
+        max_queue_size: int = 10000,
+        flush_interval_seconds: float = 1.0,
+        max_batch_size: int = 500,
+        enqueue_timeout_seconds: float = 2.0,
+        coalesce_seconds: float = 0.05,
+        retry_attempts: int = 3,
+        retry_backoff_seconds: float = 0.1,
+    ):
+        self.session_factory = session_factory
+        self.max_queue_size = max_queue_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch_size = max_batch_size
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.coalesce_seconds = coalesce_seconds
+        self.retry_attempts = retry_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending_sessions: Dict[str, AnalyticsEvent] = {}
+        self._retry: List[AnalyticsEvent] = []
+        self._progress = asyncio.Event()
+
+        self.enqueued = 0
+        self.written = 0
+        self.rejected = 0
+        self.failed = 0
+        self.retried = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background writer task (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="analytics-writer")
+        logger.info("Analytics write-behind enabled (queue size %s)", self.max_queue_size)
+
+    async def stop(self) -> None:
+        """Stop accepting events and wait until everything queued is written."""
+        if not self.running:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("Analytics writer stopped")
+
+    async def enqueue(self, event: AnalyticsEvent) -> None:
+        """
+        Queue an event, waiting for space if the queue is full.
+
+        Raises 503 if the queue stays full for longer than the enqueue timeout
+        or the writer is shutting down.
+        """
+        if self._stopping.is_set():
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Analytics writer is shutting down, please retry",
+            )
+
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Analytics buffer is full, please retry",
+            )
+
+        self.enqueued += 1
+        if event.kind == SESSION_START:
+            self._pending_sessions[event.session_id] = event
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until every event queued before the call has been written or dropped.
+
+        Returns right away when write-behind is off. Raises 503 if that takes
+        longer than ``timeout`` (default: one flush interval plus the enqueue
+        timeout), e.g. while the database stays locked.
+        """
+        if not self.running:
+            return
+        target = self.enqueued
+        if timeout is None:
+            timeout = self.flush_interval_seconds + self.enqueue_timeout_seconds
+        deadline = time.monotonic() + timeout
+        while self.written + self.failed < target:
+            self._progress.clear()
+            try:
+                await asyncio.wait_for(self._progress.wait(), timeout=max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Analytics are still being saved, please retry",
+                )
+
+    def pending_session(self, session_id: str) -> Optional[AnalyticsEvent]:
+        """Return the start event of a session that has not been written yet."""
+        return self._pending_sessions.get(session_id)
+
+    def _drain(self, limit: Optional[int]) -> List[AnalyticsEvent]:
+        events = []
+        while not self._queue.empty() and (limit is None or len(events) < limit):
+            events.append(self._queue.get_nowait())
+        return events
+
+    async def _run(self) -> None:
+        next_flush = time.monotonic()
+        while not self._stopping.is_set():
+            # Events kept from a failed flush go first, so per-session order is preserved
+            events, self._retry = self._retry, []
+            if not events:
+                try:
+                    events = [await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval_seconds)]
+                except asyncio.TimeoutError:
+                    continue
+
+            # At most one flush per interval; a short window lets concurrent requests pile up
+            delay = max(next_flush - time.monotonic(), min(self.coalesce_seconds, self.flush_interval_seconds))
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            next_flush = time.monotonic() + self.flush_interval_seconds
+
+            await self._flush(events + self._drain(limit=max(self.max_batch_size - len(events), 0)))
+
+        # Flush on shutdown
+        while self._retry or not self._queue.empty():
+            events, self._retry = self._retry, []
+            await self._flush(events + self._drain(limit=max(self.max_batch_size - len(events), 0)))
+            if self._retry:
+                self._drop(self._retry, "database still unavailable at shutdown")
+                self._retry = []
+
+    async def _write(self, events: List[AnalyticsEvent]) -> None:
+        """Write events in one transaction, retrying transient errors with backoff."""
+        for attempt in range(self.retry_attempts + 1):
+            try:
+                async with self.session_factory() as db:
+                    await apply_events(db, events)
+                    await db.commit()
+                return
+            except OperationalError:
+                if attempt == self.retry_attempts:
+                    raise
+                self.retried += 1
+                await asyncio.sleep(self.retry_backoff_seconds * 2 ** attempt)
+
+    def _written(self, events: List[AnalyticsEvent]) -> None:
+        self.written += len(events)
+        for event in events:
+            if event.kind == SESSION_START:
+                self._pending_sessions.pop(event.session_id, None)
+
+    def _drop(self, events: List[AnalyticsEvent], reason: str) -> None:
+        self.failed += len(events)
+        logger.error("Dropped %s analytics events: %s", len(events), reason)
+        for event in events:
+            if event.kind == SESSION_START:
+                self._pending_sessions.pop(event.session_id, None)
+
+    async def _flush(self, events: List[AnalyticsEvent]) -> None:
+        if not events:
+            return
+        started = time.perf_counter()
+        try:
+            await self._write(events)
+        except OperationalError:
+            logger.warning("Database unavailable, keeping %s analytics events for the next flush", len(events))
+            self._retry = events
+        except Exception:
+            logger.exception("Failed to write %s analytics events, retrying per session", len(events))
+            await self._flush_per_session(events)
+        else:
+            self._written(events)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        self._progress.set()
+
+    async def _flush_per_session(self, events: List[AnalyticsEvent]) -> None:
+        """Write each session's events separately so one bad session cannot sink the batch."""
+        by_session: Dict[str, List[AnalyticsEvent]] = {}
+        for event in events:
+            by_session.setdefault(event.session_id, []).append(event)
+
+        for session_events in by_session.values():
+            try:
+                await self._write(session_events)
+            except OperationalError:
+                self._retry.extend(session_events)
+            except Exception:
+                # Down to single events: only the offending ones are dropped
+                for event in session_events:
+                    await self._write_single(event)
+            else:
+                self._written(session_events)
+
+    async def _write_single(self, event: AnalyticsEvent) -> None:
+        try:
+            await self._write([event])
+        except OperationalError:
+            self._retry.append(event)
+        except Exception as exc:
+            self._drop([event], f"{event.kind} for session {event.session_id}: {exc}")
+        else:
+            self._written([event])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and flush latency metrics."""
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "pending_sessions": len(self._pending_sessions),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "retried": self.retried,
+            "retry_backlog": len(self._retry),
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+
+async def apply_events(db: AsyncSession, events: List[AnalyticsEvent]) -> None:
+    """
+    Coalesce a batch of events into bulk inserts and updates on ``db`` (no commit).
+
+    The daily rollups are updated in the same transaction.
+    """
+    new_sessions: Dict[str, AnalyticsSession] = {}
+    finished: Dict[str, datetime] = {}
+    exported: Dict[str, datetime] = {}
+    assignments: Dict[Tuple[str, int], Tuple[str, datetime]] = {}
+
+    for event in events:
+        if event.kind == SESSION_START:
+            new_sessions[event.session_id] = AnalyticsSession(
+                id=event.session_id,
+                list_id=event.list_id,
+                is_standard_list=event.is_standard_list,
+                theme_id=event.theme_id,
+                started_at=event.timestamp,
+            )
+        elif event.kind == ASSIGNMENT:
+            assignments[(event.session_id, event.adjective_id)] = (event.bucket, event.timestamp)
+        elif event.kind == SESSION_FINISH:
+            finished.setdefault(event.session_id, event.timestamp)
+        elif event.kind == PDF_EXPORT:
+            exported[event.session_id] = event.timestamp
+
+    db.add_all(new_sessions.values())
+    rollup = RollupDelta()
+    for session in new_sessions.values():
+        rollup.session_started(session)
+
+    # Rollups are keyed by the session's start day, list and theme
+    sessions = dict(new_sessions)
+    assigned_ids = {session_id for session_id, _ in assignments}
+    existing_ids = (set(finished) | set(exported) | assigned_ids) - set(new_sessions)
+    if existing_ids:
+        result = await db.execute(select(AnalyticsSession).where(AnalyticsSession.id.in_(existing_ids)))
+        sessions.update({session.id: session for session in result.scalars().all()})
+
+    for session_id, finished_at in finished.items():
+        session = sessions.get(session_id)
+        if session and not session.finished_at:
+            session.finished_at = finished_at
+            rollup.session_finished(session, finished_at)
+    for session_id, exported_at in exported.items():
+        session = sessions.get(session_id)
+        if session:
+            if not session.pdf_exported_at:
+                rollup.pdf_exported(session)
+            session.pdf_exported_at = exported_at
+
+    if assignments:
+        adjective_ids = {adjective_id for _, adjective_id in assignments}
+        result = await db.execute(
+            select(AnalyticsAssignment).where(
+                AnalyticsAssignment.session_id.in_(assigned_ids),
+                AnalyticsAssignment.adjective_id.in_(adjective_ids),
+            )
+        )
+        existing = {(row.session_id, row.adjective_id): row for row in result.scalars().all()}
+
+        for key, (bucket, assigned_at) in assignments.items():
+            row = existing.get(key)
+            session = sessions.get(key[0])
+            if session:
+                rollup.assignment_changed(session, key[1], row.bucket if row else None, bucket)
+            if row:
+                row.bucket = bucket
+                row.assigned_at = assigned_at
+            else:
+                db.add(
+                    AnalyticsAssignment(
+                        session_id=key[0],
+                        adjective_id=key[1],
+                        bucket=bucket,
+                        assigned_at=assigned_at,
+                    )
+                )
+
+    await rollup.apply(db)
+
+
+_settings = get_settings()
+analytics_writer = AnalyticsWriter(
+    SessionLocal,
+    max_queue_size=_settings.analytics_queue_max_size,
+    flush_interval_seconds=_settings.analytics_flush_interval_seconds,
+    max_batch_size=_settings.analytics_flush_max_batch,
+    enqueue_timeout_seconds=_settings.analytics_enqueue_timeout_seconds,
+)
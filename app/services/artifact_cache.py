@@ -0,0 +1,271 @@
+"""Content-addressed cache for rendered artifacts (QR codes, PDFs)."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when renderers change their output so old artifacts are not served
+ARTIFACT_VERSION = 1
+
+
+def artifact_key(kind: str, *inputs: Any) -> str:
+    """Hash everything a render depends on into a cache key (bytes are hashed first)."""
+    def encode(value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return {"sha256": hashlib.sha256(value).hexdigest()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        return value
+
+    material = json.dumps([ARTIFACT_VERSION, kind, encode(list(inputs))], default=str, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Artifact:
+    """Rendered bytes with a strong ETag derived from the content."""
+
+    data: bytes
+    etag: str
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Artifact":
+        return cls(data=data, etag=f'"{hashlib.sha256(data).hexdigest()[:32]}"')
+
+
+class ArtifactCache:
+    """
+    Two-tier LRU: a byte-bounded memory tier in front of a byte-bounded directory.
+
+    Disk entries are stored as ``<dir>/<key[:2]>/<key>``; their modification
+    time is bumped on every hit so eviction removes the least recently used
+    files first, and files unused for ``disk_max_age_seconds`` are dropped.
+    Disk I/O runs in worker threads; the disk index is guarded by a lock.
+    ``directory=None`` disables the disk tier, and ``persist=False`` keeps a
+    single artifact in memory only.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+        disk_max_age_seconds: Optional[float] = None,
+    ):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_max_age_seconds = disk_max_age_seconds
+
+        self._memory: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: Optional[Dict[str, Tuple[int, float]]] = None  # key -> (size, mtime)
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _remember(self, key: str, artifact: Artifact) -> None:
+        if len(artifact.data) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous.data)
+        self._memory[key] = artifact
+        self._memory_bytes += len(artifact.data)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.data)
+
+    # Disk tier (runs in worker threads; index changes hold ``_disk_lock``)
+
+    def _load_disk_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._disk_index is None:
+            index = {}
+            if self.directory.exists():
+                for path in self.directory.glob("*/*"):
+                    if path.is_file() and not path.name.endswith(".tmp"):
+                        stat = path.stat()
+                        index[path.name] = (stat.st_size, stat.st_mtime)
+            self._disk_index = index
+            self._disk_bytes = sum(size for size, _ in index.values())
+        return self._disk_index
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.disk_max_age_seconds is not None and now - mtime > self.disk_max_age_seconds
+
+    def _forget_disk(self, index: Dict[str, Tuple[int, float]], key: str) -> None:
+        entry = index.pop(key, None)
+        if entry is not None:
+            self._path(key).unlink(missing_ok=True)
+            self._disk_bytes -= entry[0]
+            self.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        with self._disk_lock:
+            index = self._load_disk_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[1], time.time()):
+                self._forget_disk(index, key)
+                return None
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            data = None
+
+        with self._disk_lock:
+            if data is None:
+                entry = index.pop(key, None)
+                if entry is not None:
+                    self._disk_bytes -= entry[0]
+            elif key in index:
+                index[key] = (len(data), time.time())
+        return data
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if len(data) > self.disk_max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._disk_lock:
+            index = self._load_disk_index()
+            now = time.time()
+            if key in index:
+                self._disk_bytes -= index[key][0]
+            index[key] = (len(data), now)
+            self._disk_bytes += len(data)
+
+            if self.disk_max_age_seconds is not None:
+                for old_key in [old_key for old_key, (_, mtime) in index.items() if self._expired(mtime, now)]:
+                    self._forget_disk(index, old_key)
+
+            if self._disk_bytes > self.disk_max_bytes:
+                for old_key, _ in sorted(index.items(), key=lambda item: item[1][1]):
+                    if self._disk_bytes <= self.disk_max_bytes:
+                        break
+                    if old_key != key:
+                        self._forget_disk(index, old_key)
+
+    async def get(self, key: str) -> Optional[Artifact]:
+        """Return a cached artifact from memory or disk, or None."""
+        artifact = self._memory.get(key)
+        if artifact is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return artifact
+
+        if self.directory is not None:
+            try:
+                data = await asyncio.to_thread(self._read_disk, key)
+            except OSError:
+                logger.exception("Failed to read artifact %s", key)
+                data = None
+            if data is not None:
+                artifact = Artifact.from_bytes(data)
+                self._remember(key, artifact)
+                self.disk_hits += 1
+                return artifact
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes, *, persist: bool = True) -> Artifact:
+        """Store rendered bytes (on disk too unless ``persist=False``) and return them as an artifact."""
+        artifact = Artifact.from_bytes(data)
+        self._remember(key, artifact)
+        if self.directory is not None and persist:
+            try:
+                await asyncio.to_thread(self._write_disk, key, data)
+            except OSError:
+                logger.exception("Failed to write artifact %s", key)
+        return artifact
+
+    async def get_or_create(
+        self, key: str, render: Callable[[], Awaitable[bytes]], *, persist: bool = True
+    ) -> Artifact:
+        """Return the cached artifact for ``key`` or render, store and return it."""
+        artifact = await self.get(key)
+        if artifact is None:
+            artifact = await self.put(key, await render(), persist=persist)
+        return artifact
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit counters and tier sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_max_bytes": self.memory_max_bytes,
+            "disk_enabled": self.directory is not None,
+            "disk_entries": len(self._disk_index) if self._disk_index is not None else None,
+            "disk_bytes": self._disk_bytes if self._disk_index is not None else None,
+            "disk_max_bytes": self.disk_max_bytes,
+            "disk_max_age_seconds": self.disk_max_age_seconds,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match covers ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or etag in {candidate.removeprefix("W/") for candidate in candidates}
+
+
+def artifact_response(
+    request: Request,
+    artifact: Artifact,
+    media_type: str,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serve an artifact with its ETag, answering matching GET/HEAD revalidations with 304."""
+    response_headers = {"ETag": artifact.etag, **(headers or {})}
+    if request.method in ("GET", "HEAD") and etag_matches(request, artifact.etag):
+        return Response(status_code=304, headers={"ETag": artifact.etag})
+    return Response(content=artifact.data, media_type=media_type, headers=response_headers)
+
+
+_settings = get_settings()
+artifact_cache = ArtifactCache(
+    Path(_settings.artifact_cache_dir) if _settings.artifact_cache_dir else None,
+    memory_max_bytes=_settings.artifact_cache_memory_bytes,
+    disk_max_bytes=_settings.artifact_cache_disk_bytes,
+    disk_max_age_seconds=_settings.artifact_cache_disk_max_age_seconds or None,
+)
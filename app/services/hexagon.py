@@ -0,0 +1,179 @@
+"""Hexagon grid layout, ported from ``frontend/src/utils/hexagon.js``.
+
+Axial coordinates with pointy-top hexagons. ``place_cards_on_grid`` uses the
+same seeded generator and placement order as the front end, so a given seed
+and card order produce the same board on both sides.
+"""
+import math
+import random
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+SQRT3 = math.sqrt(3)
+
+HEX_DIRECTIONS = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+RING_DIRECTIONS = [(-1, 1), (-1, 0), (0, -1), (1, -1), (1, 0), (0, 1)]
+
+# Same palette as frontend/src/components/Hexagon.jsx: (fill, stroke, text)
+THEME_COLORS: Dict[str, Dict[str, Tuple[str, str, str]]] = {
+    "blue": {
+        "center": ("#3B82F6", "#3B82F6", "#FFFFFF"),
+        "oft": ("#60A5FA", "#1D4ED8", "#1E3A8A"),
+        "manchmal": ("#DBEAFE", "#3B82F6", "#1E40AF"),
+    },
+    "green": {
+        "center": ("#10B981", "#10B981", "#FFFFFF"),
+        "oft": ("#6EE7B7", "#059669", "#064E3B"),
+        "manchmal": ("#D1FAE5", "#10B981", "#065F46"),
+    },
+    "purple": {
+        "center": ("#8B5CF6", "#8B5CF6", "#FFFFFF"),
+        "oft": ("#C4B5FD", "#7C3AED", "#4C1D95"),
+        "manchmal": ("#EDE9FE", "#8B5CF6", "#5B21B6"),
+    },
+    "pink": {
+        "center": ("#EC4899", "#EC4899", "#FFFFFF"),
+        "oft": ("#F9A8D4", "#DB2777", "#831843"),
+        "manchmal": ("#FCE7F3", "#EC4899", "#9F1239"),
+    },
+    "orange": {
+        "center": ("#F97316", "#F97316", "#FFFFFF"),
+        "oft": ("#FDBA74", "#EA580C", "#7C2D12"),
+        "manchmal": ("#FFEDD5", "#F97316", "#9A3412"),
+    },
+    "teal": {
+        "center": ("#14B8A6", "#14B8A6", "#FFFFFF"),
+        "oft": ("#5EEAD4", "#0D9488", "#134E4A"),
+        "manchmal": ("#CCFBF1", "#14B8A6", "#115E59"),
+    },
+    "dark": {
+        "center": ("#4F46E5", "#4F46E5", "#FFFFFF"),
+        "oft": ("#374151", "#1F2937", "#F9FAFB"),
+        "manchmal": ("#111827", "#374151", "#D1D5DB"),
+    },
+}
+
+CENTER_WORD = "Ich bin"
+
+
+class Placement(NamedTuple):
+    """A word placed on the grid at axial coordinates (q, r)."""
+
+    q: int
+    r: int
+    word: str
+    bucket: str  # center, oft, manchmal
+
+
+def hex_to_pixel(q: int, r: int, size: float) -> Tuple[float, float]:
+    """Convert axial coordinates to pixel position (y grows downwards, as in SVG)."""
+    x = size * (SQRT3 * q + SQRT3 / 2 * r)
+    y = size * (3 / 2 * r)
+    return x, y
+
+
+def hex_neighbors(q: int, r: int) -> List[Tuple[int, int]]:
+    return [(q + dq, r + dr) for dq, dr in HEX_DIRECTIONS]
+
+
+def hex_ring(center: Tuple[int, int], radius: int) -> List[Tuple[int, int]]:
+    if radius == 0:
+        return [center]
+
+    results = []
+    q, r = center[0] + radius, center[1] - radius
+    for dq, dr in RING_DIRECTIONS:
+        for _ in range(radius):
+            results.append((q, r))
+            q, r = q + dq, r + dr
+    return results
+
+
+def hexagon_points(size: float) -> List[Tuple[float, float]]:
+    """Return the six vertices of a hexagon centred on the origin, starting at the top."""
+    points = []
+    for i in range(6):
+        angle = (math.pi / 3) * i - math.pi / 2
+        points.append((size * math.cos(angle), size * math.sin(angle)))
+    return points
+
+
+def seeded_random(seed: int) -> Callable[[], float]:
+    """
+    The front end's LCG, including JavaScript number semantics.
+
+    The multiplication happens in double precision and ``&`` truncates to a
+    32-bit integer first, exactly as in the browser.
+    """
+    state = seed
+
+    def next_value() -> float:
+        nonlocal state
+        product = float(state) * 1103515245.0 + 12345.0
+        state = (int(product) % 2 ** 32) & 0x7FFFFFFF
+        return state / 0x7FFFFFFF
+
+    return next_value
+
+
+def place_cards_on_grid(
+    oft_words: Sequence[str],
+    manchmal_words: Sequence[str],
+    seed: Optional[int] = None,
+) -> List[Placement]:
+    """Place "Ich bin" in the centre, then all "oft" and then all "manchmal" words on random free neighbours."""
+    rand = seeded_random(seed) if seed is not None else random.random
+
+    center = (0, 0)
+    placements = [Placement(0, 0, CENTER_WORD, "center")]
+    occupied = {center}
+    available: List[Tuple[int, int]] = hex_neighbors(*center)
+
+    def place(word: str, bucket: str) -> None:
+        if not available:
+            max_radius = max(max(abs(q), abs(r), abs(q + r)) for q, r in occupied)
+            available.extend(hex for hex in hex_ring(center, max_radius + 1) if hex not in occupied)
+        if not available:
+            return
+
+        position = available.pop(math.floor(rand() * len(available)))
+        placements.append(Placement(position[0], position[1], word, bucket))
+        occupied.add(position)
+
+        for neighbor in hex_neighbors(*position):
+            if neighbor not in occupied and neighbor not in available:
+                available.append(neighbor)
+
+    for word in oft_words:
+        place(word, "oft")
+    for word in manchmal_words:
+        place(word, "manchmal")
+
+    return placements
+
+
+def split_word(text: str, max_length: int = 11) -> List[str]:
+    """Split long words into up to three lines, as the front end does."""
+    if len(text) <= max_length:
+        return [text]
+
+    parts = [part for part in text.replace("-", " ").split() if part]
+    if len(parts) > 1:
+        lines = []
+        current = ""
+        for part in parts:
+            if len(current + (" " if current else "") + part) <= max_length:
+                current = f"{current} {part}" if current else part
+            else:
+                if current:
+                    lines.append(current)
+                current = part
+        if current:
+            lines.append(current)
+        return lines[:3]
+
+    chunk = math.ceil(len(text) / 2)
+    first, second = text[:chunk], text[chunk:]
+    if len(second) > max_length:
+        chunk2 = math.ceil(len(second) / 2)
+        return [first + "-", second[:chunk2] + "-", second[chunk2:]]
+    return [first + "-", second]
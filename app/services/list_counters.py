@@ -0,0 +1,103 @@
+"""Denormalized adjective counters and content version on lists.
+
+``lists.adjective_count`` and ``lists.active_adjective_count`` mirror the
+adjectives table, and ``lists.content_version`` increases with every change
+to a list's content. Writers call ``record_adjective_change`` in the same
+transaction as the adjective write; ``recount_lists`` repairs drift.
+
+Run ``python -m app.services.list_counters`` to recount every list.
+"""
+import asyncio
+import logging
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.adjective import Adjective
+from app.models.list import List as ListModel
+
+logger = logging.getLogger(__name__)
+
+
+async def record_adjective_change(
+    db: AsyncSession,
+    list_id: int,
+    *,
+    added: int = 0,
+    active_added: int = 0,
+) -> None:
+    """
+    Adjust a list's counters by the given deltas and bump its content version.
+
+    The increments happen in SQL, so concurrent writers cannot lose updates,
+    and they commit or roll back together with the adjective write.
+    """
+    await db.execute(
+        update(ListModel)
+        .where(ListModel.id == list_id)
+        .values(
+            adjective_count=ListModel.adjective_count + added,
+            active_adjective_count=ListModel.active_adjective_count + active_added,
+            content_version=ListModel.content_version + 1,
+        )
+    )
+
+
+async def bump_content_version(db: AsyncSession, list_id: int) -> None:
+    """Mark a list's content as changed without changing its counters."""
+    await record_adjective_change(db, list_id)
+
+
+def list_content_etag(list_obj: ListModel) -> str:
+    """Strong ETag for the adjectives of a list; ``created_at`` guards against reused ids."""
+    created = int(list_obj.created_at.timestamp() * 1000) if list_obj.created_at else 0
+    return f'"list-{list_obj.id}-{created}-v{list_obj.content_version}"'
+
+
+async def recount_lists(db: AsyncSession, list_ids: Optional[Sequence[int]] = None) -> int:
+    """
+    Recompute the counters of ``list_ids`` (all lists if omitted) from the adjectives table.
+
+    Only lists whose counters drifted are written, and their content version
+    is bumped. Returns the number of lists that were corrected.
+    """
+    total = (
+        select(func.count(Adjective.id))
+        .where(Adjective.list_id == ListModel.id)
+        .scalar_subquery()
+    )
+    active = (
+        select(func.count(Adjective.id))
+        .where(and_(Adjective.list_id == ListModel.id, Adjective.active == True))  # noqa: E712
+        .scalar_subquery()
+    )
+    stmt = (
+        update(ListModel)
+        .where(or_(ListModel.adjective_count != total, ListModel.active_adjective_count != active))
+        .values(
+            adjective_count=total,
+            active_adjective_count=active,
+            content_version=ListModel.content_version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if list_ids is not None:
+        stmt = stmt.where(ListModel.id.in_(list_ids))
+    result = await db.execute(stmt)
+    return result.rowcount
+
+
+async def run_recount() -> None:
+    """Recount every list and report how many had drifted."""
+    from app.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    async with SessionLocal() as session:
+        corrected = await recount_lists(session)
+        await session.commit()
+    logger.info("Recounted adjectives, corrected %d lists", corrected)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_recount())
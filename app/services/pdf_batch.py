@@ -0,0 +1,191 @@
+"""Class-wide PDF export: many analytics sessions in one download."""
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.adjective import Adjective
+from app.models.analytics import AnalyticsAssignment, AnalyticsSession
+from app.services.artifact_cache import artifact_cache, artifact_key
+from app.services.pdf_jobs import FAILED, pdf_jobs
+from app.services.pdf_render import render_hexagon_pdf, render_hexagon_pdf_pages
+
+MAX_BATCH_SESSIONS = 200
+
+
+@dataclass
+class SessionBoard:
+    """Cards of one analytics session in sorting order."""
+
+    session_id: str
+    started_at: datetime
+    cards: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def seed(self) -> int:
+        # Stable per session so repeated exports show the same layout
+        return int(self.session_id.replace("-", "")[:8], 16)
+
+    @property
+    def footer_text(self) -> str:
+        return self.started_at.strftime("%d.%m.%Y")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def load_session_boards(
+    db: AsyncSession,
+    *,
+    list_id: int,
+    session_ids: Optional[Sequence[str]] = None,
+    started_from: Optional[datetime] = None,
+    started_until: Optional[datetime] = None,
+) -> List[SessionBoard]:
+    """
+    Load the boards to export for a list with two queries.
+
+    Explicit ``session_ids`` must all belong to the list; otherwise every
+    finished session in the optional time window is exported.
+    """
+    stmt = select(AnalyticsSession.id, AnalyticsSession.started_at).where(AnalyticsSession.list_id == list_id)
+    if session_ids:
+        stmt = stmt.where(AnalyticsSession.id.in_(set(session_ids)))
+    else:
+        stmt = stmt.where(AnalyticsSession.finished_at.is_not(None))
+        if started_from:
+            stmt = stmt.where(AnalyticsSession.started_at >= _naive_utc(started_from))
+        if started_until:
+            stmt = stmt.where(AnalyticsSession.started_at < _naive_utc(started_until))
+    stmt = stmt.order_by(AnalyticsSession.started_at, AnalyticsSession.id).limit(MAX_BATCH_SESSIONS + 1)
+
+    result = await db.execute(stmt)
+    boards: Dict[str, SessionBoard] = {
+        session_id: SessionBoard(session_id=session_id, started_at=started_at)
+        for session_id, started_at in result.all()
+    }
+
+    if session_ids:
+        unknown = set(session_ids) - set(boards)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Sessions not found for this list: {', '.join(sorted(unknown))}",
+            )
+    if len(boards) > MAX_BATCH_SESSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SESSIONS} sessions can be exported at once, narrow the time window",
+        )
+    if not boards:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No sessions to export")
+
+    cards_result = await db.execute(
+        select(AnalyticsAssignment.session_id, Adjective.word, AnalyticsAssignment.bucket)
+        .join(Adjective, Adjective.id == AnalyticsAssignment.adjective_id)
+        .where(
+            AnalyticsAssignment.session_id.in_(list(boards)),
+            AnalyticsAssignment.bucket.in_(("oft", "manchmal")),
+        )
+        .order_by(AnalyticsAssignment.assigned_at, AnalyticsAssignment.id)
+    )
+    for session_id, word, bucket in cards_result.all():
+        boards[session_id].cards.append((word, bucket))
+
+    return list(boards.values())
+
+
+async def _render(key: str, func, *args) -> bytes:
+    """Render on the job pool through the artifact cache; student PDFs stay in the memory tier."""
+    async def render() -> bytes:
+        job = await pdf_jobs.submit(func, *args)
+        await pdf_jobs.wait(job)
+        if job.status == FAILED:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"PDF rendering failed: {job.error}",
+            )
+        return job.result
+
+    return (await artifact_cache.get_or_create(key, render, persist=False)).data
+
+
+async def render_boards_pdf(boards: Sequence[SessionBoard], theme: str) -> bytes:
+    """
+    Render all boards as one multi-page PDF on the job pool.
+
+    ReportLab only writes the cross-reference table once all pages exist, so
+    the document cannot be streamed page by page. Vector pages are a few
+    kilobytes each and exports are capped at ``MAX_BATCH_SESSIONS``, which
+    bounds its size. Rendering finishes before the response starts, so
+    failures are reported with a proper status code.
+    """
+    pages = [(board.cards, board.seed, board.footer_text) for board in boards]
+    return await _render(artifact_key("hexagon-pdf-pages", pages, theme), render_hexagon_pdf_pages, pages, theme)
+
+
+class _ZipStream:
+    """Write-only file object that hands out whatever zipfile wrote since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _render_board(board: SessionBoard, theme: str) -> bytes:
+    return await _render(
+        artifact_key("hexagon-pdf", board.cards, theme, board.seed, board.footer_text),
+        render_hexagon_pdf,
+        board.cards,
+        theme,
+        board.seed,
+        board.footer_text,
+    )
+
+
+async def stream_boards_zip(boards: Sequence[SessionBoard], theme: str) -> AsyncIterator[bytes]:
+    """
+    Start a ZIP with one PDF per board, streamed as each PDF is ready.
+
+    The first PDF is rendered before this returns, so a full or failing
+    render pool is reported with a proper status code. Once the response has
+    started, a board that fails is written into the archive as a ``.txt``
+    note instead, so the download is still a complete ZIP and the gap is
+    visible.
+    """
+    first_pdf = await _render_board(boards[0], theme)
+    return _zip_boards(boards, theme, first_pdf)
+
+
+async def _zip_boards(boards: Sequence[SessionBoard], theme: str, first_pdf: bytes) -> AsyncIterator[bytes]:
+    stream = _ZipStream()
+    # PDFs are already compressed, storing them keeps the ZIP cheap to build
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for index, board in enumerate(boards, start=1):
+            name = f"{index:03d}_{board.started_at:%Y-%m-%d_%H%M}"
+            try:
+                pdf = first_pdf if index == 1 else await _render_board(board, theme)
+            except HTTPException as exc:
+                archive.writestr(f"{name}_FEHLER.txt", f"{exc.detail}\n")
+            else:
+                archive.writestr(f"{name}.pdf", pdf)
+            yield stream.drain()
+    yield stream.drain()
@@ -0,0 +1,280 @@
+"""Job queue for PDF rendering on a worker process pool."""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class PdfJob:
+    """A submitted render job and, once finished, its PDF bytes."""
+
+    id: str
+    session_id: Optional[str] = None
+    filename: str = "ich-bin-vielseitig.pdf"
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[bytes] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def queue_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return round((self.started_at - self.created_at) * 1000, 2)
+
+    @property
+    def render_ms(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round((self.finished_at - self.started_at) * 1000, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "queue_ms": self.queue_ms,
+            "render_ms": self.render_ms,
+            "size_bytes": len(self.result) if self.result is not None else None,
+            "error": self.error,
+        }
+
+
+class PdfJobManager:
+    """
+    Runs render functions off the event loop and keeps their results for polling.
+
+    In ``process`` mode jobs run on a ProcessPoolExecutor, at most
+    ``max_workers`` at a time; the rest wait in the queue. A job that times
+    out is reported as failed right away but holds its slot until the worker
+    actually finishes. ``inline`` mode
+    renders synchronously on submit, which keeps tests deterministic.
+    Finished jobs are kept for ``result_ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: str = "process",
+        max_workers: int = 2,
+        max_pending_jobs: int = 32,
+        job_timeout_seconds: float = 30,
+        result_ttl_seconds: float = 300,
+    ):
+        if mode not in ("process", "inline"):
+            raise ValueError(f"Unknown PDF render mode {mode!r}, expected 'process' or 'inline'")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.job_timeout_seconds = job_timeout_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._jobs: Dict[str, PdfJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_render_ms = 0.0
+        self._total_render_ms = 0.0
+        self._total_queue_ms = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        # Spawned workers only import the render module, and never inherit
+        # the event loop or database threads of the web process
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    async def submit(
+        self,
+        func: Callable[..., bytes],
+        *args: Any,
+        session_id: Optional[str] = None,
+        filename: str = "ich-bin-vielseitig.pdf",
+    ) -> PdfJob:
+        """
+        Queue ``func(*args)`` and return its job immediately.
+
+        Raises 503 if too many jobs are already waiting.
+        """
+        self._prune()
+        if self.pending >= self.max_pending_jobs:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many PDF exports in progress, please retry",
+            )
+
+        job = PdfJob(id=str(uuid4()), session_id=session_id, filename=filename)
+        self._jobs[job.id] = job
+        self.submitted += 1
+
+        if self.mode == "inline":
+            job.started_at = time.monotonic()
+            try:
+                result = func(*args)
+            except Exception as exc:
+                self._finish(job, error=str(exc) or type(exc).__name__)
+            else:
+                self._finish(job, result=result)
+            return job
+
+        task = asyncio.create_task(self._run(job, func, args), name=f"pdf-job-{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: PdfJob, func: Callable[..., bytes], args: tuple) -> None:
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # A timed out render keeps its worker busy, so the slot is only freed
+        # once the worker is done; otherwise the pool would be oversubscribed
+        future.add_done_callback(lambda _: self._release_slot(loop))
+
+        job.status = RUNNING
+        job.started_at = time.monotonic()
+        result_future = asyncio.wrap_future(future)
+        try:
+            done, _ = await asyncio.wait({result_future}, timeout=self.job_timeout_seconds)
+            if not done:
+                future.cancel()
+                # Consume the late result or error so it is not reported as unretrieved
+                result_future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self.timed_out += 1
+                self._finish(job, error="PDF rendering timed out")
+                return
+            result = result_future.result()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            logger.exception("PDF job %s failed", job.id)
+            self._finish(job, error=str(exc) or type(exc).__name__)
+        else:
+            self._finish(job, result=result)
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Called from the executor's thread
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:
+            pass  # loop already closed at shutdown
+
+    def _finish(self, job: PdfJob, *, result: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        job.finished_at = time.monotonic()
+        if error is None:
+            job.status = DONE
+            job.result = result
+            self.completed += 1
+        else:
+            job.status = FAILED
+            job.error = error
+            self.failed += 1
+
+        self._total_queue_ms += job.queue_ms or 0.0
+        self._total_render_ms += job.render_ms or 0.0
+        self.max_render_ms = max(self.max_render_ms, job.render_ms or 0.0)
+        job.done.set()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[PdfJob]:
+        """Return a job that is still pending or whose result has not expired."""
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: PdfJob, timeout: Optional[float] = None) -> PdfJob:
+        """Wait until ``job`` finished or ``timeout`` seconds passed."""
+        if not job.finished:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def shutdown(self) -> None:
+        """Cancel queued jobs and stop the worker processes."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counters and render timings."""
+        finished = self.completed + self.failed
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "pending": self.pending,
+            "stored_jobs": len(self._jobs),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_queue_ms": round(self._total_queue_ms / finished, 2) if finished else 0.0,
+            "avg_render_ms": round(self._total_render_ms / finished, 2) if finished else 0.0,
+            "max_render_ms": round(self.max_render_ms, 2),
+        }
+
+
+_settings = get_settings()
+pdf_jobs = PdfJobManager(
+    mode=_settings.pdf_render_mode,
+    max_workers=_settings.pdf_render_workers,
+    max_pending_jobs=_settings.pdf_max_pending_jobs,
+    job_timeout_seconds=_settings.pdf_render_timeout_seconds,
+    result_ttl_seconds=_settings.pdf_job_result_ttl_seconds,
+)
@@ -0,0 +1,272 @@
+"""ReportLab rendering functions executed by the PDF job workers.
+
+Everything here is a plain top-level function taking bytes (or the path of
+a spooled upload) and returning bytes so it can be pickled to a worker
+process; nothing touches the database or the
+event loop.
+"""
+import io
+from typing import Optional, Sequence, Tuple, Union
+
+from PIL import Image
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from app.services.hexagon import THEME_COLORS, hex_to_pixel, hexagon_points, place_cards_on_grid, split_word
+
+# Layout unit of the hexagon grid before it is scaled onto the page
+HEX_SIZE = 60.0
+STROKE_WIDTHS = {"center": 3.5, "oft": 3.0, "manchmal": 2.0}
+
+# QR sheet grid on portrait A4
+QR_SHEET_COLUMNS = 3
+QR_SHEET_ROWS = 4
+
+
+def check_image_pixels(image: Image.Image, max_pixels: Optional[int]) -> None:
+    """Raise ``ValueError`` for images larger than ``max_pixels``; only reads the header."""
+    if max_pixels and image.width * image.height > max_pixels:
+        raise ValueError(f"Snapshot has {image.width}x{image.height} pixels, the limit is {max_pixels}")
+
+
+def render_snapshot_pdf(
+    image: Union[bytes, str],
+    footer_text: str,
+    max_dpi: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+) -> bytes:
+    """
+    Render a front-end snapshot onto a landscape A4 page with a date footer.
+
+    ``image`` is the encoded PNG/WebP or the path of a file holding it. With
+    ``max_dpi`` the image is first downscaled to what the printable area can
+    show at that resolution. Images above ``max_pixels`` are rejected before
+    they are decoded.
+    """
+    source = io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image
+    pdf_buffer = io.BytesIO()
+    page_width, page_height = landscape(A4)
+    margin = 1.5 * cm
+    footer_space = 1.0 * cm
+    content_width = page_width - 2 * margin
+    content_height = page_height - 2 * margin - footer_space
+
+    c = canvas.Canvas(pdf_buffer, pagesize=landscape(A4))
+
+    snapshot = Image.open(source)
+    check_image_pixels(snapshot, max_pixels)
+    if max_dpi:
+        # Points are 1/72 inch
+        snapshot.thumbnail(
+            (round(content_width / 72 * max_dpi), round(content_height / 72 * max_dpi)),
+            Image.Resampling.LANCZOS,
+        )
+    reader = ImageReader(snapshot)
+    img_width, img_height = reader.getSize()
+    img_ratio = img_width / img_height
+    box_ratio = content_width / content_height
+
+    if img_ratio >= box_ratio:
+        draw_width = content_width
+        draw_height = content_width / img_ratio
+    else:
+        draw_height = content_height
+        draw_width = content_height * img_ratio
+
+    x = (page_width - draw_width) / 2
+    y = (page_height - footer_space - draw_height) / 2 + footer_space / 2
+
+    c.drawImage(
+        reader,
+        x,
+        y,
+        width=draw_width,
+        height=draw_height,
+        preserveAspectRatio=True,
+        mask="auto",
+    )
+    snapshot.close()
+
+    # Footer date (spec: DD.MM.YYYY)
+    c.setFont("Helvetica", 9)
+    c.drawCentredString(page_width / 2, margin / 2, footer_text)
+
+    c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def render_hexagon_pdf(
+    cards: Sequence[Tuple[str, str]],
+    theme: str,
+    seed: Optional[int],
+    footer_text: str,
+) -> bytes:
+    """
+    Draw the "Ich bin" hexagon board as vector shapes on a landscape A4 page.
+
+    ``cards`` are ``(word, bucket)`` pairs in sorting order; "selten" cards
+    are skipped, as on the results page.
+    """
+    return render_hexagon_pdf_pages([(cards, seed, footer_text)], theme)
+
+
+def render_hexagon_pdf_pages(
+    boards: Sequence[Tuple[Sequence[Tuple[str, str]], Optional[int], str]],
+    theme: str,
+) -> bytes:
+    """Render one board per page; ``boards`` are ``(cards, seed, footer_text)`` tuples."""
+    pdf_buffer = io.BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=landscape(A4))
+    for cards, seed, footer_text in boards:
+        _draw_hexagon_page(c, cards, theme, seed, footer_text)
+        c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def _draw_hexagon_page(
+    c: canvas.Canvas,
+    cards: Sequence[Tuple[str, str]],
+    theme: str,
+    seed: Optional[int],
+    footer_text: str,
+) -> None:
+    colors = THEME_COLORS.get(theme, THEME_COLORS["blue"])
+    placements = place_cards_on_grid(
+        [word for word, bucket in cards if bucket == "oft"],
+        [word for word, bucket in cards if bucket == "manchmal"],
+        seed,
+    )
+
+    page_width, page_height = landscape(A4)
+    margin = 1.5 * cm
+    footer_space = 1.0 * cm
+    content_width = page_width - 2 * margin
+    content_height = page_height - 2 * margin - footer_space
+
+    # Fit the grid's bounding box (with the same padding as the SVG viewBox)
+    centers = [hex_to_pixel(p.q, p.r, HEX_SIZE) for p in placements]
+    padding = HEX_SIZE * 1.5
+    min_x = min(x for x, _ in centers) - padding
+    max_x = max(x for x, _ in centers) + padding
+    min_y = min(y for _, y in centers) - padding
+    max_y = max(y for _, y in centers) + padding
+    scale = min(content_width / (max_x - min_x), content_height / (max_y - min_y))
+
+    offset_x = (page_width - (max_x - min_x) * scale) / 2
+    offset_top = (page_height + footer_space + (max_y - min_y) * scale) / 2
+
+    size = HEX_SIZE * scale
+    outline = hexagon_points(size)
+
+    for placement, (px, py) in zip(placements, centers):
+        # SVG y grows downwards, PDF y upwards
+        cx = offset_x + (px - min_x) * scale
+        cy = offset_top - (py - min_y) * scale
+        fill, stroke, text_color = colors[placement.bucket]
+
+        path = c.beginPath()
+        path.moveTo(cx + outline[0][0], cy - outline[0][1])
+        for vx, vy in outline[1:]:
+            path.lineTo(cx + vx, cy - vy)
+        path.close()
+
+        c.saveState()
+        c.setFillColor(HexColor(fill))
+        c.setStrokeColor(HexColor(stroke))
+        c.setLineWidth(STROKE_WIDTHS[placement.bucket] * scale)
+        c.drawPath(path, fill=1, stroke=1)
+        c.clipPath(path, stroke=0, fill=0)
+
+        lines = split_word(placement.word)
+        allowed_width = size * 1.6
+        font_size = min(
+            min(size * 0.35, max(size * 0.16, allowed_width / max(1, len(line) * 0.58)))
+            for line in lines
+        )
+        line_height = font_size * 1.08
+        first_line_y = cy + (len(lines) - 1) * line_height / 2
+
+        c.setFillColor(HexColor(text_color))
+        c.setFont("Helvetica-Bold" if placement.bucket in ("center", "oft") else "Helvetica", font_size)
+        for index, line in enumerate(lines):
+            # Shift the baseline so the line is vertically centred like dominant-baseline: central
+            c.drawCentredString(cx, first_line_y - index * line_height - font_size * 0.35, line)
+        c.restoreState()
+
+    # Footer date (spec: DD.MM.YYYY)
+    c.setFont("Helvetica", 9)
+    c.drawCentredString(page_width / 2, margin / 2, footer_text)
+
+
+def render_qr_sheet_pdf(entries: Sequence[Tuple[str, str, Sequence[bytes]]], footer_text: str) -> bytes:
+    """
+    Render a printable sheet of QR codes, twelve per portrait A4 page.
+
+    ``entries`` are ``(list_name, share_url, matrix)`` tuples; the matrix
+    rows hold 1 for a dark module, as cached by ``qr_render.qr_matrix``.
+    Modules are drawn as vector rectangles, one per horizontal run.
+    """
+    pdf_buffer = io.BytesIO()
+    page_width, page_height = A4
+    margin = 1.5 * cm
+    footer_space = 1.0 * cm
+    cell_width = (page_width - 2 * margin) / QR_SHEET_COLUMNS
+    cell_height = (page_height - 2 * margin - footer_space) / QR_SHEET_ROWS
+    label_space = 1.1 * cm
+    qr_size = min(cell_width, cell_height - label_space) - 0.6 * cm
+    per_page = QR_SHEET_COLUMNS * QR_SHEET_ROWS
+    page_count = max(1, -(-len(entries) // per_page))
+
+    c = canvas.Canvas(pdf_buffer, pagesize=A4)
+    for page in range(page_count):
+        for index, (name, url, matrix) in enumerate(entries[page * per_page:(page + 1) * per_page]):
+            column, row = index % QR_SHEET_COLUMNS, index // QR_SHEET_COLUMNS
+            cell_x = margin + column * cell_width
+            cell_top = page_height - margin - row * cell_height
+
+            # Quiet zone of two modules on each side, like the PNG/SVG output
+            module = qr_size / (len(matrix) + 4)
+            left = cell_x + (cell_width - qr_size) / 2 + 2 * module
+            top = cell_top - 0.3 * cm - 2 * module
+            path = c.beginPath()
+            for y, modules in enumerate(matrix):
+                x = 0
+                while x < len(modules):
+                    if modules[x]:
+                        start = x
+                        while x < len(modules) and modules[x]:
+                            x += 1
+                        path.rect(left + start * module, top - (y + 1) * module, (x - start) * module, module)
+                    else:
+                        x += 1
+            c.setFillColor(HexColor("#000000"))
+            c.drawPath(path, fill=1, stroke=0)
+
+            center_x = cell_x + cell_width / 2
+            label_y = cell_top - 0.3 * cm - qr_size - 0.45 * cm
+            c.setFont("Helvetica-Bold", 11)
+            c.drawCentredString(center_x, label_y, _fit_text(name, "Helvetica-Bold", 11, cell_width - 0.4 * cm))
+            c.setFont("Helvetica", 7)
+            c.setFillColor(HexColor("#6B7280"))
+            c.drawCentredString(center_x, label_y - 0.4 * cm, _fit_text(url, "Helvetica", 7, cell_width - 0.4 * cm))
+
+        c.setFillColor(HexColor("#000000"))
+        c.setFont("Helvetica", 9)
+        c.drawCentredString(page_width / 2, margin / 2, f"{footer_text} \u2013 {page + 1}/{page_count}")
+        c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def _fit_text(text: str, font: str, size: float, max_width: float) -> str:
+    if stringWidth(text, font, size) <= max_width:
+        return text
+    while text and stringWidth(text + "\u2026", font, size) > max_width:
+        text = text[:-1]
+    return text + "\u2026"
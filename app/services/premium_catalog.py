@@ -0,0 +1,74 @@
+"""In-process cache of the serialized premium list catalog."""
+import time
+from typing import Any, Dict, Optional
+
+from app.config import get_settings
+
+
+class PremiumCatalogCache:
+    """
+    Holds the premium catalog response body as bytes.
+
+    Premium lists only change when they are seeded, so the body is kept until
+    ``invalidate()`` bumps the version. The TTL bounds how long other worker
+    processes, which do not see the bump, can serve an outdated catalog.
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._body: Optional[bytes] = None
+        self._body_version = -1
+        self._cached_at = 0.0
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every invalidation; guards against caching stale reads."""
+        return self._version
+
+    def get(self) -> Optional[bytes]:
+        """Return the cached body, or None if it is missing, outdated or expired."""
+        if (
+            self._body is None
+            or self._body_version != self._version
+            or time.monotonic() - self._cached_at > self.ttl_seconds
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._body
+
+    def set(self, body: bytes, version: int) -> None:
+        """Store a body built from data read at ``version``; dropped if an invalidation happened since."""
+        if version != self._version:
+            return
+        self._body = body
+        self._body_version = version
+        self._cached_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Mark the catalog as changed (a premium list or its adjectives were written)."""
+        self._version += 1
+        self.invalidations += 1
+        self._body = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current version."""
+        lookups = self.hits + self.misses
+        return {
+            "version": self._version,
+            "cached": self._body is not None,
+            "size_bytes": len(self._body) if self._body is not None else 0,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_settings = get_settings()
+premium_catalog = PremiumCatalogCache(ttl_seconds=_settings.premium_catalog_ttl_seconds)
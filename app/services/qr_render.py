@@ -0,0 +1,85 @@
+"""QR code rendering from a cached module matrix.
+
+Encoding and error correction are the expensive part of a QR code, so the
+module matrix is computed once per share URL and every output format and
+size is drawn from it.
+"""
+import io
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import qrcode
+from PIL import Image
+
+# Matrix rows are bytes with 1 for a dark module, without the quiet zone
+QrMatrix = Tuple[bytes, ...]
+
+QR_BOX_SIZE = 10  # pixels per module when no size is requested
+QR_BORDER = 2  # quiet zone in modules
+QR_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+@lru_cache(maxsize=4096)
+def qr_matrix(data: str) -> QrMatrix:
+    """Encode ``data`` once and return its module matrix."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=0,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return tuple(bytes(1 if dark else 0 for dark in row) for row in qr.get_matrix())
+
+
+def box_size_for(matrix: QrMatrix, size: Optional[int], border: int = QR_BORDER) -> int:
+    """Largest whole number of pixels per module that fits into ``size`` pixels."""
+    if size is None:
+        return QR_BOX_SIZE
+    return max(1, size // (len(matrix) + 2 * border))
+
+
+def render_qr_png(matrix: QrMatrix, box_size: int = QR_BOX_SIZE, border: int = QR_BORDER) -> bytes:
+    """Draw the matrix as a black-on-white PNG with square modules."""
+    modules = len(matrix)
+    core = Image.new("1", (modules, modules))
+    core.putdata([0 if dark else 255 for row in matrix for dark in row])
+
+    image = Image.new("1", (modules + 2 * border, modules + 2 * border), 255)
+    image.paste(core, (border, border))
+    image = image.resize((image.width * box_size, image.height * box_size), Image.NEAREST)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_qr_svg(matrix: QrMatrix, box_size: int = QR_BOX_SIZE, border: int = QR_BORDER) -> bytes:
+    """Draw the matrix as an SVG path in module units; runs of dark modules share one segment."""
+    total = len(matrix) + 2 * border
+    segments = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if row[x]:
+                start = x
+                while x < len(row) and row[x]:
+                    x += 1
+                segments.append(f"M{start + border} {y + border}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+
+    pixels = total * box_size
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {total} {total}" shape-rendering="crispEdges">'
+        f'<rect width="{total}" height="{total}" fill="#fff"/>'
+        f'<path fill="#000" d="{"".join(segments)}"/></svg>'
+    )
+    return svg.encode("utf-8")
+
+
+def qr_matrix_stats() -> Dict[str, int]:
+    """Return hit counters of the matrix cache."""
+    info = qr_matrix.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize, "max_entries": info.maxsize}
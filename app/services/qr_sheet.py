@@ -0,0 +1,133 @@
+"""Printable QR code sheets for all or selected shared lists of a teacher."""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.list import List as ListModel
+from app.services.artifact_cache import Artifact, artifact_cache, artifact_key
+from app.services.pdf_jobs import FAILED, pdf_jobs
+from app.services.pdf_render import render_qr_sheet_pdf
+from app.services.qr_render import QrMatrix, qr_matrix
+
+logger = logging.getLogger(__name__)
+
+MAX_QR_SHEET_LISTS = 300
+STREAM_CHUNK_SIZE = 64 * 1024
+SHEET_FOOTER = "Ich bin vielseitig"
+# Sheets at least this large are logged with their timings
+TIMING_LOG_THRESHOLD = 50
+
+
+@dataclass
+class QrSheet:
+    """A rendered sheet and where its time went."""
+
+    artifact: Artifact
+    list_count: int
+    matrix_ms: float
+    render_ms: float
+
+    def chunks(self) -> Iterator[bytes]:
+        data = self.artifact.data
+        for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+            yield data[offset:offset + STREAM_CHUNK_SIZE]
+
+    @property
+    def server_timing(self) -> str:
+        return f"matrices;dur={self.matrix_ms}, render;dur={self.render_ms}"
+
+
+async def load_sheet_lists(
+    db: AsyncSession,
+    *,
+    owner_user_id: int,
+    list_ids: Optional[Sequence[int]] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Return ``(name, share_token)`` of the lists to print, in one query.
+
+    Explicit ``list_ids`` keep their order and must all be owned and shared;
+    otherwise every shared list of the owner is printed, sorted by name.
+    """
+    stmt = select(ListModel.id, ListModel.name, ListModel.share_token, ListModel.share_enabled).where(
+        ListModel.owner_user_id == owner_user_id
+    )
+    if list_ids:
+        stmt = stmt.where(ListModel.id.in_(set(list_ids)))
+    else:
+        stmt = stmt.where(ListModel.share_enabled == True, ListModel.share_token.is_not(None))  # noqa: E712
+    stmt = stmt.order_by(ListModel.name, ListModel.id).limit(MAX_QR_SHEET_LISTS + 1)
+    rows = (await db.execute(stmt)).all()
+
+    if list_ids:
+        by_id = {row.id: row for row in rows}
+        missing = [list_id for list_id in list_ids if list_id not in by_id]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Lists not found: {', '.join(map(str, missing))}",
+            )
+        not_shared = [
+            by_id[list_id].name for list_id in list_ids
+            if not (by_id[list_id].share_enabled and by_id[list_id].share_token)
+        ]
+        if not_shared:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"List sharing is not enabled for: {', '.join(not_shared)}",
+            )
+        rows = [by_id[list_id] for list_id in dict.fromkeys(list_ids)]
+
+    if len(rows) > MAX_QR_SHEET_LISTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_QR_SHEET_LISTS} lists fit on one QR sheet",
+        )
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No shared lists to print")
+    return [(row.name, row.share_token) for row in rows]
+
+
+def _matrices(urls: Sequence[str]) -> List[QrMatrix]:
+    return [qr_matrix(url) for url in urls]
+
+
+async def render_qr_sheet(lists: Sequence[Tuple[str, str]], base_url: str) -> QrSheet:
+    """Render the sheet for ``(name, share_token)`` pairs, reusing cached matrices and sheets."""
+    urls = [f"{base_url}/l/{token}" for _, token in lists]
+
+    started = time.perf_counter()
+    # Uncached matrices cost a few milliseconds each, too long for the event loop
+    matrices = await asyncio.to_thread(_matrices, urls)
+    matrix_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    entries = [(name, url, matrix) for (name, _), url, matrix in zip(lists, urls, matrices)]
+
+    async def render() -> bytes:
+        job = await pdf_jobs.submit(render_qr_sheet_pdf, entries, SHEET_FOOTER)
+        await pdf_jobs.wait(job)
+        if job.status == FAILED:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"PDF rendering failed: {job.error}",
+            )
+        return job.result
+
+    started = time.perf_counter()
+    key = artifact_key("qr-sheet", [(name, url) for name, url, _ in entries], SHEET_FOOTER)
+    artifact = await artifact_cache.get_or_create(key, render)
+    render_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    sheet = QrSheet(artifact=artifact, list_count=len(entries), matrix_ms=matrix_ms, render_ms=render_ms)
+    if sheet.list_count >= TIMING_LOG_THRESHOLD:
+        logger.info(
+            "QR sheet with %d lists: matrices %.1f ms, render %.1f ms, %d bytes",
+            sheet.list_count, matrix_ms, render_ms, len(artifact.data),
+        )
+    return sheet
@@ -0,0 +1,169 @@
+"""Public access resolution for shared and default adjective lists."""
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List as ListType
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.adjective import Adjective
+from app.models.list import List
+from app.models.school import School
+from app.models.user import User
+
+
+class AccessVerdict(str, Enum):
+    """Outcome of checking whether a list may be opened without logging in."""
+
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    NOT_SHARED = "not_shared"
+    EXPIRED = "expired"
+    OWNER_INACTIVE = "owner_inactive"
+    SCHOOL_INACTIVE = "school_inactive"
+
+
+_DENIAL_DETAILS = {
+    AccessVerdict.NOT_SHARED: "This list is not shared",
+    AccessVerdict.EXPIRED: "Share link has expired",
+    AccessVerdict.OWNER_INACTIVE: "Owner account is not active",
+    AccessVerdict.SCHOOL_INACTIVE: "Owner's school is not active",
+}
+# The share link endpoint has always worded a disabled share differently
+_TOKEN_DENIAL_DETAILS = {**_DENIAL_DETAILS, AccessVerdict.NOT_SHARED: "This list is no longer shared"}
+
+
+@dataclass
+class ListAccess:
+    """Resolved list together with its owner, school, active adjectives and verdict."""
+
+    verdict: AccessVerdict
+    list_obj: Optional[List] = None
+    owner: Optional[User] = None
+    school: Optional[School] = None
+    adjectives: ListType[Adjective] = field(default_factory=list)
+    not_found_detail: str = "List not found"
+    by_token: bool = False
+
+    @property
+    def allowed(self) -> bool:
+        return self.verdict == AccessVerdict.OK
+
+    @property
+    def status_code(self) -> int:
+        if self.verdict == AccessVerdict.OK:
+            return status.HTTP_200_OK
+        if self.verdict == AccessVerdict.NOT_FOUND:
+            return status.HTTP_404_NOT_FOUND
+        return status.HTTP_403_FORBIDDEN
+
+    @property
+    def detail(self) -> Optional[str]:
+        if self.verdict == AccessVerdict.NOT_FOUND:
+            return self.not_found_detail
+        details = _TOKEN_DENIAL_DETAILS if self.by_token else _DENIAL_DETAILS
+        return details.get(self.verdict)
+
+    def raise_for_verdict(self) -> List:
+        """Return the list if access is allowed, otherwise raise the matching HTTP error."""
+        if not self.allowed:
+            raise HTTPException(status_code=self.status_code, detail=self.detail)
+        return self.list_obj
+
+
+def check_list_access(
+    list_obj: List,
+    owner: Optional[User],
+    school: Optional[School],
+    *,
+    by_token: bool = False,
+) -> AccessVerdict:
+    """
+    Apply the public access rules to an already loaded list.
+
+    Rules:
+    - Default list opened by id: always accessible
+    - Otherwise the share must be enabled and not expired; this also applies
+      to the default list when it is opened through its share token
+    - Owned lists additionally require an active owner in an active school
+    """
+    if list_obj.is_default and not by_token:
+        return AccessVerdict.OK
+
+    if not list_obj.share_enabled:
+        return AccessVerdict.NOT_SHARED
+
+    if list_obj.share_expires_at and datetime.utcnow() > list_obj.share_expires_at:
+        return AccessVerdict.EXPIRED
+
+    if not list_obj.is_default and list_obj.owner_user_id:
+        if not owner or owner.status != "active":
+            return AccessVerdict.OWNER_INACTIVE
+
+        if owner.school_id and (not school or school.status != "active"):
+            return AccessVerdict.SCHOOL_INACTIVE
+
+    return AccessVerdict.OK
+
+
+async def resolve_list_access(
+    db: AsyncSession,
+    *,
+    list_id: Optional[int] = None,
+    share_token: Optional[str] = None,
+    include_adjectives: bool = True,
+) -> ListAccess:
+    """
+    Resolve list, owner, school and active adjectives in at most two round trips.
+
+    Looks the list up by ``share_token`` or ``list_id``; with neither given the
+    default list is used. Token lookups enforce the share settings for the
+    default list as well. Owner and school are joined eagerly so the verdict
+    never needs a follow-up query. Active adjectives are loaded with a separate
+    query, and only for allowed lists, so ``List.adjectives`` is never
+    populated with a filtered subset in the session's identity map.
+    """
+    stmt = select(List).options(joinedload(List.owner).joinedload(User.school))
+
+    if share_token is not None:
+        stmt = stmt.where(List.share_token == share_token)
+        not_found_detail = "Share link not found"
+    elif list_id is not None:
+        stmt = stmt.where(List.id == list_id)
+        not_found_detail = "List not found"
+    else:
+        stmt = stmt.where(List.is_default == True)  # noqa: E712
+        not_found_detail = "Default list not found"
+
+    result = await db.execute(stmt)
+    list_obj = result.scalar_one_or_none()
+
+    if not list_obj:
+        return ListAccess(verdict=AccessVerdict.NOT_FOUND, not_found_detail=not_found_detail)
+
+    owner = list_obj.owner
+    school = owner.school if owner else None
+    by_token = share_token is not None
+    verdict = check_list_access(list_obj, owner, school, by_token=by_token)
+    adjectives = []
+    if include_adjectives and verdict == AccessVerdict.OK:
+        adjectives_result = await db.execute(
+            select(Adjective)
+            .where(Adjective.list_id == list_obj.id, Adjective.active == True)  # noqa: E712
+            .order_by(Adjective.order_index, Adjective.id)
+        )
+        adjectives = list(adjectives_result.scalars().all())
+
+    return ListAccess(
+        verdict=verdict,
+        list_obj=list_obj,
+        owner=owner,
+        school=school,
+        adjectives=adjectives,
+        not_found_detail=not_found_detail,
+        by_token=by_token,
+    )
@@ -0,0 +1,139 @@
+"""In-process cache of serialized share-link payloads."""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from app.config import get_settings
+
+
+@dataclass
+class SharePayload:
+    """Access verdict for a share token plus the pre-serialized response body."""
+
+    status_code: int
+    body: Optional[bytes] = None
+    detail: Optional[str] = None
+    list_id: Optional[int] = None
+    owner_user_id: Optional[int] = None
+    school_id: Optional[int] = None
+    share_expires_at: Optional[datetime] = None
+    cached_at: float = 0.0
+
+    def is_stale(self, ttl_seconds: int) -> bool:
+        """Return True if the entry outlived its TTL or the share link expired since caching."""
+        if time.monotonic() - self.cached_at > ttl_seconds:
+            return True
+        return bool(self.share_expires_at and datetime.utcnow() > self.share_expires_at)
+
+    def to_response(self) -> Response:
+        """Return the cached JSON body or raise the cached access error."""
+        if self.status_code != 200:
+            raise HTTPException(status_code=self.status_code, detail=self.detail)
+        return Response(content=self.body, media_type="application/json")
+
+
+class SharePayloadCache:
+    """Bounded LRU cache keyed by share token with explicit invalidation."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, SharePayload]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation; guards against caching stale reads."""
+        return self._generation
+
+    def get(self, token: str) -> Optional[SharePayload]:
+        """Return the cached payload for a token, or None on a miss."""
+        payload = self._entries.get(token)
+        if payload is None or payload.is_stale(self.ttl_seconds):
+            if payload is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: SharePayload, generation: Optional[int] = None) -> None:
+        """
+        Store a payload for a token.
+
+        If ``generation`` is given and an invalidation happened since it was read,
+        the payload may be based on stale data and is dropped.
+        """
+        if generation is not None and generation != self._generation:
+            return
+
+        payload.cached_at = time.monotonic()
+        self._entries[token] = payload
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _invalidate_where(self, attr: str, value: Optional[int]) -> int:
+        self._generation += 1
+        self.invalidations += 1
+        if value is None:
+            return 0
+        stale = [token for token, payload in self._entries.items() if getattr(payload, attr) == value]
+        for token in stale:
+            del self._entries[token]
+        return len(stale)
+
+    def invalidate_token(self, token: Optional[str]) -> None:
+        """Drop the entry for a single share token."""
+        self._generation += 1
+        self.invalidations += 1
+        if token:
+            self._entries.pop(token, None)
+
+    def invalidate_list(self, list_id: Optional[int]) -> int:
+        """Drop every entry for a list (content, sharing or token changed)."""
+        return self._invalidate_where("list_id", list_id)
+
+    def invalidate_user(self, user_id: Optional[int]) -> int:
+        """Drop every entry for lists owned by a user (status or school changed)."""
+        return self._invalidate_where("owner_user_id", user_id)
+
+    def invalidate_school(self, school_id: Optional[int]) -> int:
+        """Drop every entry for lists owned by users of a school (school status changed)."""
+        return self._invalidate_where("school_id", school_id)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_settings = get_settings()
+share_cache = SharePayloadCache(
+    max_entries=_settings.share_cache_max_entries,
+    ttl_seconds=_settings.share_cache_ttl_seconds,
+)
@@ -0,0 +1,73 @@
+"""Bounded spooling of streamed request bodies."""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload exceeds the limit of {max_bytes} bytes",
+    )
+
+
+def check_declared_length(content_length: Optional[str], max_bytes: int) -> None:
+    """Reject a request early if its Content-Length header already exceeds ``max_bytes``."""
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _too_large(max_bytes)
+
+
+async def limit_stream(chunks: AsyncIterator[bytes], *, max_bytes: int) -> AsyncIterator[bytes]:
+    """Pass chunks through, raising 413 as soon as more than ``max_bytes`` arrived."""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        yield chunk
+
+
+@dataclass
+class SpooledFile:
+    """An upload copied to a named temp file, so a worker process can open it by path."""
+
+    path: str
+    size: int
+    sha256: str
+
+    def head(self, length: int = 12) -> bytes:
+        with open(self.path, "rb") as handle:
+            return handle.read(length)
+
+    def remove(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_to_file(chunks: AsyncIterator[bytes], *, max_bytes: int, suffix: str = "") -> SpooledFile:
+    """
+    Copy a streamed body into a named temporary file, chunk by chunk.
+
+    Raises 413 as soon as more than ``max_bytes`` arrived, without reading
+    the rest, and hashes the body on the way so it never has to be held in
+    memory as a whole. The caller removes the file.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    handle = tempfile.NamedTemporaryFile(prefix="upload-", suffix=suffix, delete=False)
+    try:
+        with handle:
+            async for chunk in limit_stream(chunks, max_bytes=max_bytes):
+                handle.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+    except BaseException:
+        os.unlink(handle.name)
+        raise
+    return SpooledFile(path=handle.name, size=size, sha256=digest.hexdigest())
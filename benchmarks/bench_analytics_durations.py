@@ -0,0 +1,120 @@
+"""Time the session duration statistics against the size of the raw history.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_analytics_durations [--sessions 10000 100000 1000000]
+
+"python mean" is what the summary used to do: load every finished session's
+timestamps and average them in Python. "sql avg" pushes the same scan into
+SQLite. "histogram" is the /admin/analytics/durations endpoint reading the
+daily rollups; its cost depends on days x bins, not on the session count.
+Sessions are spread over one year in a temporary SQLite file.
+"""
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.admin_analytics import get_duration_distribution
+from app.models import AnalyticsSession, Base
+from app.services.analytics_rollup import rebuild_rollups
+
+DAYS = 365
+INSERT_BATCH = 50000
+
+
+def populate(path: Path, sessions: int) -> None:
+    """Bulk insert sessions with a skewed duration distribution through plain sqlite3."""
+    rng = random.Random(sessions)
+    first_day = datetime(2025, 1, 1, 8, 0)
+    connection = sqlite3.connect(path)
+    for offset in range(0, sessions, INSERT_BATCH):
+        rows = []
+        for _ in range(min(INSERT_BATCH, sessions - offset)):
+            started = first_day + timedelta(days=rng.randrange(DAYS), seconds=rng.randrange(36000))
+            finished = None
+            if rng.random() < 0.8:
+                finished = (started + timedelta(seconds=rng.lognormvariate(6, 0.6))).isoformat(" ")
+            rows.append((str(uuid.uuid4()), started.isoformat(" "), finished))
+        connection.executemany(
+            "INSERT INTO analytics_sessions (id, is_standard_list, started_at, finished_at) VALUES (?, 0, ?, ?)",
+            rows,
+        )
+    connection.commit()
+    connection.close()
+
+
+async def timed(func, repeat: int = 3) -> tuple:
+    """Return the result of the last run and the best of ``repeat`` runs in ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await func()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return result, best
+
+
+async def run(sessions: int, directory: Path) -> None:
+    path = directory / f"bench-{sessions}.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    populate(path, sessions)
+
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        await rebuild_rollups(db)
+        await db.commit()
+        rebuild_ms = (time.perf_counter() - started) * 1000
+
+        async def python_mean():
+            result = await db.execute(
+                select(AnalyticsSession.started_at, AnalyticsSession.finished_at)
+                .where(AnalyticsSession.finished_at != None)  # noqa: E711
+            )
+            return statistics.mean((finished - started).total_seconds() for started, finished in result.all())
+
+        async def sql_avg():
+            days = func.julianday(AnalyticsSession.finished_at) - func.julianday(AnalyticsSession.started_at)
+            result = await db.execute(
+                select(func.avg(days * 86400)).where(AnalyticsSession.finished_at != None)  # noqa: E711
+            )
+            return result.scalar()
+
+        async def histogram():
+            return await get_duration_distribution(admin=None, db=db, days=None)
+
+        mean, python_ms = await timed(python_mean, repeat=1)
+        _, sql_ms = await timed(sql_avg)
+        distribution, histogram_ms = await timed(histogram)
+
+    await engine.dispose()
+    print(f"{sessions:9d}  {python_ms:9.1f} ms  {sql_ms:7.1f} ms  {histogram_ms:7.2f} ms  {rebuild_ms / 1000:6.1f} s  "
+          f"{mean:7.1f} / {distribution.mean_seconds:7.1f}  {distribution.median_seconds:7.1f}  "
+          f"{distribution.p99_seconds:7.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'sessions':>9}  {'python mean':>12}  {'sql avg':>10}  {'histogram':>10}  {'rebuild':>8}  "
+          f"{'mean (raw / rollup)':>17}  {'median':>7}  {'p99':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for sessions in args.sessions:
+            asyncio.run(run(sessions, Path(directory)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compare snapshot (raster) and vector PDF rendering of a results board.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pdf_render [--cards 30] [--iterations 20]
+
+The snapshot input is a PNG of the board at the size the results page
+uploads (html2canvas at scale 2), drawn with Pillow.
+"""
+import argparse
+import io
+import statistics
+import time
+
+from PIL import Image, ImageDraw
+
+from app.services.hexagon import THEME_COLORS, hex_to_pixel, hexagon_points, place_cards_on_grid
+from app.services.pdf_render import render_hexagon_pdf, render_snapshot_pdf
+
+WORDS = [
+    "hilfsbereit", "humorvoll", "verantwortungsbewusst", "neugierig", "geduldig", "kreativ",
+    "zuverlässig", "mutig", "ehrlich", "ordentlich", "selbstständig", "offen", "ruhig", "fair",
+]
+
+
+def make_cards(count: int):
+    buckets = ["oft", "manchmal", "manchmal", "selten"]
+    return [(f"{WORDS[i % len(WORDS)]}", buckets[i % len(buckets)]) for i in range(count)]
+
+
+def make_snapshot(cards, seed: int, hex_size: float = 120.0) -> bytes:
+    """Draw the board like the browser screenshot the snapshot endpoint receives."""
+    placements = place_cards_on_grid(
+        [word for word, bucket in cards if bucket == "oft"],
+        [word for word, bucket in cards if bucket == "manchmal"],
+        seed,
+    )
+    centers = [hex_to_pixel(p.q, p.r, hex_size) for p in placements]
+    padding = hex_size * 1.5
+    min_x = min(x for x, _ in centers) - padding
+    min_y = min(y for _, y in centers) - padding
+    width = int(max(x for x, _ in centers) + padding - min_x)
+    height = int(max(y for _, y in centers) + padding - min_y)
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    outline = hexagon_points(hex_size)
+    colors = THEME_COLORS["blue"]
+    for placement, (cx, cy) in zip(placements, centers):
+        fill, stroke, text = colors[placement.bucket]
+        points = [(cx - min_x + vx, cy - min_y + vy) for vx, vy in outline]
+        draw.polygon(points, fill=fill, outline=stroke, width=4)
+        draw.text((cx - min_x, cy - min_y), placement.word, fill=text, anchor="mm")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def measure(func, iterations: int):
+    timings = []
+    result = b""
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1718000000123)
+    args = parser.parse_args()
+
+    cards = make_cards(args.cards)
+    png = make_snapshot(cards, args.seed)
+
+    snapshot_pdf, snapshot_ms = measure(lambda: render_snapshot_pdf(png, "01.02.2026"), args.iterations)
+    vector_pdf, vector_ms = measure(
+        lambda: render_hexagon_pdf(cards, "blue", args.seed, "01.02.2026"), args.iterations
+    )
+
+    print(f"cards: {args.cards}, iterations: {args.iterations}")
+    print(f"upload:   snapshot {len(png) * 4 / 3 / 1024:8.1f} KiB (base64)   vector  <0.1 KiB (session id)")
+    for name, pdf, timings in (("snapshot", snapshot_pdf, snapshot_ms), ("vector", vector_pdf, vector_ms)):
+        print(
+            f"{name:9s} pdf {len(pdf) / 1024:8.1f} KiB   "
+            f"median {statistics.median(timings):7.2f} ms   max {max(timings):7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
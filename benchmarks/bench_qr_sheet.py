@@ -0,0 +1,69 @@
+"""Time QR sheet generation against rendering one PNG per list.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_qr_sheet [--lists 50 100 200]
+
+"per-list png" is what printing used to cost: one qrcode/PIL image per
+list, each encoding the URL from scratch. The sheet encodes each URL once
+(cold) or reuses cached matrices (warm) and draws vector modules.
+"""
+import argparse
+import io
+import time
+
+import qrcode
+
+from app.services.pdf_render import render_qr_sheet_pdf
+from app.services.qr_render import qr_matrix, render_qr_png, render_qr_svg
+
+BASE_URL = "https://vielseitig.zumgugger.ch/l/"
+
+
+def per_list_png(urls) -> int:
+    total = 0
+    for url in urls:
+        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=2)
+        qr.add_data(url)
+        qr.make(fit=True)
+        buffer = io.BytesIO()
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+        total += buffer.tell()
+    return total
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lists", type=int, nargs="+", default=[50, 100, 200])
+    args = parser.parse_args()
+
+    print(f"{'lists':>5}  {'per-list png':>12}  {'matrices cold':>13}  {'warm':>6}  "
+          f"{'sheet pdf':>9}  {'pages':>5}  {'size':>9}  {'3 sizes+svg':>11}")
+    for count in args.lists:
+        urls = [f"{BASE_URL}{index:04d}{'x' * 12}" for index in range(count)]
+        _, png_ms = timed(lambda: per_list_png(urls))
+
+        qr_matrix.cache_clear()
+        matrices, cold_ms = timed(lambda: [qr_matrix(url) for url in urls])
+        _, warm_ms = timed(lambda: [qr_matrix(url) for url in urls])
+
+        entries = [(f"Klasse {index}", url, matrix) for index, (url, matrix) in enumerate(zip(urls, matrices))]
+        pdf, sheet_ms = timed(lambda: render_qr_sheet_pdf(entries, "Ich bin vielseitig"))
+
+        # Several outputs per list from the same matrix, as the QR endpoint serves them
+        _, variants_ms = timed(lambda: [
+            (render_qr_png(m, 4), render_qr_png(m, 10), render_qr_png(m, 20), render_qr_svg(m)) for m in matrices
+        ])
+
+        print(f"{count:5d}  {png_ms:9.1f} ms  {cold_ms:10.1f} ms  {warm_ms:3.1f} ms  {sheet_ms:6.1f} ms  "
+              f"{pdf.count(b'/Type /Page' + bytes([10])):5d}  {len(pdf) / 1024:5.1f} KiB  {variants_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Peak memory of a snapshot PDF request: base64 JSON body vs. streamed binary upload.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_snapshot_upload [--width 2400] [--height 1600] [--render]
+
+"request" covers what the web process holds until the job is handed to the
+PDF pool; with --render, "with render" adds decoding, downscaling and
+ReportLab as they run in the worker. The JSON body is counted in full because Starlette buffers it
+before validation; the binary body arrives in 64 KiB chunks.
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import time
+import tracemalloc
+
+from PIL import Image
+
+from app.api.pdf import PDFSnapshotRequest
+from app.services.pdf_render import render_snapshot_pdf
+from app.services.uploads import spool_upload
+
+CHUNK_SIZE = 64 * 1024
+FOOTER = "01.02.2026"
+
+
+def make_snapshot(width: int, height: int) -> bytes:
+    """A noisy screenshot-sized PNG, comparable to what html2canvas produces at scale 2."""
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    base = Image.new("RGB", (width, height), (219, 234, 254))
+    buffer = io.BytesIO()
+    Image.blend(base, noise, 0.3).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def legacy_request(body: bytes, render: bool):
+    data = json.loads(bytes(body))
+    payload = PDFSnapshotRequest(**data)
+    _, b64data = payload.image_data_url.split(",", 1)
+    image_bytes = base64.b64decode(b64data)
+    if render:
+        render_snapshot_pdf(image_bytes, FOOTER)
+
+
+async def streamed_request(png: bytes, render: bool):
+    async def chunks():
+        for offset in range(0, len(png), CHUNK_SIZE):
+            yield png[offset:offset + CHUNK_SIZE]
+
+    spool = await spool_upload(chunks(), max_bytes=50 * 1024 * 1024)
+    try:
+        image_bytes = spool.read()
+    finally:
+        spool.close()
+    if render:
+        render_snapshot_pdf(image_bytes, FOOTER, 150)
+
+
+def measure(func):
+    # Timed without tracing, tracemalloc slows allocation-heavy code down a lot
+    started = time.perf_counter()
+    func()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=2400)
+    parser.add_argument("--height", type=int, default=1600)
+    parser.add_argument("--render", action="store_true", help="also measure rendering (slow under tracemalloc)")
+    args = parser.parse_args()
+
+    png = make_snapshot(args.width, args.height)
+    json_body = json.dumps(
+        {"image_data_url": "data:image/png;base64," + base64.b64encode(png).decode()}
+    ).encode()
+
+    print(f"snapshot: {args.width}x{args.height}, PNG {len(png) / 1024 / 1024:.2f} MiB, "
+          f"JSON body {len(json_body) / 1024 / 1024:.2f} MiB")
+    for render in (False, True) if args.render else (False,):
+        label = "with render" if render else "request"
+        legacy_peak, legacy_ms = measure(lambda: legacy_request(json_body, render))
+        streamed_peak, streamed_ms = measure(lambda: asyncio.run(streamed_request(png, render)))
+        print(f"{label:12s} base64 JSON peak {legacy_peak:7.2f} MiB ({legacy_ms:7.1f} ms)   "
+              f"binary stream peak {streamed_peak:7.2f} MiB ({streamed_ms:7.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,8 +65,23 @@ export const listsAPI = {
     api.post(`/user/lists/${listId}/fork`),
   
   // QR Code
-  getListQRCode: (listId) => 
-    api.get(`/user/lists/${listId}/qr`, { responseType: 'blob' }),
+  // format: 'png' | 'svg', size: approximate edge length in pixels
+  getListQRCode: (listId, { format = 'png', size } = {}) =>
+    api.get(`/user/lists/${listId}/qr`, { params: { format, size }, responseType: 'blob' }),
+
+  // Printable PDF with the QR codes of all shared lists, or only of listIds
+  exportQrSheet: (listIds) =>
+    api.post('/user/lists/qr-sheet', { list_ids: listIds || null }, { responseType: 'blob' }),
+
+  // Class export: one PDF (or ZIP) with the results of many sessions
+  exportClassPdf: (listId, { sessionIds, startedFrom, startedUntil, theme, format = 'pdf' } = {}) =>
+    api.post(`/user/lists/${listId}/sessions/pdf`, {
+      session_ids: sessionIds || null,
+      started_from: startedFrom || null,
+      started_until: startedUntil || null,
+      theme,
+      format,
+    }, { responseType: 'blob' }),
 };
 
 export const analyticsAPI = {
@@ -77,6 +92,10 @@ export const analyticsAPI = {
   recordAssignment: (sessionId, adjectiveId, bucket) =>
     api.post('/api/analytics/assignment', { analytics_session_id: sessionId, adjective_id: adjectiveId, bucket }),
 
+  // assignments: [{ adjective_id, bucket, client_timestamp }] in sorting order
+  recordAssignmentsBatch: (sessionId, assignments) =>
+    api.post('/api/analytics/assignments/batch', { analytics_session_id: sessionId, assignments }),
+
   finishSession: (sessionId) =>
     api.post('/api/analytics/session/finish', { analytics_session_id: sessionId }),
 
@@ -95,6 +114,10 @@ export const studentAPI = {
   // PDF export (aliased for backward compatibility)
   exportPDF: (sessionId, data) => 
     api.post(`/api/sessions/${sessionId}/pdf`, data, { responseType: 'blob' }),
+
+  // Vector PDF drawn on the server from the cards shown on the results page
+  exportVectorPDF: (sessionId, { theme, seed }) =>
+    api.post(`/api/sessions/${sessionId}/pdf/vector`, { theme, seed }, { responseType: 'blob' }),
 };
 
 // Aliases for backward compatibility
@@ -181,6 +204,13 @@ export const adminAPI = {
   getAnalyticsTimeseries: (days = 30) =>
     api.get('/admin/analytics/timeseries', { params: { days } }),
   
+  getAnalyticsDurations: (days = null) =>
+    api.get('/admin/analytics/durations', { params: days ? { days } : {} }),
+  
+  // Plain URL so the browser streams the download to disk
+  getAnalyticsExportUrl: (params) =>
+    api.getUri({ url: '/admin/analytics/export', params }),
+  
   // Standard list
   getStandardList: () => 
     api.get('/admin/standard-list'),
@@ -45,6 +45,19 @@ function SimpleBarChart({ data, label, color = 'bg-blue-500' }) {
   );
 }
 
+const formatSeconds = (seconds) => {
+  if (seconds === null || seconds === undefined) return '–';
+  if (seconds < 60) return `${Math.round(seconds)}s`;
+  return `${Math.round((seconds / 60) * 10) / 10} min`;
+};
+
+const SESSION_PAGE_SIZE = 25;
+
+// Drop empty filter values so they are not sent as query parameters
+const activeFilters = (filters) => Object.fromEntries(
+  Object.entries(filters).filter(([, value]) => value !== '')
+);
+
 // Date range selector
 function DateRangeSelector({ value, onChange }) {
   const options = [
@@ -76,7 +89,11 @@ function DateRangeSelector({ value, onChange }) {
 export default function AdminAnalyticsPage() {
   const [summary, setSummary] = useState(null);
   const [sessions, setSessions] = useState([]);
+  const [sessionsCursor, setSessionsCursor] = useState(null);
+  const [sessionFilters, setSessionFilters] = useState({ completed: '', is_standard_list: '' });
+  const [loadingSessions, setLoadingSessions] = useState(false);
   const [timeseries, setTimeseries] = useState(null);
+  const [durations, setDurations] = useState(null);
   const [loading, setLoading] = useState(true);
   const [toast, setToast] = useState(null);
   const [error, setError] = useState('');
@@ -86,14 +103,17 @@ export default function AdminAnalyticsPage() {
     setLoading(true);
     setError('');
     try {
-      const [summaryRes, sessionsRes, timeseriesRes] = await Promise.all([
+      const [summaryRes, sessionsRes, timeseriesRes, durationsRes] = await Promise.all([
         adminAPI.getAnalyticsSummary(),
-        adminAPI.getAnalyticsSessions({ limit: 25 }),
+        adminAPI.getAnalyticsSessions({ limit: SESSION_PAGE_SIZE, ...activeFilters(sessionFilters) }),
         adminAPI.getAnalyticsTimeseries(dateRange),
+        adminAPI.getAnalyticsDurations(),
       ]);
       setSummary(summaryRes.data);
-      setSessions(sessionsRes.data || []);
+      setSessions(sessionsRes.data?.items || []);
+      setSessionsCursor(sessionsRes.data?.next_cursor || null);
       setTimeseries(timeseriesRes.data);
+      setDurations(durationsRes.data);
     } catch (err) {
       const message = err.response?.data?.detail || 'Konnte Analytics nicht laden';
       setError(message);
@@ -103,6 +123,22 @@ export default function AdminAnalyticsPage() {
     }
   };
 
+  // Load the first page again (filters changed) or append the next one
+  const loadSessions = async (cursor = null) => {
+    setLoadingSessions(true);
+    try {
+      const params = { limit: SESSION_PAGE_SIZE, ...activeFilters(sessionFilters) };
+      if (cursor) params.cursor = cursor;
+      const res = await adminAPI.getAnalyticsSessions(params);
+      setSessions(prev => (cursor ? [...prev, ...res.data.items] : res.data.items));
+      setSessionsCursor(res.data.next_cursor || null);
+    } catch (err) {
+      setToast({ message: 'Fehler beim Laden der Sessions', type: 'error' });
+    } finally {
+      setLoadingSessions(false);
+    }
+  };
+
   // Reload when date range changes
   const loadTimeseries = async () => {
     try {
@@ -123,6 +159,12 @@ export default function AdminAnalyticsPage() {
     }
   }, [dateRange]);
 
+  useEffect(() => {
+    if (!loading) {
+      loadSessions();
+    }
+  }, [sessionFilters]);
+
   // Transform timeseries data for charts
   const chartData = useMemo(() => {
     if (!timeseries?.data) return { sessions: [], completed: [], pdfs: [] };
@@ -139,6 +181,10 @@ export default function AdminAnalyticsPage() {
     };
   }, [timeseries]);
 
+  const durationChart = useMemo(() => (
+    durations?.histogram?.map(bin => ({ label: formatSeconds(bin.lower_seconds), value: bin.count })) || []
+  ), [durations]);
+
   // Calculate completion rate
   const completionRate = useMemo(() => {
     if (!summary || summary.total_sessions === 0) return 0;
@@ -210,6 +256,20 @@ export default function AdminAnalyticsPage() {
           </div>
         )}
 
+        {durations?.count ? (
+          <div className="card">
+            <h2 className="text-xl font-semibold mb-3">Dauer abgeschlossener Sessions</h2>
+            <div className="grid grid-cols-2 sm:grid-cols-5 gap-4 mb-6">
+              <StatCard label="Median" value={formatSeconds(durations.median_seconds)} />
+              <StatCard label="90%" value={formatSeconds(durations.p90_seconds)} />
+              <StatCard label="99%" value={formatSeconds(durations.p99_seconds)} />
+              <StatCard label="Minimum" value={formatSeconds(durations.min_seconds)} />
+              <StatCard label="Maximum" value={formatSeconds(durations.max_seconds)} />
+            </div>
+            <SimpleBarChart data={durationChart} label="Sessions nach Dauer" color="bg-green-500" />
+          </div>
+        ) : null}
+
         {summary?.top_adjectives?.length ? (
           <div className="card">
             <h2 className="text-xl font-semibold mb-3">Top Adjektive</h2>
@@ -219,6 +279,9 @@ export default function AdminAnalyticsPage() {
                   <tr>
                     <th>Wort</th>
                     <th>Anzahl</th>
+                    <th>Oft</th>
+                    <th>Manchmal</th>
+                    <th>Selten</th>
                     <th>Anteil</th>
                   </tr>
                 </thead>
@@ -227,6 +290,9 @@ export default function AdminAnalyticsPage() {
                     <tr key={adj.adjective_id}>
                       <td>{adj.word}</td>
                       <td>{adj.count}</td>
+                      <td>{adj.buckets?.oft ?? 0}</td>
+                      <td>{adj.buckets?.manchmal ?? 0}</td>
+                      <td>{adj.buckets?.selten ?? 0}</td>
                       <td>{adj.percentage}%</td>
                     </tr>
                   ))}
@@ -256,7 +322,38 @@ export default function AdminAnalyticsPage() {
         <div className="card overflow-x-auto">
           <div className="flex items-center justify-between mb-3">
             <h2 className="text-xl font-semibold">Letzte Sessions</h2>
-            <span className="text-sm text-gray-500">Max. 25</span>
+            <div className="flex gap-2">
+              <select
+                className="form-input"
+                value={sessionFilters.completed}
+                onChange={(e) => setSessionFilters(prev => ({ ...prev, completed: e.target.value }))}
+              >
+                <option value="">Alle Status</option>
+                <option value="true">Abgeschlossen</option>
+                <option value="false">Offen</option>
+              </select>
+              <select
+                className="form-input"
+                value={sessionFilters.is_standard_list}
+                onChange={(e) => setSessionFilters(prev => ({ ...prev, is_standard_list: e.target.value }))}
+              >
+                <option value="">Alle Listen</option>
+                <option value="true">Standardliste</option>
+                <option value="false">Eigene Listen</option>
+              </select>
+              <a
+                className="btn btn-outline"
+                href={adminAPI.getAnalyticsExportUrl({ format: 'csv', ...activeFilters(sessionFilters) })}
+              >
+                CSV
+              </a>
+              <a
+                className="btn btn-outline"
+                href={adminAPI.getAnalyticsExportUrl({ format: 'ndjson', ...activeFilters(sessionFilters) })}
+              >
+                NDJSON
+              </a>
+            </div>
           </div>
           <table className="table min-w-full">
             <thead>
@@ -289,6 +386,13 @@ export default function AdminAnalyticsPage() {
               )}
             </tbody>
           </table>
+          {sessionsCursor && (
+            <div className="text-center mt-4">
+              <Button variant="secondary" onClick={() => loadSessions(sessionsCursor)} disabled={loadingSessions}>
+                {loadingSessions ? 'Lädt…' : 'Mehr laden'}
+              </Button>
+            </div>
+          )}
         </div>
       </div>
     </div>
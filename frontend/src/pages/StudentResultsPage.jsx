@@ -1,9 +1,8 @@
-import { useState, useEffect, useMemo, useRef } from 'react';
+import { useState, useEffect, useMemo } from 'react';
 import { useNavigate, useParams, Link } from 'react-router-dom';
 import { Button, HexagonGrid, Loading, Toast } from '../components';
 import { useTheme } from '../store/ThemeContext';
 import { studentApi } from '../api';
-import html2canvas from 'html2canvas';
 
 /**
  * Student Results Page
@@ -17,8 +16,6 @@ export default function StudentResultsPage() {
   const navigate = useNavigate();
   const { token } = useParams();
   const { currentTheme, switchTheme, allThemeNames } = useTheme();
-  const resultsRef = useRef(null);
-  const hexRef = useRef(null);
 
   // Map theme names for hex visualization (simplified color mapping)
   const hexThemeMap = {
@@ -119,31 +116,13 @@ export default function StudentResultsPage() {
       return;
     }
 
-    const target = hexRef.current || resultsRef.current;
-
-    if (!target) {
-      setToast({
-        show: true,
-        message: 'Export-Container nicht gefunden',
-        type: 'error'
-      });
-      return;
-    }
-
     setIsExportingPdf(true);
     try {
-      // Capture only the hex grid card as PNG (WYSIWYG)
-      const canvas = await html2canvas(target, {
-        backgroundColor: '#ffffff',
-        scale: 2,
-        useCORS: true,
-      });
-
-      const imageDataUrl = canvas.toDataURL('image/png');
-
-      // Call PDF export API with snapshot
-      const response = await studentApi.exportPDF(sessionData.sessionId, {
-        image_data_url: imageDataUrl,
+      // The server draws the stored assignments with the same layout (theme + seed) as vector shapes;
+      // the sorting page sent every buffered card before opening the results
+      const response = await studentApi.exportVectorPDF(sessionData.sessionId, {
+        theme: hexTheme,
+        seed: randomSeed,
       });
       
       // Create download link
@@ -242,7 +221,7 @@ export default function StudentResultsPage() {
         </div>
       )}
 
-      <div className="max-w-6xl mx-auto" ref={resultsRef}>
+      <div className="max-w-6xl mx-auto">
         {/* Header */}
         <div className="text-center mb-8">
           <h1 className="text-4xl font-bold text-gray-800 mb-2">
@@ -323,7 +302,7 @@ export default function StudentResultsPage() {
         </div>
 
         {/* Hexagon Visualization */}
-        <div className="card bg-white p-8" ref={hexRef}>
+        <div className="card bg-white p-8">
           <HexagonGrid
             oftCards={oftCards}
             manchmalCards={manchmalCards}
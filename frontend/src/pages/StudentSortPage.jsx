@@ -1,9 +1,18 @@
-import { useState, useEffect, useMemo } from 'react';
+import { useState, useEffect, useMemo, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Button, Loading, Toast, HexagonGrid } from '../components';
 import { analyticsApi, studentApi, shareApi } from '../api';
 import { useTheme } from '../store/ThemeContext';
 
+// Sorted cards are buffered locally and sent in batches
+const ASSIGNMENT_FLUSH_INTERVAL_MS = 5000;
+
+// Network problems and server errors are worth retrying; other rejections are final
+const isRetryableError = (err) => {
+  const status = err.response?.status;
+  return !status || err.code === 'ERR_NETWORK' || status >= 500 || status === 408 || status === 429;
+};
+
 /**
  * Section 13.3: Sortieransicht Page (/sort or /l/{token})
  * 
@@ -107,6 +116,7 @@ export default function StudentSortPage() {
                 setPendingRecovery({
                   adjectives: parsed.adjectives,
                   sessionState: parsed.sessionState,
+                  pendingAssignments: parsed.pendingAssignments || [],
                   storageKey,
                   progress,
                   completedCount,
@@ -194,6 +204,10 @@ export default function StudentSortPage() {
     loadSession();
   }, [token, queryListId]);
 
+  // Pending assignments not yet sent to the server, in sorting order
+  const pendingAssignmentsRef = useRef([]);
+  const offlineNotifiedRef = useRef(false);
+
   // Save session state to localStorage whenever it changes
   useEffect(() => {
     if (!loading && sessionState.sessionId && adjectives.length > 0) {
@@ -201,6 +215,8 @@ export default function StudentSortPage() {
       const stateToSave = {
         sessionState,
         adjectives,
+        // Cards not yet sent to the server survive a closed tab
+        pendingAssignments: pendingAssignmentsRef.current,
         timestamp: Date.now(),
       };
       
@@ -216,69 +232,127 @@ export default function StudentSortPage() {
   // Get current adjective
   const currentAdjective = adjectives[sessionState.currentIndex];
 
-  // Handle assignment
-  const handleAssign = async (bucket) => {
-    if (!currentAdjective || !sessionState.sessionId) return;
-
+  // Keep the saved recovery state in step with the buffer between renders
+  const storePendingAssignments = () => {
+    const storageKey = `vielseitig_session_${token || 'default'}`;
     try {
-      // Record assignment
-      await analyticsApi.recordAssignment(
-        sessionState.sessionId,
-        currentAdjective.id,
-        bucket
-      );
+      const saved = JSON.parse(localStorage.getItem(storageKey) || 'null');
+      if (!saved) return;
+      saved.pendingAssignments = pendingAssignmentsRef.current;
+      localStorage.setItem(storageKey, JSON.stringify(saved));
+    } catch (err) {
+      console.error('[StudentSortPage] Failed to save pending assignments:', err);
+    }
+  };
 
-      // Update local state
-      setSessionState(prev => ({
-        ...prev,
-        assignments: [
-          ...prev.assignments,
-          { adjectiveId: currentAdjective.id, bucket },
-        ],
-        currentIndex: prev.currentIndex + 1,
-      }));
-
-      setShowExplanation(false);
-
-      // Check if finished
-      if (sessionState.currentIndex + 1 >= adjectives.length) {
-        // Move to results
-        setTimeout(() => handleFinish(), 500);
+  const reportOffline = () => {
+    if (offlineNotifiedRef.current) return;
+    offlineNotifiedRef.current = true;
+    setToast({
+      message: {
+        title: '📴 Offline-Modus',
+        detail: 'Deine Zuordnungen werden lokal gespeichert und gesendet, sobald die Verbindung wieder da ist.'
+      },
+      type: 'warning'
+    });
+  };
+
+  // A rejected batch is resent card by card, so only the cards the server refuses are dropped
+  const recordIndividually = async (sessionId, batch) => {
+    const rejected = [];
+    for (let index = 0; index < batch.length; index += 1) {
+      try {
+        await analyticsApi.recordAssignmentsBatch(sessionId, [batch[index]]);
+      } catch (err) {
+        if (isRetryableError(err)) {
+          pendingAssignmentsRef.current = [...batch.slice(index), ...pendingAssignmentsRef.current];
+          throw err;
+        }
+        rejected.push(err);
       }
+    }
+    if (rejected.length > 0) {
+      const detail = rejected[0].response?.data?.detail;
+      setToast({
+        message: {
+          title: 'Speichern fehlgeschlagen',
+          detail: typeof detail === 'string' ? detail : `${rejected.length} Zuordnung(en) wurden nicht gespeichert.`
+        },
+        type: 'error'
+      });
+    }
+  };
+
+  // Only network and server errors leave cards in the buffer; they are retried on the next flush
+  const sendAssignments = async (sessionId, batch) => {
+    try {
+      await analyticsApi.recordAssignmentsBatch(sessionId, batch);
     } catch (err) {
-      console.error('[StudentSortPage] Assignment error:', err);
-      
-      // Check if it's a network error
-      const isNetworkError = !err.response || err.code === 'ERR_NETWORK';
-      
-      if (isNetworkError) {
-        // For network errors, save locally and continue (offline-friendly)
-        setSessionState(prev => ({
-          ...prev,
-          assignments: [
-            ...prev.assignments,
-            { adjectiveId: currentAdjective.id, bucket },
-          ],
-          currentIndex: prev.currentIndex + 1,
-        }));
-        setShowExplanation(false);
-        setToast({ 
-          message: {
-            title: '📴 Offline-Modus',
-            detail: 'Deine Zuordnung wurde lokal gespeichert. Die Verbindung wird automatisch wiederhergestellt.'
-          }, 
-          type: 'warning' 
-        });
-      } else {
-        setToast({ 
-          message: {
-            title: 'Speichern fehlgeschlagen',
-            detail: err.response?.data?.detail || 'Bitte versuche es erneut.'
-          }, 
-          type: 'error',
-          onRetry: () => handleAssign(bucket)
-        });
+      if (!isRetryableError(err)) {
+        await recordIndividually(sessionId, batch);
+        return;
       }
+      // Put the batch back in front of anything sorted meanwhile
+      pendingAssignmentsRef.current = [...batch, ...pendingAssignmentsRef.current];
+      throw err;
+    }
+  };
+
+  const flushAssignments = async (sessionId) => {
+    const batch = pendingAssignmentsRef.current;
+    if (!sessionId || batch.length === 0) return;
+
+    pendingAssignmentsRef.current = [];
+    try {
+      await sendAssignments(sessionId, batch);
+      offlineNotifiedRef.current = false;
+    } catch (err) {
+      reportOffline();
+      throw err;
+    } finally {
+      storePendingAssignments();
+    }
+  };
+
+  // Flush buffered assignments periodically while sorting
+  useEffect(() => {
+    if (!sessionState.sessionId) return undefined;
+
+    const intervalId = setInterval(() => {
+      flushAssignments(sessionState.sessionId).catch((err) => {
+        console.error('[StudentSortPage] Assignment flush error:', err);
+      });
+    }, ASSIGNMENT_FLUSH_INTERVAL_MS);
+
+    return () => clearInterval(intervalId);
+  }, [sessionState.sessionId]);
+
+  // Handle assignment
+  const handleAssign = (bucket) => {
+    if (!currentAdjective || !sessionState.sessionId) return;
+
+    pendingAssignmentsRef.current.push({
+      adjective_id: currentAdjective.id,
+      bucket,
+      client_timestamp: new Date().toISOString(),
+    });
+
+    // Update local state
+    setSessionState(prev => ({
+      ...prev,
+      assignments: [
+        ...prev.assignments,
+        { adjectiveId: currentAdjective.id, bucket },
+      ],
+      currentIndex: prev.currentIndex + 1,
+    }));
+
+    setShowExplanation(false);
+
+    // Check if finished
+    if (sessionState.currentIndex + 1 >= adjectives.length) {
+      // Move to results
+      setTimeout(() => handleFinish(), 500);
     }
   };
 
@@ -340,6 +414,7 @@ export default function StudentSortPage() {
 
   const handleFinish = async () => {
     try {
+      await flushAssignments(sessionState.sessionId);
       await analyticsApi.finishSession(sessionState.sessionId);
       
       // Clear localStorage for this session (no longer needed)
@@ -386,7 +461,8 @@ export default function StudentSortPage() {
         null // themeId
       );
       
-      // Restore state with new session ID
+      // Restore state with new session ID; cards never sent go to the new session
+      pendingAssignmentsRef.current = pendingRecovery.pendingAssignments;
       setAdjectives(pendingRecovery.adjectives);
       setSessionState({
         ...pendingRecovery.sessionState,
@@ -50,6 +50,7 @@ export default function UserListsPage() {
   });
   const [qrLoadingId, setQrLoadingId] = useState(null);
   const [qrPreview, setQrPreview] = useState(null);
+  const [qrSheetLoading, setQrSheetLoading] = useState(false);
   const [regeneratingId, setRegeneratingId] = useState(null);
 
   useEffect(() => {
@@ -176,6 +177,32 @@ export default function UserListsPage() {
     }
   };
 
+  const handleDownloadQrSheet = async () => {
+    setQrSheetLoading(true);
+    try {
+      const response = await listsAPI.exportQrSheet();
+      const blobUrl = URL.createObjectURL(new Blob([response.data], { type: 'application/pdf' }));
+      const link = document.createElement('a');
+      link.href = blobUrl;
+      link.download = 'qr-codes.pdf';
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      URL.revokeObjectURL(blobUrl);
+    } catch (err) {
+      // Blob responses carry the error detail as text
+      let message = 'QR-Bogen konnte nicht erstellt werden';
+      try {
+        message = JSON.parse(await err.response?.data?.text())?.detail || message;
+      } catch {
+        // keep the generic message
+      }
+      setToast({ message, type: 'error' });
+    } finally {
+      setQrSheetLoading(false);
+    }
+  };
+
   const handleCloseQr = () => {
     if (qrPreview?.url) URL.revokeObjectURL(qrPreview.url);
     setQrPreview(null);
@@ -228,6 +255,9 @@ export default function UserListsPage() {
             <Button variant="secondary" onClick={() => setShowCreate((prev) => !prev)}>
               {showCreate ? 'Schliessen' : 'Neue Liste'}
             </Button>
+            <Button variant="outline" onClick={handleDownloadQrSheet} disabled={qrSheetLoading}>
+              {qrSheetLoading ? 'Erstelle QR-Bogen…' : 'Alle QR-Codes drucken'}
+            </Button>
             <Link to="/user/profile" className="btn btn-outline hidden sm:inline-flex items-center">
               Profil
             </Link>
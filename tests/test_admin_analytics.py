@@ -0,0 +1,286 @@
+"""Tests for the admin analytics endpoints."""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.services import analytics_export
+from app.models import Adjective, Admin, AnalyticsSession, Base, List
+from app.services.analytics_writer import ASSIGNMENT, SESSION_START, AnalyticsEvent, apply_events
+from tests.utils import count_queries
+
+BUCKETS = ("selten", "manchmal", "oft")
+
+
+@pytest.fixture
+async def admin_client():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as db:
+        await seed_default_list(db)
+        admin = Admin(username="analytics@admin.com", password_hash=get_password_hash("x"))
+        db.add(admin)
+        await db.commit()
+    token = session_store.create_session(user_id=admin.id, user_type="admin")
+
+    async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+        # Warm the principal cache so only the endpoint's own statements are counted
+        await client.get("/admin/analytics/summary")
+        yield client, engine, SessionLocal
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _record_sessions(session_factory, count: int, adjectives_per_session: int) -> list:
+    """Write sessions whose n-th adjective lands in bucket n % 3; returns the session ids."""
+    async with session_factory() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        adjectives = (
+            await db.execute(select(Adjective).where(Adjective.list_id == list_obj.id).order_by(Adjective.id))
+        ).scalars().all()
+
+    started = datetime(2026, 3, 1, 10, 0)
+    events = []
+    session_ids = []
+    for index in range(count):
+        session_id = f"session-{count}-{index}"
+        session_ids.append(session_id)
+        events.append(AnalyticsEvent(
+            kind=SESSION_START, session_id=session_id, timestamp=started + timedelta(minutes=index),
+            list_id=list_obj.id,
+        ))
+        for position in range(adjectives_per_session):
+            events.append(AnalyticsEvent(
+                kind=ASSIGNMENT, session_id=session_id, timestamp=started + timedelta(minutes=index),
+                adjective_id=adjectives[position].id, bucket=BUCKETS[position % 3],
+            ))
+
+    async with session_factory() as db:
+        await apply_events(db, events)
+        await db.commit()
+    return session_ids
+
+
+@pytest.mark.asyncio
+async def test_endpoints_use_fixed_statement_counts(admin_client):
+    client, engine, SessionLocal = admin_client
+
+    counts = []
+    for sessions, adjectives in ((2, 3), (15, 12)):
+        session_ids = await _record_sessions(SessionLocal, sessions, adjectives)
+        with count_queries(engine) as summary_statements:
+            summary = await client.get("/admin/analytics/summary")
+        with count_queries(engine) as list_statements:
+            listing = await client.get("/admin/analytics/sessions", params={"limit": 50})
+        with count_queries(engine) as detail_statements:
+            detail = await client.get(f"/admin/analytics/sessions/{session_ids[-1]}")
+        assert summary.status_code == listing.status_code == detail.status_code == 200
+        assert detail.json()["assignment_count"] == adjectives
+        assert {item["id"]: item["assignment_count"] for item in listing.json()["items"]}[session_ids[0]] == adjectives
+        counts.append((len(summary_statements), len(list_statements), len(detail_statements)))
+
+    assert counts[0] == counts[1]
+    assert counts[0][1] == 1
+    assert counts[0][2] == 2
+
+
+@pytest.mark.asyncio
+async def test_top_adjectives_include_bucket_breakdown(admin_client):
+    client, _, SessionLocal = admin_client
+    await _record_sessions(SessionLocal, 4, 3)
+
+    async with SessionLocal() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        first, second, third = (
+            await db.execute(select(Adjective).where(Adjective.list_id == list_obj.id).order_by(Adjective.id).limit(3))
+        ).scalars().all()
+        # One more session sorts the first adjective into "oft"
+        await apply_events(db, [
+            AnalyticsEvent(kind=SESSION_START, session_id="extra", timestamp=datetime(2026, 3, 2), list_id=list_obj.id),
+            AnalyticsEvent(
+                kind=ASSIGNMENT, session_id="extra", timestamp=datetime(2026, 3, 2), adjective_id=first.id, bucket="oft"
+            ),
+        ])
+        await db.commit()
+
+    top = (await client.get("/admin/analytics/summary")).json()["top_adjectives"]
+    assert top[0]["adjective_id"] == first.id
+    assert top[0]["count"] == 5
+    assert {item["adjective_id"]: item["buckets"] for item in top} == {
+        first.id: {"selten": 4, "manchmal": 0, "oft": 1},
+        second.id: {"selten": 0, "manchmal": 4, "oft": 0},
+        third.id: {"selten": 0, "manchmal": 0, "oft": 4},
+    }
+
+
+@pytest.mark.asyncio
+async def test_sessions_page_with_keyset_cursor(admin_client):
+    client, engine, SessionLocal = admin_client
+    started = datetime(2026, 3, 1, 10, 0)
+    async with SessionLocal() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        for index in range(9):
+            # Pairs of sessions share a start time, so the id has to break ties
+            session_started = started + timedelta(minutes=index // 2)
+            db.add(AnalyticsSession(
+                id=f"s{index}", list_id=list_obj.id if index % 3 else None, is_standard_list=index % 3 != 0,
+                started_at=session_started,
+                finished_at=session_started + timedelta(minutes=5) if index % 2 else None,
+            ))
+        await db.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    seen = []
+    cursor = None
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get("/admin/analytics/sessions", params=params)).json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    expected = sorted((f"s{index}" for index in range(9)), key=lambda sid: (int(sid[1:]) // 2, sid), reverse=True)
+    assert seen == expected
+
+    # Deeper pages seek on the composite index instead of sorting or skipping rows
+    sql, params = statements[-1]
+    async with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+    assert "ix_analytics_sessions_started_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+    filtered = (await client.get("/admin/analytics/sessions", params={
+        "list_id": list_obj.id,
+        "completed": "true",
+        "started_from": "2026-03-01T10:01:00Z",
+        "started_until": "2026-03-01T10:04:00Z",
+    })).json()
+    assert [item["id"] for item in filtered["items"]] == ["s7", "s5"]
+    assert filtered["next_cursor"] is None
+
+    standard = (await client.get("/admin/analytics/sessions", params={"is_standard_list": "false"})).json()
+    assert [item["id"] for item in standard["items"]] == ["s6", "s3", "s0"]
+    assert standard["items"][-1]["list_id"] is None
+
+    invalid = await client.get("/admin/analytics/sessions", params={"cursor": "not-a-cursor"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_streams_sessions_with_assignments(admin_client, monkeypatch):
+    client, engine, SessionLocal = admin_client
+    session_ids = await _record_sessions(SessionLocal, 3, 2)
+    async with SessionLocal() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        words = (
+            await db.execute(select(Adjective.word).where(Adjective.list_id == list_obj.id).order_by(Adjective.id))
+        ).scalars().all()
+        db.add(AnalyticsSession(id="empty", is_standard_list=False, started_at=datetime(2026, 3, 2, 9, 0)))
+        await db.commit()
+
+    response = await client.get("/admin/analytics/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith("attachment; filename=")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert tuple(rows[0]) == analytics_export.CSV_COLUMNS
+    assert [(row["session_id"], row["word"], row["bucket"]) for row in rows] == [
+        *((session_id, words[position], BUCKETS[position]) for session_id in session_ids for position in range(2)),
+        ("empty", "", ""),
+    ]
+    assert rows[-1]["list_id"] == ""
+
+    filtered = await client.get("/admin/analytics/export", params={
+        "format": "ndjson",
+        "list_id": list_obj.id,
+        "started_from": "2026-03-01T10:01:00Z",
+    })
+    assert filtered.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in filtered.text.splitlines()]
+    assert [record["session_id"] for record in records] == session_ids[1:]
+    assert [item["word"] for item in records[0]["assignments"]] == words[:2]
+    assert records[0]["started_at"] == "2026-03-01T10:01:00"
+
+    # Batches smaller than a session: rows arrive in several chunks and sessions span them
+    monkeypatch.setattr(analytics_export, "EXPORT_BATCH_SIZE", 3)
+    chunks = [chunk async for chunk in analytics_export.stream_ndjson(engine, [])]
+    assert len(chunks) > 1
+    records = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [record["session_id"] for record in records] == [*session_ids, "empty"]
+    assert [len(record["assignments"]) for record in records] == [2, 2, 2, 0]
+
+    csv_chunks = [chunk async for chunk in analytics_export.stream_csv(engine, [])]
+    assert len(csv_chunks) == 3
+    assert b"".join(csv_chunks).decode() == response.text
+
+
+@pytest.mark.asyncio
+async def test_export_neutralises_spreadsheet_formulas(admin_client):
+    client, engine, SessionLocal = admin_client
+    await _record_sessions(SessionLocal, 1, 2)
+    formula = '=HYPERLINK("http://example.com","klick")'
+    async with SessionLocal() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        adjectives = (
+            await db.execute(select(Adjective).where(Adjective.list_id == list_obj.id).order_by(Adjective.id))
+        ).scalars().all()
+        adjectives[0].word = formula
+        adjectives[1].word = "-neugierig"
+        await db.commit()
+
+    rows = list(csv.DictReader(io.StringIO((await client.get("/admin/analytics/export")).text)))
+    assert [row["word"] for row in rows] == ["'" + formula, "'-neugierig"]
+
+    # NDJSON is not opened by spreadsheets and keeps the words as stored
+    ndjson = await client.get("/admin/analytics/export", params={"format": "ndjson"})
+    assert [item["word"] for item in json.loads(ndjson.text)["assignments"]] == [formula, "-neugierig"]
+
+
+@pytest.mark.asyncio
+async def test_summary_totals_skip_deleted_adjectives(admin_client):
+    client, _, SessionLocal = admin_client
+    await _record_sessions(SessionLocal, 2, 3)
+
+    async with SessionLocal() as db:
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        first = (
+            await db.execute(select(Adjective).where(Adjective.list_id == list_obj.id).order_by(Adjective.id).limit(1))
+        ).scalar_one()
+        await db.execute(delete(Adjective).where(Adjective.id == first.id))
+        await db.commit()
+
+    summary = (await client.get("/admin/analytics/summary")).json()
+    # Session history is kept, assignment figures only cover existing adjectives
+    assert summary["total_sessions"] == 2
+    assert first.id not in [item["adjective_id"] for item in summary["top_adjectives"]]
+    assert summary["total_assignments"] == sum(item["count"] for item in summary["top_adjectives"]) == 4
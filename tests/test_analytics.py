@@ -130,3 +130,70 @@ async def test_invalid_bucket_rejected(test_context):
     )
     assert invalid_response.status_code == 400
     assert "Bucket" in invalid_response.json().get("detail", "")
+
+
+@pytest.mark.asyncio
+async def test_batch_assignments_upsert_in_order(test_context):
+    client, session_factory = test_context
+    list_obj, _ = await _get_default_list_and_adjective(session_factory)
+
+    async with session_factory() as session:
+        adjectives = (
+            await session.execute(select(Adjective).where(Adjective.list_id == list_obj.id).limit(2))
+        ).scalars().all()
+
+    start_response = await client.post("/api/analytics/session/start", json={"list_id": list_obj.id})
+    session_id = start_response.json()["session_id"]
+
+    batch_response = await client.post(
+        "/api/analytics/assignments/batch",
+        json={
+            "analytics_session_id": session_id,
+            "assignments": [
+                {"adjective_id": adjectives[0].id, "bucket": "selten", "client_timestamp": "2026-01-01T10:00:00Z"},
+                {"adjective_id": adjectives[1].id, "bucket": "manchmal"},
+                {"adjective_id": adjectives[0].id, "bucket": "oft", "client_timestamp": "2026-01-01T10:00:05Z"},
+            ],
+        },
+    )
+    assert batch_response.status_code == 200
+    assert batch_response.json()["recorded"] == 2
+
+    async with session_factory() as session:
+        rows = (
+            await session.execute(
+                select(AnalyticsAssignment).where(AnalyticsAssignment.session_id == session_id)
+            )
+        ).scalars().all()
+        buckets = {row.adjective_id: row.bucket for row in rows}
+        assert buckets == {adjectives[0].id: "oft", adjectives[1].id: "manchmal"}
+
+
+@pytest.mark.asyncio
+async def test_batch_assignments_reject_foreign_adjectives(test_context):
+    client, session_factory = test_context
+    list_obj, adjective = await _get_default_list_and_adjective(session_factory)
+
+    start_response = await client.post("/api/analytics/session/start", json={"list_id": list_obj.id})
+    session_id = start_response.json()["session_id"]
+
+    response = await client.post(
+        "/api/analytics/assignments/batch",
+        json={
+            "analytics_session_id": session_id,
+            "assignments": [
+                {"adjective_id": adjective.id, "bucket": "oft"},
+                {"adjective_id": 999999, "bucket": "oft"},
+            ],
+        },
+    )
+    assert response.status_code == 404
+    assert "999999" in response.json()["detail"]
+
+    async with session_factory() as session:
+        rows = (
+            await session.execute(
+                select(AnalyticsAssignment).where(AnalyticsAssignment.session_id == session_id)
+            )
+        ).scalars().all()
+        assert rows == []
@@ -0,0 +1,302 @@
+"""Tests for the incrementally maintained daily analytics rollups."""
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.models import (
+    Adjective,
+    Admin,
+    AnalyticsDailyAdjectiveStats,
+    AnalyticsDailyDurationBin,
+    AnalyticsDailyListStats,
+    AnalyticsSession,
+    Base,
+    List,
+)
+from app.services.analytics_rollup import (
+    DURATION_BIN_EDGES,
+    DurationBin,
+    duration_bin,
+    duration_quantile,
+    rebuild_rollups,
+)
+from app.services.analytics_writer import (
+    ASSIGNMENT,
+    PDF_EXPORT,
+    SESSION_FINISH,
+    SESSION_START,
+    AnalyticsEvent,
+    apply_events,
+)
+from tests.utils import count_queries
+
+
+async def _snapshot(session_factory):
+    """Rollup rows with durations rounded, for comparing incremental and rebuilt state."""
+    async with session_factory() as db:
+        list_rows = (await db.execute(select(AnalyticsDailyListStats))).scalars().all()
+        adjective_rows = (await db.execute(select(AnalyticsDailyAdjectiveStats))).scalars().all()
+        duration_rows = (await db.execute(select(AnalyticsDailyDurationBin))).scalars().all()
+        return (
+            {
+                (row.day, row.list_id, row.theme_id): (
+                    row.sessions_started, row.sessions_finished, row.pdf_exports, round(row.duration_seconds_sum, 3)
+                )
+                for row in list_rows
+            },
+            {(row.day, row.adjective_id, row.bucket): row.assignments for row in adjective_rows if row.assignments},
+            {
+                (row.day, row.bin): (row.sessions, row.duration_seconds_min, row.duration_seconds_max)
+                for row in duration_rows
+            },
+        )
+
+
+async def _admin_token(session_factory) -> str:
+    async with session_factory() as db:
+        admin = Admin(username="rollup@admin.com", password_hash=get_password_hash("x"))
+        db.add(admin)
+        await db.commit()
+    return session_store.create_session(user_id=admin.id, user_type="admin")
+
+
+async def _rebuilt_snapshot(session_factory):
+    async with session_factory() as db:
+        await rebuild_rollups(db)
+        await db.commit()
+    return await _snapshot(session_factory)
+
+
+@pytest.fixture
+async def context():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        await seed_default_list(db)
+        list_obj = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        adjectives = (
+            await db.execute(select(Adjective).where(Adjective.list_id == list_obj.id).order_by(Adjective.id).limit(3))
+        ).scalars().all()
+
+    yield engine, SessionLocal, list_obj, adjectives
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_reads_rollups_maintained_by_requests(context):
+    engine, SessionLocal, list_obj, adjectives = context
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    token = await _admin_token(SessionLocal)
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            session_ids = []
+            for theme_id in (2, 2, None):
+                response = await client.post(
+                    "/api/analytics/session/start", json={"list_id": list_obj.id, "theme_id": theme_id}
+                )
+                session_ids.append(response.json()["session_id"])
+            first, second, third = session_ids
+
+            # Re-sorting a card moves it between buckets instead of counting it twice
+            for bucket in ("selten", "oft"):
+                await client.post(
+                    "/api/analytics/assignment",
+                    json={"analytics_session_id": first, "adjective_id": adjectives[0].id, "bucket": bucket},
+                )
+            await client.post(
+                "/api/analytics/assignments/batch",
+                json={
+                    "analytics_session_id": second,
+                    "assignments": [
+                        {"adjective_id": adjectives[0].id, "bucket": "oft"},
+                        {"adjective_id": adjectives[1].id, "bucket": "manchmal"},
+                    ],
+                },
+            )
+            await client.post(
+                "/api/analytics/assignments/batch",
+                json={
+                    "analytics_session_id": second,
+                    "assignments": [{"adjective_id": adjectives[1].id, "bucket": "selten"}],
+                },
+            )
+            for session_id in (first, second, first):
+                await client.post("/api/analytics/session/finish", json={"analytics_session_id": session_id})
+            for _ in range(2):
+                await client.post("/api/analytics/session/pdf-export", json={"analytics_session_id": first})
+
+            client.cookies.set("vielseitig_session", token)
+            await client.get("/admin/analytics/summary")
+            with count_queries(engine) as statements:
+                summary = (await client.get("/admin/analytics/summary")).json()
+                timeseries = (await client.get("/admin/analytics/timeseries", params={"days": 7})).json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert not any("analytics_sessions" in sql or "analytics_assignments" in sql for sql in statements)
+
+    assert summary["total_sessions"] == 3
+    assert summary["completed_sessions"] == 2
+    assert summary["total_pdf_exports"] == 1
+    assert summary["total_assignments"] == 3
+    assert summary["avg_duration_seconds"] >= 0
+    assert {item["theme_id"]: item["session_count"] for item in summary["theme_distribution"]} == {2: 2, 0: 1}
+    top = {item["word"]: item["count"] for item in summary["top_adjectives"]}
+    assert top == {adjectives[0].word: 2, adjectives[1].word: 1}
+
+    today = timeseries["data"][-1]
+    assert today["date"] == datetime.utcnow().strftime("%Y-%m-%d")
+    assert (today["sessions"], today["completed"], today["pdf_exports"]) == (3, 2, 1)
+    assert len(timeseries["data"]) == 8
+
+    incremental = await _snapshot(SessionLocal)
+    assert incremental == await _rebuilt_snapshot(SessionLocal)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_update_rollups(context):
+    _, SessionLocal, list_obj, adjectives = context
+    day = datetime(2026, 3, 1, 23, 50)
+
+    def start(session_id, started_at, theme_id=None):
+        return AnalyticsEvent(
+            kind=SESSION_START, session_id=session_id, timestamp=started_at, list_id=list_obj.id, theme_id=theme_id
+        )
+
+    def assign(session_id, adjective, bucket, offset):
+        return AnalyticsEvent(
+            kind=ASSIGNMENT, session_id=session_id, timestamp=day + timedelta(minutes=offset),
+            adjective_id=adjective.id, bucket=bucket,
+        )
+
+    batches = [
+        [
+            start("a", day, theme_id=1),
+            start("b", day + timedelta(hours=1)),
+            assign("a", adjectives[0], "oft", 1),
+            assign("a", adjectives[0], "selten", 2),
+            assign("b", adjectives[1], "manchmal", 61),
+        ],
+        [
+            # Sessions from the previous flush are looked up for their rollup day
+            assign("a", adjectives[0], "manchmal", 3),
+            assign("b", adjectives[2], "oft", 62),
+            AnalyticsEvent(kind=SESSION_FINISH, session_id="a", timestamp=day + timedelta(minutes=20)),
+            AnalyticsEvent(kind=PDF_EXPORT, session_id="a", timestamp=day + timedelta(minutes=21)),
+        ],
+        [
+            AnalyticsEvent(kind=SESSION_FINISH, session_id="a", timestamp=day + timedelta(minutes=30)),
+            AnalyticsEvent(kind=PDF_EXPORT, session_id="a", timestamp=day + timedelta(minutes=31)),
+            AnalyticsEvent(kind=SESSION_FINISH, session_id="b", timestamp=day + timedelta(hours=1, minutes=5)),
+        ],
+    ]
+    for events in batches:
+        async with SessionLocal() as db:
+            await apply_events(db, events)
+            await db.commit()
+
+    snapshot = await _snapshot(SessionLocal)
+    list_stats, adjective_stats, duration_bins = snapshot
+    first_day, next_day = day.date(), day.date() + timedelta(days=1)
+    assert list_stats == {
+        (first_day, list_obj.id, 1): (1, 1, 1, 1200.0),
+        (next_day, list_obj.id, 0): (1, 1, 0, 300.0),
+    }
+    assert adjective_stats == {
+        (first_day, adjectives[0].id, "manchmal"): 1,
+        (next_day, adjectives[1].id, "manchmal"): 1,
+        (next_day, adjectives[2].id, "oft"): 1,
+    }
+    assert duration_bins == {
+        (first_day, duration_bin(1200)): (1, 1200.0, 1200.0),
+        (next_day, duration_bin(300)): (1, 300.0, 300.0),
+    }
+    assert snapshot == await _rebuilt_snapshot(SessionLocal)
+
+
+def test_duration_quantiles_interpolate_within_bins():
+    assert duration_bin(-5) == 0
+    assert duration_bin(59.9) == DURATION_BIN_EDGES.index(45)
+    assert duration_bin(60) == DURATION_BIN_EDGES.index(60)
+    assert duration_bin(10 ** 6) == len(DURATION_BIN_EDGES) - 1
+
+    bins = [
+        DurationBin(60, 90, sessions=3, min_seconds=62.0, max_seconds=80.0),
+        DurationBin(120, 150, sessions=1, min_seconds=130.0, max_seconds=130.0),
+    ]
+    assert duration_quantile([], 0.5) is None
+    assert duration_quantile(bins, 0.0) == 62.0
+    assert duration_quantile(bins, 1.0) == 130.0
+    assert duration_quantile(bins, 0.5) == pytest.approx(75.5)
+
+
+@pytest.mark.asyncio
+async def test_duration_distribution_reads_histogram(context):
+    engine, SessionLocal, list_obj, _ = context
+    started = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    durations = [15 + (index * 37) % 1500 + index / 10 for index in range(400)]
+
+    async with SessionLocal() as db:
+        for index, duration in enumerate(durations):
+            db.add(AnalyticsSession(
+                list_id=list_obj.id, started_at=started + timedelta(minutes=index),
+                finished_at=started + timedelta(minutes=index, seconds=duration),
+            ))
+        db.add(AnalyticsSession(list_id=list_obj.id, started_at=started))  # unfinished
+        await rebuild_rollups(db)
+        await db.commit()
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    token = await _admin_token(SessionLocal)
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            await client.get("/admin/analytics/durations")
+            with count_queries(engine) as statements:
+                response = await client.get("/admin/analytics/durations")
+            recent = (await client.get("/admin/analytics/durations", params={"days": 1})).json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert len(statements) == 2
+    assert not any("analytics_sessions" in sql for sql in statements)
+
+    distribution = response.json()
+    assert distribution["count"] == len(durations)
+    assert distribution["mean_seconds"] == pytest.approx(statistics.mean(durations), abs=0.01)
+    assert distribution["min_seconds"] == pytest.approx(min(durations))
+    assert distribution["max_seconds"] == pytest.approx(max(durations))
+    assert sum(item["count"] for item in distribution["histogram"]) == len(durations)
+    assert len(distribution["histogram"]) == len(DURATION_BIN_EDGES)
+
+    # Estimates stay inside the bin holding the exact value
+    exact = statistics.quantiles(durations, n=100, method="inclusive")
+    for key, value in (("median_seconds", statistics.median(durations)), ("p90_seconds", exact[89])):
+        assert duration_bin(distribution[key]) == duration_bin(value)
+
+    assert recent["count"] == 0
+    assert recent["median_seconds"] is None
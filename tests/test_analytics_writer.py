@@ -0,0 +1,152 @@
+"""Tests for write-behind analytics ingestion."""
+import asyncio
+import sqlite3
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.seed import seed_default_list
+from app.db.session import apply_sqlite_pragmas, get_session
+from app.main import app
+from app.models import Adjective, AnalyticsAssignment, AnalyticsSession, Base, List
+from app.services import analytics as analytics_service
+from app.services.analytics_writer import ASSIGNMENT, SESSION_START, AnalyticsEvent, AnalyticsWriter
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_buffered_events(monkeypatch, tmp_path):
+    # File database: the writer and request sessions need separate connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'analytics.db'}", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as session:
+        await seed_default_list(session)
+        list_obj = (await session.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        adjectives = (
+            await session.execute(select(Adjective).where(Adjective.list_id == list_obj.id).limit(2))
+        ).scalars().all()
+
+    writer = AnalyticsWriter(SessionLocal, flush_interval_seconds=0.01)
+    monkeypatch.setattr(analytics_service, "analytics_writer", writer)
+    await writer.start()
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            start_response = await client.post("/api/analytics/session/start", json={"list_id": list_obj.id})
+            assert start_response.status_code == 200
+            session_id = start_response.json()["session_id"]
+
+            # The session is still queued, but follow-up events validate against it
+            assign_response = await client.post(
+                "/api/analytics/assignment",
+                json={"analytics_session_id": session_id, "adjective_id": adjectives[0].id, "bucket": "selten"},
+            )
+            assert assign_response.status_code == 200
+
+            batch_response = await client.post(
+                "/api/analytics/assignments/batch",
+                json={
+                    "analytics_session_id": session_id,
+                    "assignments": [
+                        {"adjective_id": adjectives[0].id, "bucket": "oft"},
+                        {"adjective_id": adjectives[1].id, "bucket": "manchmal"},
+                    ],
+                },
+            )
+            assert batch_response.status_code == 200
+
+            finish_response = await client.post(
+                "/api/analytics/session/finish", json={"analytics_session_id": session_id}
+            )
+            assert finish_response.status_code == 200
+    finally:
+        await writer.stop()
+        app.dependency_overrides.clear()
+
+    stats = writer.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["written"] == 5
+    assert stats["failed"] == 0
+
+    async with SessionLocal() as session:
+        stored = (await session.execute(select(AnalyticsSession).where(AnalyticsSession.id == session_id))).scalar_one()
+        assert stored.finished_at is not None
+
+        rows = (
+            await session.execute(select(AnalyticsAssignment).where(AnalyticsAssignment.session_id == session_id))
+        ).scalars().all()
+        assert {row.adjective_id: row.bucket for row in rows} == {
+            adjectives[0].id: "oft",
+            adjectives[1].id: "manchmal",
+        }
+
+    await engine.dispose()
+
+
+class _FlakySessions:
+    """Session factory that fails with "database is locked" a number of times."""
+
+    def __init__(self, factory, failures: int):
+        self.factory = factory
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("BEGIN", {}, sqlite3.OperationalError("database is locked"))
+        return self.factory()
+
+
+@pytest.mark.asyncio
+async def test_failed_flushes_are_retried_and_isolated(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'analytics.db'}", future=True)
+    event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as session:
+        await seed_default_list(session)
+        adjective = (await session.execute(select(Adjective).limit(1))).scalar_one()
+
+    sessions = _FlakySessions(SessionLocal, failures=3)
+    writer = AnalyticsWriter(sessions, retry_attempts=1, retry_backoff_seconds=0)
+    writer._queue = asyncio.Queue()
+    now = datetime.utcnow()
+    for analytics_event in (
+        AnalyticsEvent(kind=SESSION_START, session_id="kept", timestamp=now),
+        AnalyticsEvent(kind=ASSIGNMENT, session_id="kept", timestamp=now, adjective_id=adjective.id, bucket="oft"),
+        # Never started: fails the foreign key check
+        AnalyticsEvent(kind=ASSIGNMENT, session_id="ghost", timestamp=now, adjective_id=adjective.id, bucket="oft"),
+    ):
+        await writer.enqueue(analytics_event)
+
+    # Both attempts hit the lock: the batch is kept and the session stays pending
+    await writer._flush(writer._drain(limit=None))
+    assert writer.stats()["retry_backlog"] == 3
+    assert writer.pending_session("kept") is not None
+
+    # The lock clears; only the event without a session is dropped
+    retry, writer._retry = writer._retry, []
+    await writer._flush(retry)
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"], stats["retried"], stats["retry_backlog"]) == (2, 1, 2, 0)
+    assert writer.pending_session("kept") is None
+
+    async with SessionLocal() as session:
+        rows = (await session.execute(select(AnalyticsAssignment))).scalars().all()
+        assert [(row.session_id, row.bucket) for row in rows] == [("kept", "oft")]
+
+    await engine.dispose()
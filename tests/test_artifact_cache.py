@@ -0,0 +1,143 @@
+"""Tests for the content-addressed artifact cache."""
+import asyncio
+import os
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import qrcode as qrcode_api
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.session import get_session
+from app.main import app
+from app.models import Base, List, School, User
+from app.services.artifact_cache import ArtifactCache, artifact_key
+
+
+@pytest.mark.asyncio
+async def test_memory_and_disk_tiers(tmp_path):
+    cache = ArtifactCache(tmp_path, memory_max_bytes=10, disk_max_bytes=12)
+    renders = []
+
+    async def render() -> bytes:
+        renders.append(1)
+        return b"abcdef"
+
+    key_a = artifact_key("test", "a")
+    assert key_a == artifact_key("test", "a")
+    assert key_a != artifact_key("test", "b")
+    assert artifact_key("test", b"x") != artifact_key("test", b"y")
+
+    first = await cache.get_or_create(key_a, render)
+    second = await cache.get_or_create(key_a, render)
+    assert len(renders) == 1
+    assert first.etag == second.etag and first.etag.startswith('"')
+    assert cache.memory_hits == 1
+
+    # A second entry pushes the first out of the 10 byte memory tier; disk still has it
+    key_b = artifact_key("test", "b")
+    await cache.put(key_b, b"123456")
+    assert (await cache.get(key_a)).data == b"abcdef"
+    assert cache.disk_hits == 1
+
+    # A fresh process finds artifacts on disk
+    restarted = ArtifactCache(tmp_path, memory_max_bytes=10, disk_max_bytes=12)
+    assert (await restarted.get(key_b)).data == b"123456"
+
+    # Over the disk budget the least recently used file goes first
+    key_c = artifact_key("test", "c")
+    await restarted.put(key_c, b"xyz")
+    assert restarted.evictions == 1
+    assert (await restarted.get(key_c)) is not None
+    assert restarted.stats()["disk_bytes"] <= 12
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_age_limit_and_memory_only_entries(tmp_path):
+    cache = ArtifactCache(tmp_path, memory_max_bytes=0, disk_max_age_seconds=60)
+    old_key, new_key, private_key = (artifact_key("test", name) for name in ("old", "new", "private"))
+    await cache.put(old_key, b"old")
+    stale = time.time() - 120
+    os.utime(cache._path(old_key), (stale, stale))
+
+    # A fresh index sees the file's age; reads and the next write drop it
+    restarted = ArtifactCache(tmp_path, memory_max_bytes=0, disk_max_age_seconds=60)
+    assert await restarted.get(old_key) is None
+    assert not restarted._path(old_key).exists()
+    await restarted.put(new_key, b"new")
+    assert restarted.stats()["disk_entries"] == 1
+
+    await restarted.put(private_key, b"student", persist=False)
+    assert not restarted._path(private_key).exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_disk_reads_and_writes_keep_accounting(tmp_path):
+    cache = ArtifactCache(tmp_path, memory_max_bytes=0, disk_max_bytes=40 * 100)
+    keys = [artifact_key("test", index) for index in range(200)]
+
+    async def churn(key):
+        await cache.put(key, b"x" * 100)
+        await cache.get(keys[0])
+
+    await asyncio.gather(*(churn(key) for key in keys))
+
+    stats = cache.stats()
+    on_disk = [path for path in tmp_path.glob("*/*") if not path.name.endswith(".tmp")]
+    assert stats["disk_bytes"] == sum(path.stat().st_size for path in on_disk) <= 40 * 100
+    assert stats["disk_entries"] == len(on_disk)
+
+
+@pytest.mark.asyncio
+async def test_qr_code_etag_and_not_modified(monkeypatch, tmp_path):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    cache = ArtifactCache(tmp_path)
+    monkeypatch.setattr(qrcode_api, "artifact_cache", cache)
+
+    async with SessionLocal() as db:
+        school = School(name="QR School", status="active")
+        db.add(school)
+        await db.flush()
+        teacher = User(email="qr@test.de", password_hash=get_password_hash("x"), school_id=school.id, status="active")
+        db.add(teacher)
+        await db.flush()
+        list_obj = List(name="QR", owner_user_id=teacher.id, share_token="qr-token", share_enabled=True)
+        db.add(list_obj)
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+    url = f"/user/lists/{list_obj.id}/qr"
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            response = await client.get(url)
+            assert response.status_code == 200
+            assert response.content.startswith(b"\x89PNG")
+            etag = response.headers["etag"]
+
+            cached = await client.get(url)
+            assert cached.content == response.content
+            assert cache.misses == 1 and cache.memory_hits == 1
+
+            not_modified = await client.get(url, headers={"If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert not_modified.content == b""
+            assert not_modified.headers["etag"] == etag
+
+            stale = await client.get(url, headers={"If-None-Match": '"other"'})
+            assert stale.status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
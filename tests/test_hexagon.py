@@ -0,0 +1,20 @@
+"""Tests for the server-side port of the hexagon layout."""
+from app.services.hexagon import place_cards_on_grid, seeded_random
+
+
+def test_seeded_random_matches_browser():
+    # Reference values from frontend/src/utils/hexagon.js under Node
+    rand = seeded_random(1718000000123)
+    assert [round(rand(), 12) for _ in range(3)] == [0.818725586319, 0.553594589491, 0.768573761344]
+
+
+def test_layout_is_deterministic_and_connected():
+    oft = [f"oft{i}" for i in range(8)]
+    manchmal = [f"manchmal{i}" for i in range(12)]
+
+    first = place_cards_on_grid(oft, manchmal, seed=42)
+    assert first == place_cards_on_grid(oft, manchmal, seed=42)
+
+    assert first[0].word == "Ich bin"
+    assert [p.bucket for p in first[1:9]] == ["oft"] * 8
+    assert len({(p.q, p.r) for p in first}) == len(first) == 21
@@ -0,0 +1,98 @@
+"""Tests for the maintained adjective counters and content version on lists."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from app.services.list_counters import recount_lists
+from tests.utils import count_queries
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_every_adjective_write():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as db:
+        await seed_default_list(db)
+        school = School(name="Counter School", status="active")
+        db.add(school)
+        await db.flush()
+        teacher = User(
+            email="counter@test.de", password_hash=get_password_hash("x"), school_id=school.id, status="active"
+        )
+        db.add(teacher)
+        await db.commit()
+
+    async def counters(list_id: int):
+        async with SessionLocal() as db:
+            list_obj = await db.get(List, list_id)
+            return list_obj.adjective_count, list_obj.active_adjective_count, list_obj.content_version
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            list_id = (await client.post("/user/lists", json={"name": "Zähler"})).json()["id"]
+            assert await counters(list_id) == (0, 0, 0)
+
+            created = []
+            for word in ("ruhig", "mutig", "offen"):
+                response = await client.post(
+                    f"/user/lists/{list_id}/adjectives", json={"word": word, "explanation": "", "example": ""}
+                )
+                created.append(response.json())
+            assert [adj["order_index"] for adj in created] == [1, 2, 3]
+            assert await counters(list_id) == (3, 3, 3)
+
+            await client.put(f"/user/lists/{list_id}/adjectives/{created[0]['id']}", json={"word": "still"})
+            assert await counters(list_id) == (3, 3, 4)
+
+            await client.delete(f"/user/lists/{list_id}/adjectives/{created[1]['id']}")
+            assert await counters(list_id) == (2, 2, 5)
+
+            fork = (await client.post(f"/user/lists/{list_id}/fork")).json()
+            assert (await counters(fork["id"]))[:2] == (2, 2)
+
+            # Adjectives endpoint: ETag from the content version, 304 without loading adjectives
+            first = await client.get(f"/user/lists/{list_id}/adjectives")
+            etag = first.headers["etag"]
+            with count_queries(engine) as statements:
+                cached = await client.get(f"/user/lists/{list_id}/adjectives", headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert not any("FROM adjectives" in statement for statement in statements)
+
+            await client.post(
+                f"/user/lists/{list_id}/adjectives", json={"word": "neu", "explanation": "", "example": ""}
+            )
+            changed = await client.get(f"/user/lists/{list_id}/adjectives", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["etag"] != etag
+            assert len(changed.json()) == 3
+    finally:
+        app.dependency_overrides.clear()
+
+    # Drift (e.g. rows written outside the API) is repaired by a recount
+    async with SessionLocal() as db:
+        await db.execute(update(Adjective).where(Adjective.list_id == list_id).values(active=False))
+        assert await recount_lists(db) == 1
+        await db.commit()
+        assert await recount_lists(db) == 0
+    assert (await counters(list_id))[:2] == (3, 0)
+
+    await engine.dispose()
@@ -0,0 +1,89 @@
+"""Tests for forking lists with a server-side copy."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from tests.utils import count_queries
+
+
+async def _create_list(session_factory, owner_id: int, size: int) -> List:
+    async with session_factory() as db:
+        # Drifted counters on the source: the fork must count what it copied
+        list_obj = List(
+            name=f"Quelle {size}", owner_user_id=owner_id, adjective_count=size + 5,
+            active_adjective_count=size + 5, content_version=size,
+        )
+        db.add(list_obj)
+        await db.flush()
+        # Reverse insertion order so the copy has to follow order_index, not ids
+        for index in reversed(range(size)):
+            db.add(Adjective(
+                list_id=list_obj.id, word=f"wort{index}", explanation=f"e{index}", example=f"b{index}",
+                order_index=index + 1, active=index != 0,
+            ))
+        await db.commit()
+        return list_obj
+
+
+@pytest.mark.asyncio
+async def test_fork_copies_in_constant_statements():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as db:
+        school = School(name="Fork School", status="active")
+        db.add(school)
+        await db.flush()
+        teacher = User(
+            email="fork@test.de", password_hash=get_password_hash("x"), school_id=school.id, status="active"
+        )
+        db.add(teacher)
+        await db.commit()
+
+    small = await _create_list(SessionLocal, teacher.id, 3)
+    large = await _create_list(SessionLocal, teacher.id, 50)
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            # Warm the principal cache so only the fork is counted
+            await client.get("/user/profile")
+
+            with count_queries(engine) as small_statements:
+                small_fork = await client.post(f"/user/lists/{small.id}/fork")
+            with count_queries(engine) as large_statements:
+                large_fork = await client.post(f"/user/lists/{large.id}/fork")
+            assert small_fork.status_code == large_fork.status_code == 200
+            # Source lookup, list insert, one INSERT ... SELECT, the count and the counter update
+            assert len(small_statements) == len(large_statements) == 5
+            assert large_fork.json()["name"] == "Quelle 50 (Kopie)"
+            assert large_fork.json()["source_list_id"] == large.id
+    finally:
+        app.dependency_overrides.clear()
+
+    async with SessionLocal() as db:
+        forked = await db.get(List, large_fork.json()["id"])
+        assert (forked.adjective_count, forked.active_adjective_count, forked.content_version) == (50, 49, 1)
+        copies = (
+            await db.execute(select(Adjective).where(Adjective.list_id == forked.id).order_by(Adjective.id))
+        ).scalars().all()
+        assert [adj.order_index for adj in copies] == list(range(1, 51))
+        assert copies[0].word == "wort0" and copies[0].explanation == "e0" and copies[0].active is False
+        assert all(adj.created_at is not None for adj in copies)
+
+    await engine.dispose()
@@ -0,0 +1,126 @@
+"""Tests for the class-wide PDF export."""
+import io
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, AnalyticsAssignment, AnalyticsSession, Base, List, School, User
+from app.services import pdf_batch
+from app.services.artifact_cache import ArtifactCache
+from app.services.pdf_jobs import PdfJobManager
+from app.services.pdf_render import render_hexagon_pdf
+
+
+@pytest.mark.asyncio
+async def test_class_export_as_pdf_and_zip(monkeypatch, tmp_path):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    monkeypatch.setattr(pdf_batch, "pdf_jobs", PdfJobManager(mode="inline"))
+    monkeypatch.setattr(pdf_batch, "artifact_cache", ArtifactCache(tmp_path))
+
+    now = datetime.utcnow()
+    async with SessionLocal() as db:
+        school = School(name="Batch School", status="active")
+        db.add(school)
+        await db.flush()
+        password_hash = get_password_hash("x")
+        teacher = User(email="batch@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        other = User(email="other@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        db.add_all([teacher, other])
+        await db.flush()
+        list_obj = List(name="Klasse 5a", owner_user_id=teacher.id, share_token="batch", share_enabled=True)
+        db.add(list_obj)
+        await db.flush()
+        adjectives = [
+            Adjective(list_id=list_obj.id, word=word, explanation="", example="", order_index=idx)
+            for idx, word in enumerate(["ruhig", "mutig", "offen", "fair"], start=1)
+        ]
+        db.add_all(adjectives)
+        await db.flush()
+
+        sessions = []
+        for offset in range(3):
+            session = AnalyticsSession(
+                list_id=list_obj.id,
+                started_at=now - timedelta(days=offset * 10),
+                finished_at=now - timedelta(days=offset * 10) + timedelta(minutes=5),
+            )
+            db.add(session)
+            await db.flush()
+            for adjective, bucket in zip(adjectives, ["oft", "manchmal", "selten", "oft"]):
+                db.add(AnalyticsAssignment(session_id=session.id, adjective_id=adjective.id, bucket=bucket))
+            sessions.append(session)
+        # Unfinished sessions are skipped when exporting by time window
+        db.add(AnalyticsSession(list_id=list_obj.id, started_at=now))
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+    other_token = session_store.create_session(user_id=other.id, user_type="user")
+    url = f"/user/lists/{list_obj.id}/sessions/pdf"
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            response = await client.post(url, json={"started_from": (now - timedelta(days=15)).isoformat()})
+            assert response.status_code == 200
+            assert response.headers["x-session-count"] == "2"
+            assert response.content.startswith(b"%PDF")
+            assert response.content.count(b"/Type /Page\n") == 2
+
+            response = await client.post(url, json={"format": "zip"})
+            assert response.status_code == 200
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                names = archive.namelist()
+                assert len(names) == 3
+                assert all(archive.read(name).startswith(b"%PDF") for name in names)
+            # Student results are only cached in memory, never on disk
+            assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+            response = await client.post(url, json={"session_ids": [sessions[0].id, "missing"]})
+            assert response.status_code == 404
+
+            # Render failures before the first byte are status codes, not truncated downloads
+            monkeypatch.setattr(pdf_batch, "artifact_cache", ArtifactCache())
+            monkeypatch.setattr(pdf_batch, "pdf_jobs", PdfJobManager(mode="inline", max_pending_jobs=0))
+            assert (await client.post(url, json={})).status_code == 503
+            assert (await client.post(url, json={"format": "zip"})).status_code == 503
+
+            # Later ZIP entries that fail are written as notes, the archive stays complete
+            renders = []
+
+            def flaky_render(*args):
+                renders.append(args)
+                if len(renders) == 2:
+                    raise ValueError("broken board")
+                return render_hexagon_pdf(*args)
+
+            monkeypatch.setattr(pdf_batch, "pdf_jobs", PdfJobManager(mode="inline"))
+            monkeypatch.setattr(pdf_batch, "render_hexagon_pdf", flaky_render)
+            response = await client.post(url, json={"format": "zip"})
+            assert response.status_code == 200
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                names = archive.namelist()
+                assert [name.rsplit(".", 1)[1] for name in names] == ["pdf", "txt", "pdf"]
+                assert b"broken board" in archive.read(names[1])
+
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": other_token}) as client:
+            response = await client.post(url, json={})
+            assert response.status_code == 403
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
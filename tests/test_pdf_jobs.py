@@ -0,0 +1,234 @@
+"""Tests for PDF export jobs."""
+import asyncio
+import base64
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import pdf as pdf_api
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, AnalyticsAssignment, AnalyticsSession, Base, List
+from app.services.analytics_writer import ASSIGNMENT, AnalyticsEvent, AnalyticsWriter
+from app.services.artifact_cache import ArtifactCache
+from app.services.pdf_jobs import DONE, FAILED, QUEUED, PdfJobManager
+from app.services.pdf_render import render_snapshot_pdf
+
+
+def _snapshot_png(size=(120, 80)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 220, 240)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_pdf_job_endpoints_inline(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    jobs = PdfJobManager(mode="inline")
+    monkeypatch.setattr(pdf_api, "pdf_jobs", jobs)
+    monkeypatch.setattr(pdf_api, "artifact_cache", ArtifactCache())
+
+    async with SessionLocal() as session:
+        await seed_default_list(session)
+        list_obj = (await session.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        analytics_session = AnalyticsSession(list_id=list_obj.id, is_standard_list=True)
+        session.add(analytics_session)
+        await session.flush()
+        adjectives = (
+            await session.execute(select(Adjective).where(Adjective.list_id == list_obj.id).limit(7))
+        ).scalars().all()
+        for adjective, bucket in zip(adjectives, ["oft", "manchmal", "selten"] * 2):
+            session.add(AnalyticsAssignment(session_id=analytics_session.id, adjective_id=adjective.id, bucket=bucket))
+        await session.commit()
+
+    data_url = "data:image/png;base64," + base64.b64encode(_snapshot_png()).decode()
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf", json={"image_data_url": data_url}
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/pdf"
+            assert response.content.startswith(b"%PDF")
+
+            submit = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/jobs", json={"image_data_url": data_url}
+            )
+            assert submit.status_code == 202
+            job_id = submit.json()["job_id"]
+
+            status_response = await client.get(f"/api/sessions/pdf-jobs/{job_id}")
+            assert status_response.json()["status"] == DONE
+            assert status_response.json()["render_ms"] is not None
+
+            result = await client.get(f"/api/sessions/pdf-jobs/{job_id}/result")
+            assert result.content.startswith(b"%PDF")
+
+            missing = await client.get("/api/sessions/pdf-jobs/unknown")
+            assert missing.status_code == 404
+
+            vector = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/vector", json={"theme": "teal", "seed": 42}
+            )
+            assert vector.status_code == 200
+            assert vector.content.startswith(b"%PDF")
+            assert len(vector.content) < len(response.content) * 2
+
+            # Assignments still queued by the write-behind writer are written before rendering
+            writer = AnalyticsWriter(SessionLocal, flush_interval_seconds=0.05)
+            await writer.start()
+            monkeypatch.setattr(pdf_api, "analytics_writer", writer)
+            try:
+                await writer.enqueue(AnalyticsEvent(
+                    kind=ASSIGNMENT, session_id=analytics_session.id, timestamp=datetime.utcnow(),
+                    adjective_id=adjectives[6].id, bucket="oft",
+                ))
+                queued = await client.post(
+                    f"/api/sessions/{analytics_session.id}/pdf/vector", json={"theme": "teal", "seed": 42}
+                )
+            finally:
+                await writer.stop()
+            assert queued.status_code == 200
+            assert writer.written == 1
+            assert queued.headers["etag"] != vector.headers["etag"]
+
+            missing_session = await client.post("/api/sessions/unknown/pdf/vector", json={"theme": "teal"})
+            assert missing_session.status_code == 404
+
+            # Binary upload, downscaled to 150 dpi on the printable area
+            raw = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                content=_snapshot_png((4000, 3000)),
+                headers={"Content-Type": "image/png"},
+            )
+            assert raw.status_code == 200
+            assert b"/Width 1339" in raw.content
+
+            multipart = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                files={"image": ("board.png", _snapshot_png(), "image/png")},
+            )
+            assert multipart.status_code == 200
+            # Same image and footer as the data URL export: served from the artifact cache
+            assert multipart.content == response.content
+            assert multipart.headers["etag"] == response.headers["etag"]
+
+            not_an_image = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                content=b"GIF89a" + b"\0" * 32,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            assert not_an_image.status_code == 415
+
+            monkeypatch.setattr(pdf_api._settings, "pdf_snapshot_max_bytes", 1024)
+            too_large = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                content=_snapshot_png((4000, 3000)),
+                headers={"Content-Type": "image/png"},
+            )
+            assert too_large.status_code == 413
+
+            # A chunked multipart body has no Content-Length and is cut off while streaming
+            boundary = "snapshot-boundary"
+
+            async def multipart_body():
+                yield (
+                    f"--{boundary}\r\n"
+                    'Content-Disposition: form-data; name="image"; filename="board.png"\r\n'
+                    "Content-Type: image/png\r\n\r\n"
+                ).encode()
+                yield _snapshot_png((4000, 3000))
+                yield f"\r\n--{boundary}--\r\n".encode()
+
+            streamed = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                content=multipart_body(),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+            )
+            assert streamed.status_code == 413
+
+            # The pixel limit is checked from the header, before the image is decoded
+            monkeypatch.setattr(pdf_api._settings, "pdf_snapshot_max_pixels", 1000)
+            too_many_pixels = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/snapshot",
+                content=_snapshot_png(),
+                headers={"Content-Type": "image/png"},
+            )
+            assert too_many_pixels.status_code == 413
+            assert "120x80" in too_many_pixels.json()["detail"]
+
+            bad_theme = await client.post(
+                f"/api/sessions/{analytics_session.id}/pdf/vector", json={"theme": "neon"}
+            )
+            assert bad_theme.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+    assert jobs.stats()["completed"] == 5
+
+    async with SessionLocal() as session:
+        stored = await session.get(AnalyticsSession, analytics_session.id)
+        assert stored.pdf_exported_at is not None
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_renders_pdf():
+    jobs = PdfJobManager(mode="process", max_workers=1)
+    try:
+        job = await jobs.submit(render_snapshot_pdf, _snapshot_png(), "01.02.2026")
+        await jobs.wait(job, timeout=60)
+    finally:
+        await jobs.shutdown()
+
+    assert job.status == DONE
+    assert job.result.startswith(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_keeps_its_slot_until_the_worker_finishes():
+    release = threading.Event()
+
+    def slow_render() -> bytes:
+        release.wait(timeout=10)
+        return b"%PDF slow"
+
+    jobs = PdfJobManager(mode="process", max_workers=1, job_timeout_seconds=0.05)
+    jobs._executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        slow = await jobs.submit(slow_render)
+        await jobs.wait(slow, timeout=5)
+        assert slow.status == FAILED
+        assert jobs.stats()["timed_out"] == 1
+
+        # The worker is still busy, so the next job waits for the slot instead of queueing in the executor
+        queued = await jobs.submit(lambda: b"%PDF next")
+        await asyncio.sleep(0.1)
+        assert queued.status == QUEUED
+
+        release.set()
+        await jobs.wait(queued, timeout=5)
+        assert queued.status == DONE
+    finally:
+        release.set()
+        await jobs.shutdown()
@@ -0,0 +1,91 @@
+"""Tests for the cached premium list catalog."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import lists as lists_api
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db import seed
+from app.db.seed import seed_premium_lists
+from app.db.seeds.premium_lists_data import PREMIUM_LISTS
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from app.services.premium_catalog import PremiumCatalogCache
+from tests.utils import count_queries
+
+
+def test_set_is_dropped_after_invalidation():
+    cache = PremiumCatalogCache()
+    version = cache.version
+    cache.invalidate()
+    cache.set(b"[]", version=version)
+    assert cache.get() is None
+
+    cache.set(b"[]", version=cache.version)
+    assert cache.get() == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_premium_catalog_is_served_without_queries(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    catalog = PremiumCatalogCache()
+    monkeypatch.setattr(lists_api, "premium_catalog", catalog)
+    monkeypatch.setattr(seed, "premium_catalog", catalog)
+
+    async with SessionLocal() as db:
+        await seed_premium_lists(db)
+        school = School(name="Premium School", status="active")
+        db.add(school)
+        await db.flush()
+        teacher = User(
+            email="premium@test.de", password_hash=get_password_hash("x"), school_id=school.id, status="active"
+        )
+        db.add(teacher)
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            with count_queries(engine) as first:
+                response = await client.get("/user/lists/premium")
+            assert response.status_code == 200
+            catalog_items = response.json()
+            assert len(catalog_items) == len(PREMIUM_LISTS)
+            assert [item["name"] for item in catalog_items] == sorted(item["name"] for item in catalog_items)
+            expected_counts = {data["slug"]: len(data["adjectives"]) for data in PREMIUM_LISTS}
+            assert {item["slug"]: item["adjective_count"] for item in catalog_items} == expected_counts
+            # Principal lookup plus one grouped query, however many premium lists exist
+            assert len(first) <= 2
+
+            with count_queries(engine) as cached:
+                again = await client.get("/user/lists/premium")
+            assert again.content == response.content
+            assert cached == []
+
+            # Seeding writes premium data and invalidates the cached catalog
+            async with SessionLocal() as db:
+                premium = await db.get(List, catalog_items[0]["id"])
+                db.add(Adjective(list_id=premium.id, word="neu", explanation="", example="", order_index=999))
+                await db.commit()
+                await seed_premium_lists(db)
+
+            refreshed = (await client.get("/user/lists/premium")).json()
+            assert refreshed[0]["adjective_count"] == catalog_items[0]["adjective_count"] + 1
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    assert catalog.stats()["hits"] == 1
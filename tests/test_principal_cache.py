@@ -0,0 +1,72 @@
+"""Tests for cached principal resolution on authenticated requests."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.session import get_session
+from app.main import app
+from app.models import Base, School, User
+from tests.utils import count_queries
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_reuse_cached_principal():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as db:
+        school = School(name="Principal School", status="active")
+        db.add(school)
+        await db.flush()
+        user = User(
+            email="principal@test.de",
+            password_hash=get_password_hash("test123"),
+            school_id=school.id,
+            status="active",
+        )
+        db.add(user)
+        await db.commit()
+
+    token = session_store.create_session(user_id=user.id, user_type="user")
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            with count_queries(engine) as cold:
+                response = await client.get("/user/schools")
+            assert response.status_code == 200
+            assert len(cold) == 1
+
+            with count_queries(engine) as warm:
+                response = await client.get("/user/schools")
+            assert response.status_code == 200
+            assert response.json()["status"] == "active"
+            assert warm == []
+
+            # Admin changes to the school must be visible immediately
+            async with SessionLocal() as db:
+                stored = await db.get(School, school.id)
+                stored.status = "passive"
+                await db.commit()
+            principal_cache.invalidate_school(school.id)
+
+            response = await client.get("/user/schools")
+            assert response.json()["status"] == "passive"
+
+            session_store.delete_session(token)
+            response = await client.get("/user/schools")
+            assert response.status_code == 401
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
@@ -0,0 +1,156 @@
+"""Tests for QR rendering from cached module matrices."""
+import io
+
+import pytest
+import qrcode
+from httpx import AsyncClient
+from PIL import Image, ImageChops
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import qrcode as qrcode_api
+from app.services import qr_sheet
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.session import get_session
+from app.main import app
+from app.models import Base, List, School, User
+from app.services.artifact_cache import ArtifactCache
+from app.services.pdf_jobs import PdfJobManager
+from app.services.qr_render import box_size_for, qr_matrix, render_qr_png, render_qr_svg
+
+
+def test_png_matches_qrcode_library_output():
+    data = "https://vielseitig.example/l/abc123"
+    qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    expected = qr.make_image(fill_color="black", back_color="white").get_image().convert("L")
+
+    actual = Image.open(io.BytesIO(render_qr_png(qr_matrix(data)))).convert("L")
+    assert actual.size == expected.size
+    assert ImageChops.difference(actual, expected).getbbox() is None
+
+
+def test_sizes_and_svg_share_one_matrix():
+    qr_matrix.cache_clear()
+    data = "https://vielseitig.example/l/sizes"
+    matrix = qr_matrix(data)
+    modules = len(matrix) + 4
+
+    assert box_size_for(matrix, None) == 10
+    for size in (64, 300, 1024):
+        box = box_size_for(qr_matrix(data), size)
+        image = Image.open(io.BytesIO(render_qr_png(matrix, box)))
+        assert image.width == modules * box <= max(size, modules)
+
+    svg = render_qr_svg(matrix, box_size_for(matrix, 500)).decode()
+    assert svg.startswith("<svg") and f'viewBox="0 0 {modules} {modules}"' in svg
+    assert qr_matrix.cache_info().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_qr_endpoint_formats(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    monkeypatch.setattr(qrcode_api, "artifact_cache", ArtifactCache())
+
+    async with SessionLocal() as db:
+        school = School(name="QR Formats", status="active")
+        db.add(school)
+        await db.flush()
+        teacher = User(
+            email="qr-fmt@test.de", password_hash=get_password_hash("x"), school_id=school.id, status="active"
+        )
+        db.add(teacher)
+        await db.flush()
+        list_obj = List(name="QR", owner_user_id=teacher.id, share_token="qr-formats", share_enabled=True)
+        db.add(list_obj)
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+    url = f"/user/lists/{list_obj.id}/qr"
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            svg = await client.get(url, params={"format": "svg", "size": 800})
+            assert svg.status_code == 200
+            assert svg.headers["content-type"].startswith("image/svg+xml")
+            assert svg.content.startswith(b"<svg")
+
+            png = await client.get(url, params={"size": 300})
+            assert Image.open(io.BytesIO(png.content)).width <= 300
+
+            invalid = await client.get(url, params={"format": "gif"})
+            assert invalid.status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_qr_sheet_for_all_and_selected_lists(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    monkeypatch.setattr(qr_sheet, "pdf_jobs", PdfJobManager(mode="inline"))
+    monkeypatch.setattr(qr_sheet, "artifact_cache", ArtifactCache())
+
+    async with SessionLocal() as db:
+        school = School(name="QR Sheet", status="active")
+        db.add(school)
+        await db.flush()
+        password_hash = get_password_hash("x")
+        teacher = User(email="sheet@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        other = User(email="sheet-other@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        db.add_all([teacher, other])
+        await db.flush()
+        shared = [
+            List(name=f"Klasse {index:02d}", owner_user_id=teacher.id, share_token=f"sheet-{index}", share_enabled=True)
+            for index in range(14)
+        ]
+        private = List(name="Entwurf", owner_user_id=teacher.id, share_token="sheet-private", share_enabled=False)
+        foreign = List(name="Fremd", owner_user_id=other.id, share_token="sheet-foreign", share_enabled=True)
+        db.add_all([*shared, private, foreign])
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+    url = "/user/lists/qr-sheet"
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            response = await client.post(url, json={})
+            assert response.status_code == 200
+            assert response.content.startswith(b"%PDF")
+            assert response.headers["x-list-count"] == "14"
+            assert "render;dur=" in response.headers["server-timing"]
+            # Twelve codes per page
+            assert response.content.count(b"/Type /Page\n") == 2
+
+            selected = await client.post(url, json={"list_ids": [shared[3].id, shared[1].id]})
+            assert selected.headers["x-list-count"] == "2"
+
+            not_shared = await client.post(url, json={"list_ids": [private.id]})
+            assert not_shared.status_code == 400
+
+            not_owned = await client.post(url, json={"list_ids": [shared[0].id, foreign.id]})
+            assert not_owned.status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
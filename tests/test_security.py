@@ -0,0 +1,59 @@
+"""Tests for pooled password hashing and rehash-on-login."""
+import pytest
+from argon2 import PasswordHasher
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import hash_password_async, password_pool, verify_password, verify_password_async
+from app.db.session import get_session
+from app.main import app
+from app.models import Base, School, User
+
+
+@pytest.mark.asyncio
+async def test_pooled_hashing_round_trip():
+    completed = password_pool.completed
+    hashed = await hash_password_async("geheim123")
+
+    assert await verify_password_async("geheim123", hashed)
+    assert not await verify_password_async("falsch", hashed)
+    assert password_pool.completed == completed + 3
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_outdated_hash():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    old_hash = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash("test123")
+    async with SessionLocal() as db:
+        school = School(name="Rehash School", status="active")
+        db.add(school)
+        await db.flush()
+        user = User(email="rehash@test.de", password_hash=old_hash, school_id=school.id, status="active")
+        db.add(user)
+        await db.commit()
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/user/login", json={"email": "rehash@test.de", "password": "test123"})
+            assert response.status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+    async with SessionLocal() as db:
+        stored = await db.get(User, user.id)
+        assert stored.password_hash != old_hash
+        assert verify_password("test123", stored.password_hash)
+        assert stored.last_login_at is not None
+
+    await engine.dispose()
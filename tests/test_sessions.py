@@ -0,0 +1,110 @@
+"""Tests for the session store backends."""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.sessions import DatabaseSessionBackend, InMemorySessionBackend, SessionStore
+from app.models import Base
+
+
+def _database_backend(tmp_path) -> DatabaseSessionBackend:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'sessions.db'}"
+    backend = DatabaseSessionBackend(url)
+    Base.metadata.create_all(create_engine(backend.database_url))
+    return backend
+
+
+def test_database_sessions_are_shared_between_stores(tmp_path):
+    backend = _database_backend(tmp_path)
+    worker_a = SessionStore(backend)
+    worker_b = SessionStore(DatabaseSessionBackend(backend.database_url))
+
+    token = worker_a.create_session(user_id=7, user_type="user", session_data={"theme": "dark"})
+
+    session = worker_b.get_session(token)
+    assert session["user_id"] == 7
+    assert session["data"] == {"theme": "dark"}
+
+    assert worker_b.delete_session(token)
+    worker_a._cache.clear()
+    assert worker_a.get_session(token) is None
+
+
+@pytest.mark.asyncio
+async def test_async_methods_run_database_calls_off_the_event_loop(tmp_path):
+    backend = _database_backend(tmp_path)
+    store = SessionStore(backend)
+    threads = set()
+    load = backend.load
+
+    def recording_load(token):
+        threads.add(threading.get_ident())
+        return load(token)
+
+    backend.load = recording_load
+    token = await store.create_session_async(user_id=3, user_type="user")
+    store._cache.clear()
+
+    assert (await store.get_session_async(token))["user_id"] == 3
+    assert threads and threading.get_ident() not in threads
+    assert await store.flush_activity_async() == 1
+    assert await store.delete_session_async(token)
+    assert await store.get_session_async(token) is None
+
+    with backend.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+
+
+def test_activity_updates_are_batched(tmp_path):
+    backend = _database_backend(tmp_path)
+    store = SessionStore(backend)
+    token = store.create_session(user_id=1, user_type="admin")
+
+    for _ in range(5):
+        store.get_session(token)
+    assert store.flush_activity() == 1
+    assert store.flush_activity() == 0
+
+    stored = backend.load(token)
+    assert stored["expires_at"] > datetime.utcnow() + timedelta(days=1)
+
+
+def test_expired_sessions_are_removed():
+    store = SessionStore(InMemorySessionBackend(), expiry=timedelta(seconds=-1))
+    token = store.create_session(user_id=1, user_type="user")
+
+    assert store.cleanup_expired() == 1
+    assert store.get_session(token) is None
+
+
+def test_sweep_skips_sessions_extended_by_activity():
+    backend = InMemorySessionBackend()
+    store = SessionStore(backend, expiry=timedelta(seconds=60))
+    active = store.create_session(user_id=1, user_type="user")
+    idle = store.create_session(user_id=2, user_type="user")
+
+    # Both heap entries are due, but activity moved the active session's expiry later
+    backend._expiry_heap = [(expires - 120, token) for expires, token in backend._expiry_heap]
+    backend._sessions[idle].expires_ts -= 120
+
+    assert store.cleanup_expired() == 1
+    assert store.get_session(idle) is None
+    assert store.get_session(active)["user_id"] == 1
+    assert backend.stats()["heap_entries"] == 1
+
+
+def test_max_sessions_evicts_least_recently_used():
+    backend = InMemorySessionBackend(max_sessions=2)
+    store = SessionStore(backend)
+    first = store.create_session(user_id=1, user_type="user")
+    second = store.create_session(user_id=2, user_type="user")
+
+    store.get_session(first)
+    store.create_session(user_id=3, user_type="user")
+
+    assert store.get_session(second) is None
+    assert store.get_session(first)["user_id"] == 1
+    assert store.stats()["evicted"] == 1
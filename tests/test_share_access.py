@@ -0,0 +1,169 @@
+"""Tests for public list access resolution."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.core.security import get_password_hash
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from app.services.share_access import AccessVerdict, resolve_list_access
+from tests.utils import count_queries
+
+
+@pytest.fixture(scope="module")
+async def test_context():
+    """Provide an isolated app client, engine and session factory."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as session:
+        await seed_default_list(session)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client, engine, SessionLocal
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _create_owned_list(session_factory, token: str, school_status: str = "active") -> List:
+    async with session_factory() as db:
+        school = School(name=f"School {token}", status=school_status)
+        db.add(school)
+        await db.flush()
+
+        owner = User(
+            email=f"{token}@test.de",
+            password_hash=get_password_hash("test123"),
+            school_id=school.id,
+            status="active",
+        )
+        db.add(owner)
+        await db.flush()
+
+        list_obj = List(name=token, description="", owner_user_id=owner.id, share_token=token, share_enabled=True)
+        db.add(list_obj)
+        await db.flush()
+
+        for idx, word in enumerate(["ruhig", "mutig", "offen"], start=1):
+            db.add(Adjective(list_id=list_obj.id, word=word, explanation="", example="", order_index=idx))
+        db.add(Adjective(list_id=list_obj.id, word="inaktiv", explanation="", example="", order_index=4, active=False))
+        await db.commit()
+        return list_obj
+
+
+@pytest.mark.asyncio
+async def test_resolution_takes_two_queries(test_context):
+    client, engine, session_factory = test_context
+    list_obj = await _create_owned_list(session_factory, "two-queries")
+
+    async with session_factory() as db:
+        with count_queries(engine) as statements:
+            access = await resolve_list_access(db, share_token="two-queries")
+
+        # Previously: list, owner, school and adjectives were four round trips
+        assert len(statements) == 2
+        assert access.verdict == AccessVerdict.OK
+        assert access.list_obj.id == list_obj.id
+        assert [adj.word for adj in access.adjectives] == ["ruhig", "mutig", "offen"]
+
+        # The list's own collection is not left holding only the active subset
+        reloaded = (
+            await db.execute(select(List).where(List.id == list_obj.id).options(selectinload(List.adjectives)))
+        ).scalar_one()
+        assert sorted(adj.word for adj in reloaded.adjectives) == ["inaktiv", "mutig", "offen", "ruhig"]
+
+
+@pytest.mark.asyncio
+async def test_denied_list_skips_the_adjective_query(test_context):
+    client, engine, session_factory = test_context
+    await _create_owned_list(session_factory, "denied-list", school_status="passive")
+
+    async with session_factory() as db:
+        with count_queries(engine) as statements:
+            access = await resolve_list_access(db, share_token="denied-list")
+
+    assert len(statements) == 1
+    assert access.verdict == AccessVerdict.SCHOOL_INACTIVE
+    assert access.adjectives == []
+
+
+@pytest.mark.asyncio
+async def test_default_list_takes_two_queries(test_context):
+    client, engine, session_factory = test_context
+
+    async with session_factory() as db:
+        with count_queries(engine) as statements:
+            access = await resolve_list_access(db)
+
+    assert len(statements) == 2
+    assert access.allowed
+    assert access.list_obj.is_default
+
+
+@pytest.mark.asyncio
+async def test_inactive_school_is_rejected_everywhere(test_context):
+    client, engine, session_factory = test_context
+    list_obj = await _create_owned_list(session_factory, "passive-school", school_status="passive")
+
+    share_response = await client.get("/api/l/passive-school")
+    student_response = await client.get(f"/api/lists/{list_obj.id}/adjectives")
+    session_response = await client.post("/api/analytics/session/start", json={"list_id": list_obj.id})
+
+    for response in (share_response, student_response, session_response):
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Owner's school is not active"
+
+
+@pytest.mark.asyncio
+async def test_unknown_token_is_not_found(test_context):
+    client, engine, session_factory = test_context
+
+    response = await client.get("/api/l/does-not-exist")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Share link not found"
+
+
+@pytest.mark.asyncio
+async def test_disabled_share_is_enforced_for_token_lookups(test_context):
+    client, engine, session_factory = test_context
+    owned = await _create_owned_list(session_factory, "disabled-share")
+
+    async with session_factory() as db:
+        default_list = (await db.execute(select(List).where(List.is_default == True))).scalar_one()  # noqa: E712
+        default_list.share_token = "default-share"
+        default_list.share_enabled = False
+        (await db.get(List, owned.id)).share_enabled = False
+        await db.commit()
+
+    try:
+        async with session_factory() as db:
+            by_token = await resolve_list_access(db, share_token="default-share")
+            by_default = await resolve_list_access(db)
+            by_id = await resolve_list_access(db, list_id=owned.id)
+    finally:
+        async with session_factory() as db:
+            default_list = await db.get(List, default_list.id)
+            default_list.share_token = None
+            default_list.share_enabled = True
+            await db.commit()
+
+    # Turning sharing off revokes the default list's token, not the default list itself
+    assert by_token.verdict == AccessVerdict.NOT_SHARED
+    assert by_token.detail == "This list is no longer shared"
+    assert by_default.allowed
+    assert by_id.verdict == AccessVerdict.NOT_SHARED
+    assert by_id.detail == "This list is not shared"
@@ -0,0 +1,115 @@
+"""Tests for the cached public share-link endpoint."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from app.services.share_cache import share_cache
+
+
+@pytest.fixture(scope="module")
+async def test_context():
+    """Provide an isolated app client and session factory."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client, SessionLocal
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _create_shared_list(session_factory, token: str) -> List:
+    async with session_factory() as db:
+        school = School(name=f"School {token}", status="active")
+        db.add(school)
+        await db.flush()
+
+        owner = User(
+            email=f"{token}@test.de",
+            password_hash=get_password_hash("test123"),
+            school_id=school.id,
+            status="active",
+        )
+        db.add(owner)
+        await db.flush()
+
+        list_obj = List(
+            name="Geteilte Liste",
+            description="Test",
+            owner_user_id=owner.id,
+            share_token=token,
+            share_enabled=True,
+        )
+        db.add(list_obj)
+        await db.flush()
+
+        db.add(Adjective(list_id=list_obj.id, word="mutig", explanation="e", example="b", order_index=1))
+        await db.commit()
+        return list_obj
+
+
+@pytest.mark.asyncio
+async def test_repeat_scans_are_served_from_cache(test_context):
+    client, session_factory = test_context
+    share_cache.clear()
+    await _create_shared_list(session_factory, "cache-token")
+
+    before = share_cache.stats()
+    first = await client.get("/api/l/cache-token")
+    second = await client.get("/api/l/cache-token/data")
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert first.json()["adjectives"][0]["word"] == "mutig"
+
+    after = share_cache.stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_owner_status_change_invalidates_cached_verdict(test_context):
+    client, session_factory = test_context
+    list_obj = await _create_shared_list(session_factory, "owner-token")
+
+    assert (await client.get("/api/l/owner-token")).status_code == 200
+
+    async with session_factory() as db:
+        owner = (await db.execute(select(User).where(User.id == list_obj.owner_user_id))).scalar_one()
+        owner.status = "passive"
+        await db.commit()
+
+    # Without invalidation the stale payload is still served
+    assert (await client.get("/api/l/owner-token")).status_code == 200
+
+    share_cache.invalidate_user(list_obj.owner_user_id)
+    response = await client.get("/api/l/owner-token")
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Owner account is not active"
+
+
+@pytest.mark.asyncio
+async def test_stale_generation_is_not_cached():
+    share_cache.clear()
+    generation = share_cache.generation
+    share_cache.invalidate_list(1)
+
+    from app.services.share_cache import SharePayload
+
+    share_cache.set("race-token", SharePayload(status_code=200, body=b"{}", list_id=1), generation=generation)
+    assert share_cache.get("race-token") is None
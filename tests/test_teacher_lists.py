@@ -0,0 +1,92 @@
+"""Tests for the teacher list overview."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.security import get_password_hash
+from app.core.sessions import session_store
+from app.db.seed import seed_default_list
+from app.db.session import get_session
+from app.main import app
+from app.models import Adjective, Base, List, School, User
+from app.services.list_counters import recount_lists
+from tests.utils import count_queries
+
+
+async def _add_lists(session_factory, owner_id: int, count: int, prefix: str, **fields) -> None:
+    async with session_factory() as db:
+        for index in range(count):
+            list_obj = List(name=f"{prefix} {index}", owner_user_id=owner_id, **fields)
+            db.add(list_obj)
+            await db.flush()
+            for order_index, word in enumerate(["ruhig", "mutig", "offen"][: index % 3 + 1], start=1):
+                db.add(Adjective(list_id=list_obj.id, word=word, explanation="", example="", order_index=order_index))
+        # Adjectives are inserted directly here, not through the API that maintains the counters
+        await db.flush()
+        await recount_lists(db)
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_overview_query_count_is_constant():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with SessionLocal() as db:
+        await seed_default_list(db)
+        school = School(name="Overview School", status="active")
+        other_school = School(name="Elsewhere", status="active")
+        db.add_all([school, other_school])
+        await db.flush()
+        password_hash = get_password_hash("x")
+        teacher = User(email="overview@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        colleague = User(email="colleague@test.de", password_hash=password_hash, school_id=school.id, status="active")
+        stranger = User(
+            email="stranger@test.de", password_hash=password_hash, school_id=other_school.id, status="active"
+        )
+        db.add_all([teacher, colleague, stranger])
+        await db.commit()
+
+    token = session_store.create_session(user_id=teacher.id, user_type="user")
+    await _add_lists(SessionLocal, teacher.id, 2, "Eigene")
+    await _add_lists(SessionLocal, colleague.id, 2, "Kollegium", share_with_school=True)
+    # Shared with a different school: never visible
+    await _add_lists(SessionLocal, stranger.id, 1, "Fremd", share_with_school=True)
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test", cookies={"vielseitig_session": token}) as client:
+            # Warm the principal cache so only the overview itself is counted
+            await client.get("/user/lists")
+
+            with count_queries(engine) as small:
+                response = await client.get("/user/lists")
+            lists = response.json()
+            assert {item["name"] for item in lists if item["owner_email"] == "colleague@test.de"} == {
+                "Kollegium 0", "Kollegium 1"
+            }
+            assert not any(item["name"].startswith("Fremd") for item in lists)
+            own = {item["name"]: item for item in lists if item["owner_email"] == "overview@test.de"}
+            assert own["Eigene 0"]["adjective_count"] == 1
+            assert own["Eigene 1"]["adjective_count"] == 2
+            assert lists[0]["is_default"] and lists[0]["adjective_count"] > 0
+
+            await _add_lists(SessionLocal, teacher.id, 20, "Mehr")
+            await _add_lists(SessionLocal, colleague.id, 20, "Geteilt", share_with_school=True)
+
+            with count_queries(engine) as large:
+                response = await client.get("/user/lists")
+            assert len(response.json()) == len(lists) + 40
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    assert len(small) == len(large) == 1